@@ -29,6 +29,29 @@ def create_app():
     migrate.init_app(app, db)
     login_manager.login_view = 'auth.login'
 
+    # logging before anything that might log; its request ID hook runs first
+    from backend.app.logconfig import init_logging
+    init_logging(app, 'main')
+
+    from backend.app.tracing import init_tracing
+    init_tracing(app, 'main')
+
+    # metrics first, so its before_request hook times everything that follows
+    from backend.app.metrics import init_metrics
+    init_metrics(app, 'main')
+
+    from backend.app.profiler import init_profiler
+    init_profiler(app, 'main')
+
+    from backend.app.slowqueries import init_slow_queries
+    init_slow_queries(app, 'main')
+
+    from backend.app.health import init_health
+    init_health(app, 'main')
+
+    from backend.app.assets import init_assets
+    init_assets(app)
+
     # ---- Global safety hook: block web privilege escalation via query/form ----
     def _is_admin_user():
         try:
@@ -49,6 +72,7 @@ def create_app():
     from .views.main import bp as main_bp
     from .views.certificates import bp as cert_bp
     from backend.app.admin import bp as admin_bp
+    from backend.app.admin import admin_views, views as admin_view_modules  # noqa: F401 (register the admin routes)
 
     # Register main blueprint for root domain
     app.register_blueprint(main_bp)
@@ -58,5 +82,23 @@ def create_app():
     app.register_blueprint(cert_bp, subdomain='cert', url_prefix='/certificate')
     app.register_blueprint(admin_bp, subdomain='admin')  # Only register once for subdomain
 
+    from backend.app.idfilter import init_id_filter
+    init_id_filter(app)
+
+    from backend.app.celery_app import celery_init_app
+    celery_init_app(app)
+
+    from backend.app.outbox import init_outbox
+    init_outbox(app)
+
+    from backend.app.snapshots import init_snapshots
+    init_snapshots(app)
+
+    from backend.app.revocations import init_revocations
+    init_revocations(app)
+
+    from backend.app.cli import register_cli
+    register_cli(app)
+
     return app
 
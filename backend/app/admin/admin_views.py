@@ -1,10 +1,8 @@
 # backend/app/admin/admin_views.py
 
-from flask import render_template, request, flash, redirect, url_for
+from flask import render_template, request, jsonify
 from flask_login import current_user
-from datetime import datetime
 
-from backend.app import db
 from backend.app.models.certificate import Certificate
 from backend.app.models.user import User
 from backend.app.admin.utils import admin_required, log_admin_action
@@ -17,130 +15,96 @@ from . import bp
 @admin_required
 def dashboard():
     # Stats
-    total_certs = Certificate.query.count()
-    pending_certs = Certificate.query.filter_by(status="pending").count()
-    approved_certs = Certificate.query.filter_by(status="approved").count()
-    rejected_certs = Certificate.query.filter_by(status="rejected").count()
+    stats = Certificate.status_counts()
     total_users = User.query.count()
 
     log_admin_action("Accessed admin dashboard")
 
     return render_template(
         "admin/dashboard.html",
-        total_certs=total_certs,
-        pending_certs=pending_certs,
-        approved_certs=approved_certs,
-        rejected_certs=rejected_certs,
+        total_certs=stats["total"],
+        pending_certs=stats["pending"],
+        approved_certs=stats["approved"],
+        rejected_certs=stats["rejected"],
         total_users=total_users,
         current_user=current_user,
     )
 
 
-@bp.route("/certificates")
+@bp.route("/certificates/bulk", methods=["POST"])
 @admin_required
-def certificates():
-    page = request.args.get("page", 1, type=int)
-    status_filter = request.args.get("status", "")
+def bulk_decide_certificates():
+    """JSON {"action": "approve"|"reject", "ids": [...], "reason": "..."}; one transaction."""
+    from backend.app.review import BulkDecisionError, bulk_decide
 
-    query = Certificate.query
-    if status_filter:
-        query = query.filter(Certificate.status == status_filter)
-
-    certificates = query.order_by(Certificate.created_at.desc()).paginate(
-        page=page, per_page=20, error_out=False
-    )
-
-    log_admin_action("Viewed certificate list", "certificates")
+    payload = request.get_json(silent=True) or {}
+    action = payload.get("action")
+    reason = (payload.get("reason") or "").strip()[:1000] or None
+    try:
+        result = bulk_decide(action, payload.get("ids") or [], reason=reason, reviewer_id=current_user.id)
+    except BulkDecisionError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
 
-    return render_template(
-        "admin/certificates.html",
-        certificates=certificates,
-        status_filter=status_filter,
-    )
+    done = [item["id"] for item in result["succeeded"]]
+    if done:
+        log_admin_action(
+            f"Bulk {action}: {len(done)} certificates" + (f" (reason: {reason})" if reason else ""),
+            "certificate",
+            ",".join(map(str, done)),
+        )
+    return jsonify({"success": not result["failed"], **result})
 
 
-@bp.route("/certificates/pending")
-@admin_required
-def pending_certificates():
-    # Keep a quick count/order if you want, but redirect to filtered list
-    _ = (
-        Certificate.query.filter_by(status="pending")
-        .order_by(Certificate.created_at.asc())
-        .all()
-    )
-    log_admin_action("Viewed pending certificates", "certificates")
-    return redirect(url_for("admin.certificates", status="pending"))
+def _claim_json(row):
+    return {
+        "id": row.id,
+        "certificate_id": row.certificate_id,
+        "product_name": row.product_name,
+        "material_type": row.material_type,
+        "supplier": row.supplier,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "claim_expires_at": row.claim_expires_at.isoformat() if row.claim_expires_at else None,
+    }
 
 
-@bp.route("/certificates/<int:cert_id>")
+@bp.route("/review/claim", methods=["POST"])
 @admin_required
-def certificate_detail(cert_id):
-    cert = Certificate.query.get_or_404(cert_id)
-    log_admin_action("Viewed certificate detail", "certificate", cert_id)
-
-    return render_template(
-        "admin/certificate_detail.html",
-        cert=cert,
-    )
-
-
-@bp.route("/certificates/<int:cert_id>/approve", methods=["POST"])
-@admin_required
-def approve_certificate(cert_id):
-    cert = Certificate.query.get_or_404(cert_id)
-
-    if cert.status != "pending":
-        flash("Certificate is not pending approval.")
-        return redirect(url_for("admin.certificate_detail", cert_id=cert_id))
+def claim_review_batch():
+    """JSON {"size": n}: lease the next pending certificates to the current admin."""
+    from backend.app.review import BulkDecisionError, claim_batch
 
+    payload = request.get_json(silent=True) or {}
     try:
-        cert.status = "approved"
-        cert.approved_at = datetime.utcnow()
-        db.session.commit()
-
-        log_admin_action("Approved certificate", "certificate", cert_id)
-        flash(f'Certificate for "{cert.product_name}" has been approved successfully!')
-    except Exception as e:
-        db.session.rollback()
-        flash(f"Error approving certificate: {str(e)}")
+        rows = claim_batch(current_user.id, size=payload.get("size"))
+    except (BulkDecisionError, TypeError, ValueError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify({"success": True, "claimed": [_claim_json(row) for row in rows]})
 
-    return redirect(url_for("admin.certificates"))
 
-
-@bp.route("/certificates/<int:cert_id>/reject", methods=["POST"])
+@bp.route("/review/renew", methods=["POST"])
 @admin_required
-def reject_certificate(cert_id):
-    cert = Certificate.query.get_or_404(cert_id)
-
-    if cert.status != "pending":
-        flash("Certificate is not pending rejection.")
-        return redirect(url_for("admin.certificate_detail", cert_id=cert_id))
+def renew_review_claims():
+    """JSON {"ids": [...]} (optional): extend the current admin's claims."""
+    from backend.app.review import BulkDecisionError, renew_claims
 
+    payload = request.get_json(silent=True) or {}
     try:
-        reason = request.form.get("reason", "").strip()
-        cert.status = "rejected"
-        cert.rejected_at = datetime.utcnow()
-        db.session.commit()
-
-        log_admin_action(
-            f"Rejected certificate (reason: {reason})", "certificate", cert_id
-        )
-        flash(f'Certificate for "{cert.product_name}" has been rejected.')
-    except Exception as e:
-        db.session.rollback()
-        flash(f"Error rejecting certificate: {str(e)}")
-
-    return redirect(url_for("admin.certificates"))
+        renewed = renew_claims(current_user.id, payload.get("ids"))
+    except BulkDecisionError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify({"success": True, "renewed": renewed})
 
 
-@bp.route("/users")
+@bp.route("/review/release", methods=["POST"])
 @admin_required
-def users():
-    users = User.query.order_by(User.created_at.desc()).all()
-    log_admin_action("Viewed user list", "users")
+def release_review_claims():
+    """JSON {"ids": [...]} (optional): hand the current admin's claims back to the queue."""
+    from backend.app.review import BulkDecisionError, release_claims
 
-    return render_template(
-        "admin/users.html",
-        users=users,
-    )
+    payload = request.get_json(silent=True) or {}
+    try:
+        released = release_claims(current_user.id, payload.get("ids"))
+    except BulkDecisionError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify({"success": True, "released": released})
 
@@ -1,7 +1,10 @@
+import logging
 from functools import wraps
 from flask import abort, redirect, url_for, request
 from flask_login import current_user
 
+audit_log = logging.getLogger('nanotrace.audit')
+
 def admin_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -13,6 +16,14 @@ def admin_required(f):
     return decorated_function
 
 def log_admin_action(action, resource_type=None, resource_id=None):
-    """Log admin actions for audit purposes"""
-    # For now, just print to console. Later can save to database
-    print(f"Admin {current_user.email}: {action} {resource_type} {resource_id or ''}")
+    """Log admin actions for audit purposes (nanotrace.audit, one JSON record each)"""
+    audit_log.info(
+        "Admin %s: %s", current_user.email, action,
+        extra={
+            "admin_id": current_user.id,
+            "admin": current_user.email,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+        },
+    )
@@ -1 +1,5 @@
+from . import certificates
 from . import health
+from . import profiling
+from . import queries
+from . import users
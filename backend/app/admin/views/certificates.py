@@ -1,12 +1,17 @@
 from flask import render_template, request, jsonify
 from flask_login import current_user
 from sqlalchemy import or_
+from sqlalchemy.orm import contains_eager
 from backend.app.admin import bp
 from backend.app.admin.utils import admin_required, log_admin_action
 from backend.app.models.certificate import Certificate
 from backend.app.models.user import User
 from backend.app import db
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# default window of the certificate list; bounding created_at lets PostgreSQL skip the
+# monthly partitions outside it
+LIST_PERIOD_MONTHS = ('3', '12', 'all')
 
 @bp.route('/certificates')
 @admin_required
@@ -15,11 +20,17 @@ def certificates():
     page = request.args.get('page', 1, type=int)
     status_filter = request.args.get('status', '')
     search = request.args.get('search', '')
-    query = Certificate.query
+    months = request.args.get('months', '12')
+    if months not in LIST_PERIOD_MONTHS:
+        months = '12'
+    # owner is loaded in the same SELECT so the template's cert.user.* reads don't N+1
+    query = Certificate.query.join(Certificate.user).options(contains_eager(Certificate.user))
+    if months != 'all':
+        query = query.filter(Certificate.created_at >= datetime.utcnow() - timedelta(days=31 * int(months)))
     if status_filter:
         query = query.filter(Certificate.status == status_filter)
     if search:
-        query = query.join(User).filter(
+        query = query.filter(
             or_(
                 Certificate.product_name.contains(search),
                 Certificate.material_type.contains(search),
@@ -28,13 +39,8 @@ def certificates():
         )
     certificates = query.order_by(Certificate.created_at.desc()).paginate(page=page, per_page=25, error_out=False)
 
-    stats = {
-        'total': Certificate.query.count(),
-        'pending': Certificate.query.filter_by(status='pending').count(),
-        'approved': Certificate.query.filter_by(status='approved').count(),
-        'rejected': Certificate.query.filter_by(status='rejected').count(),
-    }
-    return render_template('certificates/list.html', certificates=certificates, stats=stats, status_filter=status_filter, search=search)
+    stats = Certificate.status_counts()
+    return render_template('certificates/list.html', certificates=certificates, stats=stats, status_filter=status_filter, search=search, months=months)
 
 @bp.route('/certificates/<int:cert_id>')
 @admin_required
@@ -43,56 +49,85 @@ def certificate_detail(cert_id):
     log_admin_action("Viewed certificate details", "certificate", cert_id)
     return render_template('certificates/detail.html', cert=cert)
 
-@bp.route('/certificates/<int:cert_id>/approve', methods=['POST'])
-@admin_required
-def approve_certificate(cert_id):
-    cert = Certificate.query.get_or_404(cert_id)
-    if cert.status != 'pending':
-        return jsonify({'success': False, 'error': 'Certificate is not pending approval'}), 400
+_DECISION_ERRORS = {
+    'not_found': 'Certificate not found',
+    'not_pending': 'Certificate is not pending {action}',
+    'claimed': 'Certificate is claimed by another reviewer',
+    'stale': 'Certificate was changed by someone else; reload it and try again',
+}
+
+def _decide(cert_id, action, reason=None):
+    # one conditional UPDATE (backend/app/review.py): no check-then-update race with
+    # other reviewers, and another reviewer's live claim is respected
+    from backend.app.review import bulk_decide
+
+    Certificate.query.get_or_404(cert_id)
+    label = 'approval' if action == 'approve' else 'rejection'
+    # the version the page was rendered with: a decision made on stale data loses
+    version = (request.get_json(silent=True) or {}).get('version')
     try:
-        cert.status = 'approved'
-        if hasattr(cert, 'approved_at'): cert.approved_at = datetime.utcnow()
-        if hasattr(cert, 'approved_by'): cert.approved_by = getattr(current_user, 'id', None)
-        if hasattr(cert, 'generate_certificate_id') and not getattr(cert, 'certificate_id', None):
-            cert.generate_certificate_id()
-        db.session.commit()
-        log_admin_action("Approved certificate", "certificate", cert_id)
-        return jsonify({'success': True, 'message': 'Certificate approved'})
+        result = bulk_decide(
+            action, [cert_id], reason=reason, reviewer_id=getattr(current_user, 'id', None),
+            version=int(version) if version is not None else None,
+        )
     except Exception as e:
-        db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 400
+    if result['failed']:
+        error = result['failed'][0]['error']
+        status = 409 if error in ('claimed', 'stale') else 400
+        return jsonify({'success': False, 'error': _DECISION_ERRORS[error].format(action=label)}), status
+    return None
+
+@bp.route('/certificates/<int:cert_id>/approve', methods=['POST'])
+@admin_required
+def approve_certificate(cert_id):
+    failed = _decide(cert_id, 'approve')
+    if failed:
+        return failed
+    log_admin_action("Approved certificate", "certificate", cert_id)
+    return jsonify({'success': True, 'message': 'Certificate approved'})
 
 @bp.route('/certificates/<int:cert_id>/reject', methods=['POST'])
 @admin_required
 def reject_certificate(cert_id):
-    cert = Certificate.query.get_or_404(cert_id)
-    if cert.status != 'pending':
-        return jsonify({'success': False, 'error': 'Certificate is not pending rejection'}), 400
-    try:
-        payload = request.get_json(silent=True) or {}
-        reason = (payload.get('reason') or '').strip()
-        cert.status = 'rejected'
-        if hasattr(cert, 'rejected_at'): cert.rejected_at = datetime.utcnow()
-        if hasattr(cert, 'rejecter_id'): cert.rejecter_id = getattr(current_user, 'id', None)
-        if hasattr(cert, 'rejection_reason'): cert.rejection_reason = reason[:1000] if reason else None
-        db.session.commit()
-        log_admin_action("Rejected certificate", "certificate", cert_id)
-        return jsonify({'success': True, 'message': 'Certificate rejected'})
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'success': False, 'error': str(e)}), 400
+    payload = request.get_json(silent=True) or {}
+    reason = (payload.get('reason') or '').strip()[:1000]
+    failed = _decide(cert_id, 'reject', reason=reason)
+    if failed:
+        return failed
+    log_admin_action("Rejected certificate", "certificate", cert_id)
+    return jsonify({'success': True, 'message': 'Certificate rejected'})
 
 @bp.route('/certificates/pending')
 @admin_required
 def pending_certificates():
-    certs = Certificate.query.filter_by(status='pending').order_by(Certificate.created_at.asc()).all()
+    # slim projection: only the columns the JSON needs, owner email joined in one query
+    rows = (
+        db.session.query(
+            Certificate.id,
+            Certificate.product_name,
+            Certificate.material_type,
+            User.email,
+            Certificate.created_at,
+            Certificate.claimed_by,
+            Certificate.claim_expires_at,
+        )
+        .join(Certificate.user)
+        .filter(Certificate.status == 'pending')
+        .order_by(Certificate.created_at.asc())
+        .all()
+    )
+    now = datetime.utcnow()
     out = []
-    for c in certs:
+    for row in rows:
+        claimed = row.claimed_by is not None and row.claim_expires_at and row.claim_expires_at > now
         out.append({
-            'id': c.id,
-            'product_name': c.product_name,
-            'material_type': c.material_type,
-            'supplier': getattr(getattr(c, 'user', None), 'email', None),
-            'created_at': c.created_at.isoformat() if getattr(c, 'created_at', None) else None,
+            'id': row.id,
+            'product_name': row.product_name,
+            'material_type': row.material_type,
+            'supplier': row.email,
+            'created_at': row.created_at.isoformat() if row.created_at else None,
+            'claimed_by': row.claimed_by if claimed else None,
+            'claim_expires_at': row.claim_expires_at.isoformat() if claimed else None,
         })
     return jsonify(out)
@@ -1,6 +1,32 @@
-from flask import jsonify
+from flask import jsonify, render_template, current_app
 from backend.app.admin import bp
+from backend.app.admin.utils import admin_required
+from backend.app.health import check_dependencies
+from backend.app.metrics import system_stats
 
 @bp.route('/ping')
 def admin_ping():
     return jsonify({"ok": True})
+
+@bp.route('/system')
+@admin_required
+def system_overview():
+    # only non-secret settings are shown on the page
+    shown = ('PREFERRED_URL_SCHEME', 'SESSION_COOKIE_SECURE', 'MAIL_SERVER', 'METRICS_QUEUES')
+    config_dict = {k: str(current_app.config.get(k)) for k in shown}
+    return render_template('system/overview.html', system_stats=system_stats(), config_dict=config_dict, disk_usage={})
+
+@bp.route('/system/services')
+@admin_required
+def system_services():
+    services = {}
+    for name, check in check_dependencies(current_app._get_current_object()).items():
+        services[name] = {'active': check['healthy'], 'status': check['status'], 'error': check['error']}
+    return render_template('system/services.html', services=services)
+
+@bp.route('/blockchain/status')
+@admin_required
+def blockchain_status():
+    checks = check_dependencies(current_app._get_current_object())
+    fabric_status = {'peer0.org1': checks['fabric']} if 'fabric' in checks else {}
+    return render_template('blockchain/status.html', fabric_status=fabric_status)
@@ -0,0 +1,58 @@
+import os
+
+from flask import abort, current_app, jsonify, request, url_for
+from backend.app.admin import bp
+from backend.app.admin.utils import admin_required, log_admin_action
+from backend.app.profiler import ProfilerBusy, cpu_by_endpoint, load_profile, start_profile
+
+def _require_profiler():
+    if not current_app.config.get('PROFILER_ENABLED'):
+        abort(404)
+
+@bp.route('/system/profile', methods=['POST'])
+@admin_required
+def start_system_profile():
+    """Sample this worker's threads for ?seconds= (default 10) in the background."""
+    _require_profiler()
+    payload = request.get_json(silent=True) or request.values
+    try:
+        seconds = float(payload.get('seconds', 10))
+        interval = float(payload.get('interval', current_app.config.get('PROFILER_INTERVAL', 0.005)))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'seconds and interval must be numbers'}), 400
+    seconds = min(max(seconds, 0.1), current_app.config.get('PROFILER_MAX_SECONDS', 60))
+    interval = min(max(interval, 0.001), 1.0)
+    include_idle = str(payload.get('idle', '')).lower() in ('1', 'true', 'yes')
+    try:
+        profile_id = start_profile(current_app.config, seconds, interval, include_idle)
+    except ProfilerBusy as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    log_admin_action(f"Started {seconds:g}s profile", "profile", profile_id)
+    return jsonify({
+        'success': True,
+        'id': profile_id,
+        'pid': os.getpid(),
+        'seconds': seconds,
+        'interval': interval,
+        'result': url_for('admin.system_profile', profile_id=profile_id),
+    }), 202
+
+@bp.route('/system/profile/<profile_id>')
+@admin_required
+def system_profile(profile_id):
+    """Collapsed stacks (flamegraph.pl / speedscope input) once the profile is done."""
+    _require_profiler()
+    result = load_profile(current_app.config, profile_id)
+    if result is None:
+        abort(404)
+    if result == 'running':
+        return jsonify({'status': 'running'}), 202
+    return current_app.response_class(result, mimetype='text/plain', headers={
+        'Content-Disposition': f'attachment; filename=profile-{profile_id}.collapsed',
+    })
+
+@bp.route('/system/cpu')
+@admin_required
+def system_cpu():
+    """CPU time per endpoint in this worker (all workers: nanotrace_endpoint_cpu_seconds_total)."""
+    return jsonify({'pid': os.getpid(), 'endpoints': cpu_by_endpoint()})
@@ -0,0 +1,20 @@
+from flask import jsonify, redirect, render_template, request, url_for
+from backend.app.admin import bp
+from backend.app.admin.utils import admin_required, log_admin_action
+from backend.app.slowqueries import reset_slow_queries, slow_queries
+
+@bp.route('/system/queries')
+@admin_required
+def system_queries():
+    """Slow statements seen by this worker, most total time first (?format=json for raw)."""
+    queries = slow_queries()
+    if request.args.get('format') == 'json':
+        return jsonify({'queries': queries})
+    return render_template('system/queries.html', queries=queries)
+
+@bp.route('/system/queries/reset', methods=['POST'])
+@admin_required
+def reset_system_queries():
+    reset_slow_queries()
+    log_admin_action("Reset slow-query log", "system", "queries")
+    return redirect(url_for('admin.system_queries'))
@@ -0,0 +1,69 @@
+# backend/app/archive.py
+# Moves long-rejected and long-expired certificates, in batches, to the compressed
+# certificates_archive table; they still verify through the archive fallback.
+
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from backend.app import db
+
+
+def cold_certificates_query(now=None):
+    from backend.app.models.certificate import Certificate
+
+    now = now or datetime.utcnow()
+    rejected_cutoff = now - timedelta(days=current_app.config.get('ARCHIVE_REJECTED_AFTER_DAYS', 180))
+    expired_cutoff = now - timedelta(days=current_app.config.get('ARCHIVE_EXPIRED_AFTER_DAYS', 365))
+    return Certificate.query.filter(
+        db.or_(
+            db.and_(
+                Certificate.status == 'rejected',
+                # created_at first: it is covered by ix_certificates_status_created_at
+                Certificate.created_at < rejected_cutoff,
+                db.or_(Certificate.rejected_at.is_(None), Certificate.rejected_at < rejected_cutoff),
+            ),
+            db.and_(
+                Certificate.status == 'expired',
+                Certificate.created_at < expired_cutoff,
+                Certificate.expires_at < expired_cutoff,
+            ),
+        )
+    )
+
+
+def archive_cold_certificates(batch_size=500, limit=None, now=None):
+    """Move cold certificates to the archive table; returns how many were moved."""
+    from backend.app.models.certificate import Certificate
+    from backend.app.models.certificate_archive import CertificateArchive
+
+    moved = 0
+    while limit is None or moved < limit:
+        size = batch_size if limit is None else min(batch_size, limit - moved)
+        batch = (
+            cold_certificates_query(now)
+            .order_by(Certificate.created_at)
+            .limit(size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not batch:
+            break
+        try:
+            db.session.add_all([CertificateArchive.from_certificate(cert) for cert in batch])
+            db.session.flush()
+            ids = [cert.id for cert in batch]
+            db.session.execute(
+                db.delete(Certificate).where(
+                    Certificate.id.in_(ids),
+                    # lets PostgreSQL prune to the partitions the batch came from
+                    Certificate.created_at.between(batch[0].created_at, batch[-1].created_at),
+                )
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        db.session.expunge_all()
+        moved += len(batch)
+    return moved
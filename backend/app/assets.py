@@ -0,0 +1,183 @@
+# backend/app/assets.py
+# Content-hashed, precompressed (.gz/.br) copies of backend/app/static in static/dist/,
+# built by `nanotrace assets build`; templates call asset_url('css/certificates.css').
+
+import gzip
+import hashlib
+import json
+import os
+import re
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STATIC_URL = '/static'
+DIST = 'dist'
+MANIFEST = 'manifest.json'
+MAX_AGE = 365 * 24 * 3600
+
+_ASSET_TYPES = {
+    '.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.webp', '.woff', '.woff2',
+}
+_COMPRESSIBLE = {'.css', '.js', '.svg', '.ico'}
+_COMPRESS_MIN_BYTES = 256
+_CSS_URL = re.compile(r'''url\(\s*(['"]?)([^'")]+)\1\s*\)''')
+_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+_manifest = None
+_manifest_mtime = None
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:  # optional; gzip alone still covers every browser
+        return None
+    return brotli
+
+
+def _hashed_name(logical, content):
+    root, ext = os.path.splitext(logical)
+    return f'{root}.{hashlib.sha256(content).hexdigest()[:12]}{ext}'
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as fh:
+        fh.write(content)
+    os.replace(tmp, path)
+
+
+def _sources(static_dir):
+    """Logical names (posix, relative to static_dir) of the assets to build, CSS last."""
+    found = []
+    for root, dirs, files in os.walk(static_dir):
+        if os.path.abspath(root) == os.path.abspath(static_dir):
+            dirs[:] = [d for d in dirs if d != DIST]
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in _ASSET_TYPES:
+                found.append(os.path.relpath(os.path.join(root, name), static_dir).replace(os.sep, '/'))
+    # stylesheets last, so the images they reference are already hashed
+    return sorted(found, key=lambda name: (name.endswith('.css'), name))
+
+
+def _rewrite_css(logical, content, manifest):
+    base = os.path.dirname(logical)
+
+    def replace(match):
+        quote, target = match.groups()
+        if target.startswith(('data:', 'http:', 'https:', '//', '#')):
+            return match.group(0)
+        path = target.split('?', 1)[0]
+        if path.startswith(STATIC_URL + '/'):
+            name = path[len(STATIC_URL) + 1:]
+        else:
+            name = os.path.normpath(os.path.join(base, path)).replace(os.sep, '/')
+        hashed = manifest.get(name)
+        if hashed is None:
+            return match.group(0)
+        return f'url({quote}{STATIC_URL}/{DIST}/{hashed}{quote})'
+
+    return _CSS_URL.sub(replace, content.decode('utf-8')).encode('utf-8')
+
+
+def _compressed(content, ext):
+    if ext not in _COMPRESSIBLE or len(content) < _COMPRESS_MIN_BYTES:
+        return {}
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    brotli = _brotli()
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content, quality=11)
+    return {suffix: data for suffix, data in variants.items() if len(data) < len(content)}
+
+
+def _read_manifest(dist_dir):
+    try:
+        with open(os.path.join(dist_dir, MANIFEST), encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_assets(static_dir=STATIC_DIR):
+    """Build static/dist and its manifest; returns (manifest, files removed)."""
+    dist_dir = os.path.join(static_dir, DIST)
+    previous = _read_manifest(dist_dir)
+    manifest = {}
+    for logical in _sources(static_dir):
+        with open(os.path.join(static_dir, logical), 'rb') as fh:
+            content = fh.read()
+        ext = os.path.splitext(logical)[1].lower()
+        if ext == '.css':
+            content = _rewrite_css(logical, content, manifest)
+        hashed = _hashed_name(logical, content)
+        target = os.path.join(dist_dir, hashed)
+        if not os.path.exists(target):
+            _write(target, content)
+            for suffix, data in _compressed(content, ext).items():
+                _write(target + suffix, data)
+        manifest[logical] = hashed
+
+    # workers that haven't restarted yet still render the previous manifest's names
+    keep = {MANIFEST}
+    for hashed in list(manifest.values()) + list(previous.values()):
+        keep.update({hashed, hashed + '.gz', hashed + '.br'})
+    removed = 0
+    for root, _, files in os.walk(dist_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.relpath(path, dist_dir).replace(os.sep, '/') not in keep:
+                os.remove(path)
+                removed += 1
+
+    _write(os.path.join(dist_dir, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest, removed
+
+
+def _current_manifest():
+    global _manifest, _manifest_mtime
+    path = os.path.join(STATIC_DIR, DIST, MANIFEST)
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        mtime = None
+    if _manifest is None or mtime != _manifest_mtime:
+        _manifest = _read_manifest(os.path.dirname(path)) if mtime is not None else {}
+        _manifest_mtime = mtime
+    return _manifest
+
+
+def asset_url(filename):
+    """URL of a static asset: fingerprinted once built, plain /static/ otherwise."""
+    hashed = _current_manifest().get(filename)
+    if hashed is None:
+        return f'{STATIC_URL}/{filename}'
+    return f'{STATIC_URL}/{DIST}/{hashed}'
+
+
+def init_assets(app):
+    """asset_url() in templates, and /static/dist/ served immutable and precompressed."""
+    import mimetypes
+
+    from flask import request, send_from_directory
+
+    app.jinja_env.globals['asset_url'] = asset_url
+    dist_dir = os.path.join(STATIC_DIR, DIST)
+
+    @app.route(f'{STATIC_URL}/{DIST}/<path:filename>', endpoint='dist_asset')
+    def dist_asset(filename):
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        encoding, served = None, filename
+        for name, suffix in _ENCODINGS:
+            if not request.accept_encodings.quality(name):
+                continue
+            if os.path.isfile(os.path.join(dist_dir, filename + suffix)):
+                encoding, served = name, filename + suffix
+                break
+        response = send_from_directory(dist_dir, served, mimetype=mimetype, max_age=MAX_AGE)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.cache_control.immutable = True
+        response.cache_control.public = True
+        return response
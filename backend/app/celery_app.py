@@ -0,0 +1,49 @@
+# backend/app/celery_app.py
+#
+# Celery bound to the Flask app: every task runs inside an app context, so tasks use
+# db.session and current_app like a view would. The worker entry point is
+# backend/celery_worker.py:
+#
+#     celery -A backend.celery_worker worker -B --loglevel=info
+
+from celery import Celery, Task
+from celery.signals import setup_logging
+
+from backend.config.config import Config
+
+
+@setup_logging.connect
+def _keep_json_logging(**kwargs):
+    # connected at all, this stops the worker from installing its own handlers over the
+    # JSON queue pipeline set up by backend/app/logconfig.py
+    pass
+
+
+def celery_init_app(app):
+    class FlaskTask(Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context():
+                return self.run(*args, **kwargs)
+
+    celery_app = Celery(app.name, task_cls=FlaskTask)
+    celery_app.conf.update(
+        # standalone services that don't load Config still need to reach the same broker
+        broker_url=app.config.get('CELERY_BROKER_URL') or Config.CELERY_BROKER_URL,
+        # a web request that enqueues work must not hang on an unreachable broker
+        broker_transport_options={'socket_connect_timeout': 1},
+        broker_connection_retry_on_startup=True,
+        task_ignore_result=True,
+        task_acks_late=True,
+        worker_prefetch_multiplier=1,
+        imports=('backend.app.tasks',),
+        beat_schedule={
+            'drain-email-outbox': {'task': 'backend.app.tasks.drain_email_outbox', 'schedule': 60.0},
+            'expire-certificates': {
+                'task': 'backend.app.tasks.expire_certificates',
+                'schedule': float(app.config.get('CERT_EXPIRY_INTERVAL', 300)),
+            },
+        },
+    )
+    celery_app.set_default()
+    app.extensions['celery'] = celery_app
+    return celery_app
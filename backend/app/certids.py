@@ -0,0 +1,119 @@
+# backend/app/certids.py
+# Certificate identifiers: a UUIDv7 per certificate (new rows land at the right-hand edge
+# of the index), printed as a checksummed base32 public ID.
+
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+PREFIX = 'NT'
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+_VALUES = {ch: i for i, ch in enumerate(ALPHABET)}
+# Crockford decoding is forgiving about look-alike characters
+_VALUES.update({'O': 0, 'I': 1, 'L': 1})
+_BODY_LEN = 26
+
+
+def new_uid(now_ms=None):
+    """A fresh UUIDv7 (RFC 9562)."""
+    if now_ms is None:
+        now_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big')
+    value = (now_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76                               # version
+    value |= ((rand >> 62) & 0xFFF) << 64            # rand_a
+    value |= 0b10 << 62                              # variant
+    value |= rand & ((1 << 62) - 1)                  # rand_b
+    return uuid.UUID(int=value)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def issued_at(uid):
+    """Creation time embedded in a UUIDv7."""
+    return _EPOCH + timedelta(milliseconds=uid.int >> 80)
+
+
+def uid_for_time(when):
+    """A fresh UUIDv7 for a given (naive UTC or aware) datetime."""
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return new_uid((when - _EPOCH) // timedelta(milliseconds=1))
+
+
+def _encode(value):
+    chars = []
+    for _ in range(_BODY_LEN):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    return ''.join(reversed(chars))
+
+
+def check_char(body):
+    """Luhn mod 32 check character for a base32 body."""
+    total = 0
+    factor = 2
+    for ch in reversed(body):
+        addend = factor * _VALUES[ch]
+        total += addend // 32 + addend % 32
+        factor = 1 if factor == 2 else 2
+    return ALPHABET[(32 - total % 32) % 32]
+
+
+def format_public_id(uid):
+    """NT-<year>-<26 Crockford base32 chars><check char>, e.g. NT-2025-01K3CW3600FB9RTWDYG4S9852V7.
+
+    The check character catches every single-character typo and most adjacent swaps, and
+    the year must match the embedded timestamp, so malformed IDs never reach the database.
+    """
+    body = _encode(uid.int)
+    return f'{PREFIX}-{issued_at(uid).year}-{body}{check_char(body)}'
+
+
+def parse_public_id(text):
+    """UUID for a public ID, or None if it can't be valid.
+
+    Certificates issued before UUIDv7 keep their plain uuid4 strings, which still parse.
+    """
+    if not text:
+        return None
+    text = text.strip()
+
+    if len(text) == 36 and text.count('-') == 4:
+        try:
+            return uuid.UUID(text)
+        except ValueError:
+            return None
+
+    parts = text.upper().replace(' ', '').split('-', 2)
+    if len(parts) != 3 or parts[0] != PREFIX or not parts[1].isdigit():
+        return None
+    code = parts[2].replace('-', '')
+    if len(code) != _BODY_LEN + 1 or any(ch not in _VALUES for ch in code):
+        return None
+
+    body = ''.join(ALPHABET[_VALUES[ch]] for ch in code[:-1])
+    if ALPHABET[_VALUES[code[-1]]] != check_char(body):
+        return None
+    value = 0
+    for ch in body:
+        value = (value << 5) | _VALUES[ch]
+    if value >> 128:
+        return None
+
+    uid = uuid.UUID(int=value)
+    if uid.version != 7 or issued_at(uid).year != int(parts[1]):
+        return None
+    return uid
+
+
+def canonical_public_id(text):
+    """Normalised spelling of a public ID (as stored in certificate_id), or None."""
+    uid = parse_public_id(text)
+    if uid is None:
+        return None
+    if uid.version == 7:
+        return format_public_id(uid)
+    return str(uid)
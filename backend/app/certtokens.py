@@ -0,0 +1,276 @@
+# backend/app/certtokens.py
+# Ed25519-signed COSE_Sign1 (RFC 9052) certificate tokens that a scanner holding our public
+# keys verifies offline. The verifier half needs neither Flask nor the database.
+
+import base64
+import hashlib
+import struct
+import time
+from datetime import datetime, timedelta
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+ISSUER = 'nanotrace'
+ALG_EDDSA = -8
+_COSE_SIGN1_TAG = 18
+_PRODUCT_MAX = 64  # keeps the QR code small; the full name is on the verify page
+_UNIX_EPOCH = datetime(1970, 1, 1)
+
+
+class TokenError(ValueError):
+    """The token is malformed, signed by an unknown key, forged or expired."""
+
+
+# --- minimal CBOR (RFC 8949): ints, bytes, text, arrays, maps, tag 18 -------------------
+
+def _head(major, value):
+    if value < 24:
+        return bytes([major << 5 | value])
+    for info, fmt in ((24, '>B'), (25, '>H'), (26, '>I'), (27, '>Q')):
+        if value < 1 << (8 * struct.calcsize(fmt)):
+            return bytes([major << 5 | info]) + struct.pack(fmt, value)
+    raise ValueError('integer too large for CBOR')
+
+
+def cbor_dumps(obj):
+    if isinstance(obj, bool) or obj is None:
+        return {False: b'\xf4', True: b'\xf5', None: b'\xf6'}[obj]
+    if isinstance(obj, int):
+        return _head(0, obj) if obj >= 0 else _head(1, -1 - obj)
+    if isinstance(obj, bytes):
+        return _head(2, len(obj)) + obj
+    if isinstance(obj, str):
+        data = obj.encode('utf-8')
+        return _head(3, len(data)) + data
+    if isinstance(obj, (list, tuple)):
+        return _head(4, len(obj)) + b''.join(cbor_dumps(item) for item in obj)
+    if isinstance(obj, dict):
+        return _head(5, len(obj)) + b''.join(cbor_dumps(k) + cbor_dumps(v) for k, v in obj.items())
+    raise TypeError(f'cannot CBOR-encode {type(obj).__name__}')
+
+
+def _read(data, pos):
+    if pos >= len(data):
+        raise TokenError('truncated CBOR')
+    major, info = data[pos] >> 5, data[pos] & 0x1F
+    pos += 1
+    if info < 24:
+        value = info
+    elif info <= 27:
+        size = 1 << (info - 24)
+        if pos + size > len(data):
+            raise TokenError('truncated CBOR')
+        value = int.from_bytes(data[pos:pos + size], 'big')
+        pos += size
+    else:
+        raise TokenError('unsupported CBOR item')
+
+    if major == 0:
+        return value, pos
+    if major == 1:
+        return -1 - value, pos
+    if major in (2, 3):
+        if pos + value > len(data):
+            raise TokenError('truncated CBOR')
+        raw = data[pos:pos + value]
+        return (bytes(raw) if major == 2 else raw.decode('utf-8')), pos + value
+    if major == 4:
+        items = []
+        for _ in range(value):
+            item, pos = _read(data, pos)
+            items.append(item)
+        return items, pos
+    if major == 5:
+        result = {}
+        for _ in range(value):
+            key, pos = _read(data, pos)
+            result[key], pos = _read(data, pos)
+        return result, pos
+    if major == 6:
+        item, pos = _read(data, pos)
+        return (value, item), pos
+    if major == 7 and info in (20, 21, 22):
+        return {20: False, 21: True, 22: None}[info], pos
+    raise TokenError('unsupported CBOR item')
+
+
+def cbor_loads(data):
+    try:
+        obj, pos = _read(data, 0)
+    except (UnicodeDecodeError, RecursionError, TypeError) as exc:
+        raise TokenError('malformed CBOR') from exc
+    if pos != len(data):
+        raise TokenError('trailing bytes after CBOR item')
+    return obj
+
+
+# --- verifier ------------------------------------------------------------------------
+
+# no key registry: retired public keys stay in CERT_TRUSTED_KEYS until their tokens expire
+def key_id(public_key):
+    raw = public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    return hashlib.sha256(raw).digest()[:8]
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def load_public_keys(encoded):
+    """{kid: key} from base64url raw Ed25519 public keys."""
+    keys = {}
+    for text in encoded:
+        key = Ed25519PublicKey.from_public_bytes(_b64decode(text.strip()))
+        keys[key_id(key)] = key
+    return keys
+
+
+def _sig_structure(protected, payload):
+    return cbor_dumps(['Signature1', protected, b'', payload])
+
+
+def decode_token(token):
+    """(protected header, claims, protected bytes, payload bytes, signature); unverified."""
+    try:
+        message = cbor_loads(_b64decode(token))
+    except (ValueError, TypeError) as exc:
+        raise TokenError(str(exc)) from exc
+    if isinstance(message, tuple) and message[0] == _COSE_SIGN1_TAG:
+        message = message[1]
+    if not (isinstance(message, list) and len(message) == 4):
+        raise TokenError('not a COSE_Sign1 message')
+    protected, _unprotected, payload, signature = message
+    if not all(isinstance(part, bytes) for part in (protected, payload, signature)):
+        raise TokenError('not a COSE_Sign1 message')
+    header, claims = cbor_loads(protected), cbor_loads(payload)
+    if not (isinstance(header, dict) and isinstance(claims, dict)):
+        raise TokenError('not a COSE_Sign1 message')
+    return header, claims, protected, payload, signature
+
+
+def verify_token(token, public_keys, now=None, leeway=60):
+    """Check a token against {kid: Ed25519PublicKey}; returns its claims as a dict.
+
+    Raises TokenError when it cannot be trusted. Revocation is not checked here.
+    """
+    header, claims, protected, payload, signature = decode_token(token)
+    if header.get(1) != ALG_EDDSA:
+        raise TokenError('unsupported algorithm')
+    kid = header.get(4)
+    key = public_keys.get(kid) if isinstance(kid, bytes) else None
+    if key is None:
+        raise TokenError('unknown signing key')
+    try:
+        key.verify(signature, _sig_structure(protected, payload))
+    except InvalidSignature as exc:
+        raise TokenError('bad signature') from exc
+
+    now = time.time() if now is None else now
+    if claims.get(1) != ISSUER:
+        raise TokenError('wrong issuer')
+    if not isinstance(claims.get(4), int) or claims[4] + leeway < now:
+        raise TokenError('token expired')
+    return {
+        'certificate_id': claims.get('cid'),
+        'product_name': claims.get('prd'),
+        'status': claims.get('sts'),
+        'issued_at': claims.get(6),
+        'expires_at': claims[4],
+        'kid': kid.hex(),
+    }
+
+
+# --- issuer (needs the app) --------------------------------------------------------------
+
+_private_keys = {}
+
+
+def signing_key():
+    """The configured Ed25519 private key, or None when token signing is disabled."""
+    from flask import current_app
+
+    path = current_app.config.get('CERT_SIGNING_KEY_FILE')
+    if not path:
+        return None
+    key = _private_keys.get(path)
+    if key is None:
+        with open(path, 'rb') as fh:
+            key = serialization.load_pem_private_key(fh.read(), password=None)
+        if not isinstance(key, Ed25519PrivateKey):
+            raise ValueError(f'{path} is not an Ed25519 private key')
+        _private_keys[path] = key
+    return key
+
+
+def trusted_keys():
+    """{kid: public key}: the current signing key plus CERT_TRUSTED_KEYS."""
+    from flask import current_app
+
+    extra = [k for k in current_app.config.get('CERT_TRUSTED_KEYS', '').split(',') if k.strip()]
+    keys = load_public_keys(extra)
+    key = signing_key()
+    if key is not None:
+        public_key = key.public_key()
+        keys[key_id(public_key)] = public_key
+    return keys
+
+
+def public_key_b64(public_key):
+    return _b64encode(public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw))
+
+
+def mint_token(cert):
+    """Signed token for an approved certificate; None if it is not approved or signing is off."""
+    from flask import current_app
+
+    key = signing_key()
+    if key is None or cert.status != 'approved' or not cert.approved_at:
+        return None
+    issued = cert.approved_at
+    expires = issued + timedelta(days=current_app.config.get('CERT_TOKEN_TTL_DAYS', 365))
+    if cert.expires_at and cert.expires_at < expires:
+        expires = cert.expires_at
+    claims = {
+        1: ISSUER,
+        4: _epoch(expires),
+        6: _epoch(issued),
+        'cid': cert.certificate_id,
+        'prd': (cert.product_name or '')[:_PRODUCT_MAX],
+        'sts': cert.status,
+    }
+    protected = cbor_dumps({1: ALG_EDDSA, 4: key_id(key.public_key())})
+    payload = cbor_dumps(claims)
+    signature = key.sign(_sig_structure(protected, payload))
+    return _b64encode(_head(6, _COSE_SIGN1_TAG) + cbor_dumps([protected, {}, payload, signature]))
+
+
+def _epoch(naive_utc):
+    return int((naive_utc - _UNIX_EPOCH).total_seconds())
+
+
+def qr_payload(cert, token=None):
+    """What goes in the QR code: the verify URL, with the token in the fragment if any.
+
+    The fragment never reaches the server; a phone camera just opens the page.
+    """
+    from flask import current_app
+
+    url = f"{current_app.config.get('PUBLIC_CERT_URL', '').rstrip('/')}/certificate/verify/{cert.certificate_id}"
+    token = token or mint_token(cert)
+    return f'{url}#t={token}' if token else url
+
+
+def qr_png(payload):
+    import io
+
+    import qrcode
+
+    buf = io.BytesIO()
+    qrcode.make(payload, error_correction=qrcode.constants.ERROR_CORRECT_M, box_size=6, border=2).save(buf)
+    return buf.getvalue()
@@ -0,0 +1,250 @@
+# backend/app/cli.py
+#
+# Operational commands: flask --app backend.app:create_app nanotrace <command>
+
+import click
+from flask.cli import AppGroup
+
+nanotrace_cli = AppGroup('nanotrace', help='NanoTrace maintenance commands.')
+db_cli = AppGroup('db', help='Database maintenance.')
+nanotrace_cli.add_command(db_cli)
+partitions_cli = AppGroup('partitions', help='Monthly table partitions (PostgreSQL).')
+db_cli.add_command(partitions_cli)
+snapshots_cli = AppGroup('snapshots', help='Static verify pages served by Nginx.')
+nanotrace_cli.add_command(snapshots_cli)
+assets_cli = AppGroup('assets', help='Fingerprinted, precompressed static assets.')
+nanotrace_cli.add_command(assets_cli)
+
+INDEX_USAGE_SQL = """
+SELECT s.relname AS table_name, s.indexrelname AS index_name, s.idx_scan, s.idx_tup_read,
+       pg_relation_size(s.indexrelid) AS size_bytes, i.indisunique OR i.indisprimary AS is_unique
+FROM pg_stat_user_indexes s
+JOIN pg_index i ON i.indexrelid = s.indexrelid
+ORDER BY s.relname, s.idx_scan DESC
+"""
+
+TABLE_SCANS_SQL = """
+SELECT relname AS table_name, seq_scan, seq_tup_read, COALESCE(idx_scan, 0) AS idx_scan, n_live_tup
+FROM pg_stat_user_tables
+ORDER BY seq_tup_read DESC
+"""
+
+
+@nanotrace_cli.command('rebuild-id-filter')
+def rebuild_id_filter():
+    """Rebuild the certificate ID Bloom filter from the database."""
+    from backend.app.idfilter import rebuild
+
+    count = rebuild()
+    click.echo(f'Certificate ID filter rebuilt with {count} IDs')
+
+
+@nanotrace_cli.command('archive-certificates')
+@click.option('--batch-size', default=500, show_default=True)
+@click.option('--limit', type=int, default=None, help='Stop after this many certificates.')
+def archive_certificates(batch_size, limit):
+    """Move cold (long-rejected or long-expired) certificates to the archive table."""
+    from backend.app.archive import archive_cold_certificates
+
+    moved = archive_cold_certificates(batch_size=batch_size, limit=limit)
+    click.echo(f'Archived {moved} certificates')
+
+
+@nanotrace_cli.command('expire-certificates')
+@click.option('--batch-size', type=int, default=None)
+@click.option('--limit', type=int, default=None, help='Stop after this many certificates.')
+def expire_certificates(batch_size, limit):
+    """Expire approved certificates past their expiry date (what the beat job does)."""
+    from backend.app.expiry import expire_due_certificates
+
+    click.echo(f'Expired {expire_due_certificates(batch_size=batch_size, limit=limit)} certificates')
+
+
+@nanotrace_cli.command('send-outbox')
+@click.option('--batch-size', type=int, default=None)
+def send_outbox(batch_size):
+    """Send due emails from the outbox now (what the Celery task does)."""
+    from backend.app.outbox import drain_outbox
+
+    counts = drain_outbox(batch_size=batch_size)
+    click.echo(', '.join(f'{k}: {v}' for k, v in counts.items()))
+
+
+@nanotrace_cli.command('resend-verification')
+@click.option('--batch-size', default=1000, show_default=True)
+@click.option('--skip-recent-hours', default=24, show_default=True,
+              help='Skip users sent a verification email this recently.')
+@click.option('--limit', type=int, default=None, help='Stop after this many users.')
+def resend_verification(batch_size, skip_recent_hours, limit):
+    """Queue verification emails for all unverified users (sent by the worker)."""
+    from backend.app.notifications import queue_verification_reminders
+
+    queued = queue_verification_reminders(batch_size=batch_size, skip_recent_hours=skip_recent_hours, limit=limit)
+    click.echo(f'Queued {queued} verification emails')
+
+
+@db_cli.command('analyze-indexes')
+@click.option('--min-rows', default=10000, show_default=True,
+              help='Only flag sequential scans on tables at least this big.')
+def analyze_indexes(min_rows):
+    """Report index usage from pg_stat_user_indexes and flag likely problems."""
+    from backend.app import db
+
+    if db.engine.dialect.name != 'postgresql':
+        raise click.ClickException('analyze-indexes needs PostgreSQL statistics views')
+
+    with db.engine.connect() as conn:
+        indexes = conn.execute(db.text(INDEX_USAGE_SQL)).mappings().all()
+        tables = conn.execute(db.text(TABLE_SCANS_SQL)).mappings().all()
+
+    click.echo(f"{'table':<20} {'index':<40} {'scans':>10} {'tuples read':>12} {'size':>10}")
+    for row in indexes:
+        note = ''
+        if row['idx_scan'] == 0 and not row['is_unique']:
+            note = '  <- never used, candidate to drop'
+        click.echo(
+            f"{row['table_name']:<20} {row['index_name']:<40} {row['idx_scan']:>10} "
+            f"{row['idx_tup_read']:>12} {row['size_bytes'] // 1024:>8}kB{note}"
+        )
+
+    click.echo('')
+    click.echo(f"{'table':<20} {'seq scans':>10} {'seq rows read':>14} {'idx scans':>10} {'live rows':>10}")
+    for row in tables:
+        note = ''
+        if row['n_live_tup'] >= min_rows and row['seq_scan'] > row['idx_scan']:
+            note = '  <- mostly sequential scans, check for a missing index'
+        click.echo(
+            f"{row['table_name']:<20} {row['seq_scan']:>10} {row['seq_tup_read']:>14} "
+            f"{row['idx_scan']:>10} {row['n_live_tup']:>10}{note}"
+        )
+
+
+@partitions_cli.command('list')
+def partitions_list():
+    """Show the partitions of every partitioned table."""
+    from backend.app import db
+    from backend.app.partitions import PARTITIONED_TABLES, is_partitioned, list_partitions
+
+    with db.engine.connect() as conn:
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(conn, table):
+                click.echo(f'{table}: not partitioned')
+                continue
+            click.echo(f'{table}:')
+            for name, bound, rows in list_partitions(conn, table):
+                click.echo(f'  {name:<32} {max(rows, 0):>10} rows  {bound}')
+
+
+@partitions_cli.command('ensure')
+@click.option('--months-ahead', default=3, show_default=True,
+              help='Create partitions for this many future months.')
+def partitions_ensure(months_ahead):
+    """Create missing monthly partitions (run daily from cron)."""
+    from backend.app.partitions import ensure_partitions
+
+    created = ensure_partitions(months_ahead)
+    for name in created:
+        click.echo(f'created {name}')
+    if not created:
+        click.echo('partitions up to date')
+
+
+@partitions_cli.command('detach')
+@click.option('--before', required=True, type=click.DateTime(formats=['%Y-%m']),
+              help='Detach partitions for months before this one (YYYY-MM).')
+@click.option('--yes', is_flag=True, help='Do not ask for confirmation.')
+def partitions_detach(before, yes):
+    """Detach old monthly partitions and move them to the archive schema."""
+    from backend.app.partitions import ARCHIVE_SCHEMA, detach_partitions
+
+    if not yes:
+        click.confirm(
+            f'Certificates issued before {before:%Y-%m} will no longer verify. Continue?',
+            abort=True,
+        )
+    for name in detach_partitions(before.date()):
+        click.echo(f'detached {name} -> {ARCHIVE_SCHEMA}.{name}')
+
+
+@snapshots_cli.command('build')
+@click.option('--batch-size', default=1000, show_default=True)
+@click.option('--no-prune', is_flag=True, help='Keep snapshots of certificates that are no longer approved.')
+def snapshots_build(batch_size, no_prune):
+    """Write snapshots for all approved certificates and remove stale ones."""
+    from backend.app.snapshots import build_snapshots
+
+    try:
+        written, removed = build_snapshots(batch_size=batch_size, prune=not no_prune)
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(f'Wrote {written} snapshots, removed {removed} stale files')
+
+
+@snapshots_cli.command('refresh')
+@click.argument('certificate_ids', nargs=-1, required=True)
+def snapshots_refresh(certificate_ids):
+    """Re-render the snapshots of the given certificates from the database."""
+    from backend.app.snapshots import refresh_snapshots
+
+    click.echo(f'Refreshed {refresh_snapshots(certificate_ids)} snapshots')
+
+
+@assets_cli.command('build')
+def assets_build():
+    """Hash and precompress backend/app/static into static/dist (run before snapshots build)."""
+    from backend.app.assets import _brotli, build_assets
+
+    manifest, removed = build_assets()
+    click.echo(f'Built {len(manifest)} assets, removed {removed} old files')
+    if _brotli() is None:
+        click.echo('brotli is not installed: wrote gzip variants only', err=True)
+
+
+@nanotrace_cli.command('generate-signing-key')
+@click.argument('path', type=click.Path(dir_okay=False, writable=True))
+def generate_signing_key(path):
+    """Write a new Ed25519 key for certificate tokens (set CERT_SIGNING_KEY_FILE to it)."""
+    import os
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    from backend.app.certtokens import key_id, public_key_b64
+
+    if os.path.exists(path):
+        raise click.ClickException(f'{path} exists; refusing to overwrite a signing key')
+    key = Ed25519PrivateKey.generate()
+    pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as fh:
+        fh.write(pem)
+    click.echo(f'kid {key_id(key.public_key()).hex()}, public key {public_key_b64(key.public_key())}')
+
+
+@nanotrace_cli.command('revoke-certificate')
+@click.argument('certificate_id')
+@click.option('--reason', default='', help='Recorded in the revocation log.')
+def revoke_certificate(certificate_id, reason):
+    """Withdraw an approved certificate; offline verifiers learn about it on their next sync."""
+    from sqlalchemy.orm.exc import StaleDataError
+
+    from backend.app import db
+    from backend.app.models.certificate import Certificate
+
+    cert = Certificate.find_by_public_id(certificate_id)
+    if cert is None or cert.status != 'approved':
+        raise click.ClickException(f'{certificate_id} is not an approved certificate')
+    cert.status = 'revoked'
+    cert.revocation_reason = reason or None
+    try:
+        db.session.commit()
+    except StaleDataError:
+        db.session.rollback()
+        raise click.ClickException(f'{certificate_id} was changed concurrently; check it and retry')
+    click.echo(f'Revoked {cert.certificate_id}' + (f' ({reason})' if reason else ''))
+
+
+def register_cli(app):
+    app.cli.add_command(nanotrace_cli)
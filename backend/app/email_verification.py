@@ -0,0 +1,54 @@
+# backend/app/email_verification.py
+# Stateless confirmation links: a timestamped signature over (user id, email), so there is
+# no token table and a link stops working once the address changes.
+
+from flask import current_app
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+
+from backend.app import db
+from backend.config.config import Config
+
+_SALT = 'nanotrace-email-verify'
+
+
+def _serializer():
+    # standalone services don't load Config, so fall back to the shared defaults
+    secret = current_app.config.get('EMAIL_TOKEN_SECRET') or Config.EMAIL_TOKEN_SECRET
+    return URLSafeTimedSerializer(secret, salt=_SALT)
+
+
+def make_token(user):
+    return _serializer().dumps({'u': user.id, 'e': user.email})
+
+
+def read_token(token):
+    """(user id, email) from a valid token; raises SignatureExpired / BadSignature."""
+    max_age = current_app.config.get('EMAIL_VERIFY_MAX_AGE', Config.EMAIL_VERIFY_MAX_AGE)
+    data = _serializer().loads(token, max_age=max_age)
+    return data['u'], data['e']
+
+
+def confirm_email(token):
+    """'confirmed', 'already', 'expired' or 'invalid'. Costs at most one UPDATE."""
+    from backend.app.models.user import User
+
+    try:
+        user_id, email = read_token(token)
+    except SignatureExpired:
+        return 'expired'
+    except (BadSignature, KeyError, TypeError):
+        return 'invalid'
+
+    result = db.session.execute(
+        db.update(User)
+        .where(User.id == user_id, User.email == email, db.or_(User.is_verified.is_(False), User.is_verified.is_(None)))
+        .values(is_verified=True)
+    )
+    db.session.commit()
+    # 0 rows: confirmed before, or the account/address no longer matches
+    return 'confirmed' if result.rowcount else 'already'
+
+
+def verification_url(user):
+    base = current_app.config.get('PUBLIC_AUTH_URL') or Config.PUBLIC_AUTH_URL
+    return f"{base.rstrip('/')}/verify-email/{make_token(user)}"
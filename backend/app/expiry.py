@@ -0,0 +1,57 @@
+# backend/app/expiry.py
+# Moves approved certificates past expires_at to 'expired' in batches, one set-based UPDATE
+# each (found via the partial index ix_certificates_approved_expires_at). Run by Celery beat
+# every CERT_EXPIRY_INTERVAL seconds, or `nanotrace expire-certificates`.
+
+from datetime import datetime
+
+from flask import current_app
+
+from backend.app import db
+
+
+def _due_batch(now, size):
+    from backend.app.models.certificate import Certificate
+
+    return (
+        db.select(Certificate.id, Certificate.created_at)
+        .where(Certificate.status == 'approved', Certificate.expires_at <= now)
+        .order_by(Certificate.expires_at)
+        .limit(size)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def expire_due_certificates(batch_size=None, limit=None, now=None):
+    """Expire approved certificates past expires_at; returns how many were expired."""
+    from backend.app.metrics import CERTIFICATES_EXPIRED
+    from backend.app.models.certificate import Certificate
+    from backend.app.notifications import queue_expiry_notices
+    from backend.app.snapshots import mark_stale
+
+    batch_size = batch_size or current_app.config.get('CERT_EXPIRY_BATCH_SIZE', 1000)
+    expired = 0
+    while limit is None or expired < limit:
+        size = batch_size if limit is None else min(batch_size, limit - expired)
+        batch_now = now or datetime.utcnow()
+        try:
+            rows = db.session.execute(
+                Certificate.transition(
+                    'approved', 'expired',
+                    db.tuple_(Certificate.id, Certificate.created_at).in_(_due_batch(batch_now, size)),
+                )
+                .returning(Certificate.id, Certificate.certificate_id, Certificate.user_id, Certificate.product_name)
+            ).all()
+            if not rows:
+                db.session.rollback()
+                break
+            # per batch, in the same transaction; expiry is not a revocation (tokens expire too)
+            mark_stale(db.session, [row.certificate_id for row in rows])
+            queue_expiry_notices(rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        CERTIFICATES_EXPIRED.inc(len(rows))
+        expired += len(rows)
+    return expired
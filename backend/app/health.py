@@ -0,0 +1,158 @@
+# backend/app/health.py
+# /livez: the process is up, no dependencies touched. /readyz: Postgres, Redis and the
+# Fabric peer probed concurrently, each with a timeout; results cached HEALTH_CACHE_TTL.
+
+import contextvars
+import math
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from flask import jsonify
+
+from backend.app.metrics import observe_cache
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='health')
+
+
+def _probe_engine(app):
+    """Engine for the Postgres probe, with connect and statement timeouts of its own.
+
+    Without them a probe against an unreachable server holds an executor thread for the
+    OS connect timeout, long after /readyz has reported it.
+    """
+    state = app.extensions['health']
+    if state['engine'] is None:
+        db = app.extensions['sqlalchemy']
+        with app.app_context():
+            engine = db.engine
+        if engine.dialect.name == 'postgresql':
+            from sqlalchemy import create_engine
+
+            timeout = app.config['HEALTH_PROBE_TIMEOUT']
+            engine = create_engine(
+                engine.url,
+                pool_size=1,
+                max_overflow=0,
+                pool_timeout=timeout,
+                connect_args={
+                    'connect_timeout': max(1, math.ceil(timeout)),
+                    'options': f'-c statement_timeout={int(timeout * 1000)}',
+                },
+            )
+        state['engine'] = engine
+    return state['engine']
+
+
+def _probe_postgres(app):
+    with _probe_engine(app).connect() as conn:
+        conn.exec_driver_sql('SELECT 1')
+
+
+def _probe_redis(app):
+    from backend.app.redis_client import get_redis
+
+    # the shared client already has 0.25s connect and socket timeouts
+    client = get_redis(app.config.get('REDIS_URL') or '')
+    if client is None:
+        raise RuntimeError('REDIS_URL not configured')
+    client.ping()
+
+
+def _probe_fabric(app):
+    host, _, port = app.config['FABRIC_PEER_ADDRESS'].rpartition(':')
+    with socket.create_connection((host, int(port)), timeout=app.config['HEALTH_PROBE_TIMEOUT']):
+        pass
+
+
+def _traced_probe(name, probe, app):
+    from backend.app.tracing import CLIENT, span
+
+    with span(f'probe {name}', CLIENT, **{'peer.service': name}):
+        probe(app)
+
+
+def _probes_for(app):
+    probes = {}
+    if 'sqlalchemy' in app.extensions:
+        probes['postgres'] = _probe_postgres
+    if app.config.get('REDIS_URL'):
+        probes['redis'] = _probe_redis
+    if app.config.get('FABRIC_PEER_ADDRESS'):
+        probes['fabric'] = _probe_fabric
+    return probes
+
+
+def _run_probes(app):
+    running = app.extensions['health']['running']
+    started = {}
+    futures = {}
+    results = {}
+    for name, probe in _probes_for(app).items():
+        if name in running and not running[name].done():
+            # the last probe of this dependency is still hanging; don't stack another on it
+            results[name] = {'healthy': False, 'status': 'timeout', 'error': 'previous probe still running'}
+            continue
+        started[name] = time.perf_counter()
+        # run in a copy of the caller's context so the probe spans join its trace
+        futures[name] = running[name] = _executor.submit(
+            contextvars.copy_context().run, _traced_probe, name, probe, app,
+        )
+
+    wait(futures.values(), timeout=app.config['HEALTH_PROBE_TIMEOUT'])
+
+    for name, future in futures.items():
+        if not future.done():
+            # left running (see _probe_engine for why that is short); later rounds skip it
+            results[name] = {'healthy': False, 'status': 'timeout', 'error': 'probe timed out'}
+            continue
+        exc = future.exception()
+        results[name] = {
+            'healthy': exc is None,
+            'status': 'ok' if exc is None else 'error',
+            'error': str(exc) if exc else None,
+            'latency_ms': round((time.perf_counter() - started[name]) * 1000, 1),
+        }
+    return results
+
+
+def check_dependencies(app):
+    """Cached per-dependency status: {name: {healthy, status, error, latency_ms}}."""
+    state = app.extensions['health']
+    cached = state['cached']
+    if cached and cached[0] > time.monotonic():
+        observe_cache('health', True)
+        return cached[1]
+
+    # per app: a slow refresh in one service doesn't hold up another in the same process
+    with state['lock']:
+        cached = state['cached']
+        if cached and cached[0] > time.monotonic():
+            observe_cache('health', True)
+            return cached[1]
+        observe_cache('health', False)
+        results = _run_probes(app)
+        state['cached'] = (time.monotonic() + app.config['HEALTH_CACHE_TTL'], results)
+        return results
+
+
+def init_health(app, service):
+    app.config.setdefault('HEALTH_CACHE_TTL', 5.0)
+    app.config.setdefault('HEALTH_PROBE_TIMEOUT', 1.0)
+    app.config.setdefault('HEALTH_OPTIONAL_DEPENDENCIES', 'fabric')
+    app.extensions['health'] = {'lock': threading.Lock(), 'cached': None, 'running': {}, 'engine': None}
+
+    def livez():
+        return {'status': 'ok', 'service': service}, 200
+
+    def readyz():
+        optional = {d.strip() for d in app.config['HEALTH_OPTIONAL_DEPENDENCIES'].split(',')}
+        checks = check_dependencies(app)
+        ready = all(c['healthy'] for name, c in checks.items() if name not in optional)
+        body = {'status': 'ok' if ready else 'unavailable', 'service': service, 'checks': checks}
+        return jsonify(body), 200 if ready else 503
+
+    app.add_url_rule('/livez', 'livez', livez)
+    app.add_url_rule('/readyz', 'readyz', readyz)
+    return app
@@ -0,0 +1,190 @@
+# backend/app/idfilter.py
+# Bloom filter of every issued certificate_id, as a Redis bitmap shared by all workers.
+# "Definitely absent" is a 404 without a query; a missing filter or Redis outage fails open.
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from backend.app.metrics import ID_FILTER_CHECKS
+from backend.app.redis_client import get_redis, mark_redis_down, redis_down
+
+# KEYS[1] bitmap; ARGV bit offsets. Only touches an existing bitmap: a sparse one would
+# claim every older ID is absent.
+_ADD_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+for i = 1, #ARGV do redis.call('SETBIT', KEYS[1], ARGV[i], 1) end
+return 1
+"""
+
+# adds that failed, retried on the next lookup
+_pending = set()
+_pending_lock = threading.Lock()
+_add_script = None
+
+
+def filter_params(capacity, error_rate):
+    """Bit count and hash count for `capacity` items at `error_rate` false positives."""
+    bits = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+    hashes = max(1, int(round(bits / capacity * math.log(2))))
+    return bits, hashes
+
+
+def bit_positions(certificate_id, bits, hashes):
+    digest = hashlib.blake2b(certificate_id.encode(), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'big')
+    h2 = int.from_bytes(digest[8:], 'big') | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def _params():
+    cfg = current_app.config
+    bits, hashes = filter_params(cfg.get('ID_FILTER_CAPACITY', 1_000_000), cfg.get('ID_FILTER_ERROR_RATE', 0.001))
+    # geometry is part of the key so a config change can never mix incompatible bitmaps
+    return f'certs:idfilter:{bits}:{hashes}', bits, hashes
+
+
+def might_exist(certificate_id, rebuild=True):
+    """False only when the ID was certainly never issued.
+
+    rebuild=False leaves a missing filter for an app with the certificate tables to rebuild.
+    """
+    client = get_redis()
+    if client is None:
+        return True
+    if redis_down():
+        # don't pay the socket timeout on every lookup while Redis is away
+        ID_FILTER_CHECKS.labels(result='unavailable').inc()
+        return True
+    if _pending:
+        with _pending_lock:
+            retry = list(_pending)
+            _pending.clear()
+        add(retry)
+        if certificate_id in retry:
+            return True
+    key, bits, hashes = _params()
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.exists(key)
+        for pos in bit_positions(certificate_id, bits, hashes):
+            pipe.getbit(key, pos)
+        exists, *found = pipe.execute()
+    except Exception:
+        mark_redis_down()
+        ID_FILTER_CHECKS.labels(result='unavailable').inc()
+        return True
+
+    if not exists:
+        ID_FILTER_CHECKS.labels(result='unavailable').inc()
+        if rebuild:
+            _rebuild_in_background(current_app._get_current_object())
+        return True
+    present = all(found)
+    ID_FILTER_CHECKS.labels(result='maybe' if present else 'absent').inc()
+    return present
+
+
+def add(certificate_ids):
+    global _add_script
+
+    client = get_redis()
+    if client is None or not certificate_ids:
+        return
+    if redis_down():
+        with _pending_lock:
+            _pending.update(certificate_ids)
+        return
+    key, bits, hashes = _params()
+    positions = []
+    for certificate_id in certificate_ids:
+        positions.extend(bit_positions(certificate_id, bits, hashes))
+    try:
+        if _add_script is None:
+            _add_script = client.register_script(_ADD_LUA)
+        _add_script(keys=[key], args=positions, client=client)
+    except Exception:
+        mark_redis_down()
+        # a lost add would turn into a false "not found"; keep it until Redis answers again
+        with _pending_lock:
+            _pending.update(certificate_ids)
+
+
+def rebuild(batch_size=5000):
+    """Recompute the filter from the certificate tables and swap it in atomically."""
+    from backend.app import db
+    from backend.app.models.certificate import Certificate
+    from backend.app.models.certificate_archive import CertificateArchive
+
+    client = get_redis()
+    if client is None:
+        return 0
+    key, bits, hashes = _params()
+    bitmap = bytearray((bits + 7) // 8)
+    started = time.time()
+
+    count = 0
+    # archived certificates still verify, so their IDs belong in the filter too
+    for model in (Certificate, CertificateArchive):
+        ids = db.session.query(model.certificate_id).execution_options(yield_per=batch_size)
+        for (certificate_id,) in ids:
+            for pos in bit_positions(certificate_id, bits, hashes):
+                # same bit order as Redis SETBIT: offset 0 is the high bit of byte 0
+                bitmap[pos >> 3] |= 0x80 >> (pos & 7)
+            count += 1
+
+    tmp = f'{key}:building'
+    client.set(tmp, bytes(bitmap), ex=int(current_app.config.get('ID_FILTER_TTL', 3600)))
+    client.rename(tmp, key)
+
+    # rows inserted while we were scanning went to the old key (or nowhere); re-add them
+    since = datetime.utcfromtimestamp(started) - timedelta(minutes=1)
+    recent = [row[0] for row in db.session.query(Certificate.certificate_id).filter(Certificate.created_at >= since)]
+    add(recent)
+    return count
+
+
+def _rebuild_in_background(app):
+    client = get_redis()
+    key, _, _ = _params()
+    try:
+        # one rebuild across all workers; the lock expires if the builder dies
+        if not client.set(f'{key}:lock', '1', nx=True, ex=300):
+            return
+    except Exception:
+        return
+
+    def run():
+        with app.app_context():
+            from backend.app import db
+            try:
+                rebuild()
+            finally:
+                db.session.remove()
+                client.delete(f'{key}:lock')
+
+    threading.Thread(target=run, name='idfilter-rebuild', daemon=True).start()
+
+
+def init_id_filter(app):
+    from sqlalchemy import event, inspect as db_inspect
+    from backend.app.models.certificate import Certificate
+
+    if getattr(Certificate, '_id_filter_hooked', False):
+        return
+    Certificate._id_filter_hooked = True
+
+    # before the transaction commits, so an ID is in the filter before anyone can look it up
+    @event.listens_for(Certificate, 'after_insert')
+    def _add_new_certificate(mapper, connection, target):
+        if target.certificate_id:
+            add([target.certificate_id])
+
+    @event.listens_for(Certificate, 'after_update')
+    def _add_changed_certificate(mapper, connection, target):
+        if target.certificate_id and db_inspect(target).attrs.certificate_id.history.has_changes():
+            add([target.certificate_id])
@@ -0,0 +1,223 @@
+# backend/app/logconfig.py
+# JSON-lines logging for every service. Request threads only enqueue; a QueueListener
+# thread formats and writes, and a full queue drops (and counts) records instead of blocking.
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+
+from backend.app.tracing import current_trace_id
+
+ACCESS_LOGGER = 'nanotrace.access'
+VERIFY_ACCESS_LOGGER = 'nanotrace.access.verify'
+# probes and scrapes: frequent, and already visible in the metrics
+_UNLOGGED_ENDPOINTS = {'livez', 'readyz', 'metrics'}
+
+# a contextvar rather than flask.g, so the asyncio verify service can bind it too
+_request_id = contextvars.ContextVar('nanotrace_request_id', default=None)
+_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+# attributes every LogRecord has; anything else came in through extra= and becomes a field
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id'}
+
+_queue_handler = None
+_listener = None
+
+
+def current_request_id():
+    return _request_id.get()
+
+
+def bind_request_id(value=None):
+    """Make value (if well-formed) or a new ID the current request ID; returns (id, token)."""
+    if not value or not _REQUEST_ID.match(value):
+        value = uuid.uuid4().hex
+    return value, _request_id.set(value)
+
+
+def unbind_request_id(token):
+    _request_id.reset(token)
+
+
+class JsonFormatter(logging.Formatter):
+    def __init__(self, service):
+        super().__init__()
+        self.service = service
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec='milliseconds')
+            .replace('+00:00', 'Z'),
+            'level': record.levelname,
+            'logger': record.name,
+            'service': self.service,
+            'msg': record.getMessage(),
+        }
+        if getattr(record, 'request_id', None):
+            entry['request_id'] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class SampleFilter(logging.Filter):
+    """Keep `rate` of the records below WARNING; warnings and errors always pass."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.rate >= 1:
+            return True
+        if random.random() < self.rate:
+            record.sample_rate = self.rate
+            return True
+        return False
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # runs in the thread that logged: capture the request ID and render the message and
+        # traceback here, so the listener thread never touches request state or args
+        record = copy.copy(record)
+        record.request_id = _request_id.get()
+        trace_id = current_trace_id()
+        if trace_id:
+            record.trace_id = trace_id
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            from backend.app.metrics import LOG_RECORDS_DROPPED
+
+            LOG_RECORDS_DROPPED.inc()
+
+
+def _setting(config, key):
+    from backend.config.config import Config
+
+    value = config.get(key) if config is not None else None
+    return getattr(Config, key) if value is None else value
+
+
+def _start_listener(handler, size):
+    global _listener
+    _queue_handler.queue = queue.Queue(size)
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, handler)
+    _listener.start()
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # drains what is still queued
+        _listener = None
+
+
+def setup_logging(service, config=None):
+    """Route this process's logging through the JSON queue pipeline; once per process.
+
+    config is a mapping like app.config; missing keys fall back to Config.
+    """
+    global _queue_handler
+    if _queue_handler is not None:
+        return
+
+    log_dir = _setting(config, 'LOG_DIR')
+    # rotation assumes one process per file; under gunicorn leave LOG_DIR empty for journald
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, f'{service}.log'),
+            maxBytes=_setting(config, 'LOG_MAX_BYTES'),
+            backupCount=_setting(config, 'LOG_BACKUP_COUNT'),
+            encoding='utf-8',
+        )
+    else:
+        handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter(service))
+
+    size = _setting(config, 'LOG_QUEUE_SIZE')
+    _queue_handler = _QueueHandler(None)
+    _start_listener(handler, size)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_queue_handler)
+    root.setLevel(str(_setting(config, 'LOG_LEVEL')).upper())
+
+    logging.getLogger(VERIFY_ACCESS_LOGGER).addFilter(
+        SampleFilter(float(_setting(config, 'LOG_VERIFY_SAMPLE_RATE')))
+    )
+
+    atexit.register(_stop_listener)
+    # a forked worker (gunicorn --preload, celery prefork) has the queue but not the thread
+    os.register_at_fork(after_in_child=lambda: _start_listener(handler, size))
+
+
+def init_logging(app, service):
+    """JSON logging, request IDs and access logs for `app`. Call first in the app factory."""
+    setup_logging(service, app.config)
+    access = bool(_setting(app.config, 'LOG_ACCESS'))
+
+    from flask import g, request
+
+    @app.before_request
+    def _bind_request_id():
+        g.request_id, g._request_id_token = bind_request_id(request.headers.get('X-Request-ID'))
+        g._request_start = time.perf_counter()
+
+    @app.after_request
+    def _log_request(response):
+        request_id = g.get('request_id')
+        if request_id:
+            response.headers['X-Request-ID'] = request_id
+        start = g.get('_request_start')
+        if access and start is not None and request.endpoint not in _UNLOGGED_ENDPOINTS:
+            status = response.status_code
+            verify = service == 'verify' or request.blueprint == 'certificates'
+            logger = VERIFY_ACCESS_LOGGER if verify else ACCESS_LOGGER
+            logging.getLogger(logger).log(
+                logging.ERROR if status >= 500 else logging.INFO,
+                '%s %s %s', request.method, request.path, status,
+                extra={
+                    'method': request.method,
+                    'path': request.path,
+                    'endpoint': request.endpoint,
+                    'status': status,
+                    'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+                    'remote_addr': request.remote_addr,
+                },
+            )
+        return response
+
+    @app.teardown_request
+    def _unbind_request_id(exc):
+        token = g.pop('_request_id_token', None)
+        if token is not None:
+            unbind_request_id(token)
@@ -0,0 +1,266 @@
+# backend/app/metrics.py
+# Prometheus metrics shared by every service. Under gunicorn, set PROMETHEUS_MULTIPROC_DIR
+# so /metrics aggregates all workers (gunicorn.conf.py cleans up after dead ones).
+
+import os
+import shutil
+import time
+
+from flask import Response, abort, current_app, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    'nanotrace_request_duration_seconds',
+    'Request latency by endpoint',
+    ['service', 'endpoint', 'method', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    'nanotrace_requests_in_flight',
+    'Requests currently being handled',
+    ['service'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    'nanotrace_db_pool_checked_out',
+    'Database connections currently checked out of the pool',
+    ['service'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_CONNECTIONS = Gauge(
+    'nanotrace_db_pool_connections',
+    'Open database connections held by the pool',
+    ['service'],
+    multiprocess_mode='livesum',
+)
+CACHE_REQUESTS = Counter(
+    'nanotrace_cache_requests_total',
+    'Cache lookups by result (hit/miss)',
+    ['cache', 'result'],
+)
+RATELIMIT_REJECTIONS = Counter(
+    'nanotrace_ratelimit_rejections_total',
+    'Requests rejected by the rate limiter',
+    ['scope'],
+)
+ID_FILTER_CHECKS = Counter(
+    'nanotrace_id_filter_checks_total',
+    'Certificate ID Bloom filter checks (absent = answered without the database)',
+    ['result'],
+)
+COALESCED_REQUESTS = Counter(
+    'nanotrace_coalesced_requests_total',
+    'Requests answered by joining an identical in-flight lookup instead of running their own',
+    ['scope'],
+)
+CERTIFICATES_EXPIRED = Counter(
+    'nanotrace_certificates_expired_total',
+    'Approved certificates moved to expired by the expiry job',
+)
+ENDPOINT_CPU = Counter(
+    'nanotrace_endpoint_cpu_seconds_total',
+    'Thread CPU time spent handling requests, by endpoint',
+    ['service', 'endpoint'],
+)
+SLOW_QUERIES = Counter(
+    'nanotrace_slow_queries_total',
+    'SQL statements that took SLOW_QUERY_MS or longer, by endpoint ("" outside a request)',
+    ['service', 'endpoint'],
+)
+LOG_RECORDS_DROPPED = Counter(
+    'nanotrace_log_records_dropped_total',
+    'Log records dropped because the log queue was full',
+)
+QUEUE_DEPTH = Gauge(
+    'nanotrace_queue_depth',
+    'Messages waiting in a background queue',
+    ['queue'],
+    multiprocess_mode='livemax',
+)
+HOST_CPU_LOAD = Gauge(
+    'nanotrace_host_cpu_load_ratio',
+    '1-minute load average divided by CPU count',
+    multiprocess_mode='livemax',
+)
+HOST_MEMORY_USED = Gauge(
+    'nanotrace_host_memory_used_bytes',
+    'Host memory in use (MemTotal - MemAvailable)',
+    multiprocess_mode='livemax',
+)
+HOST_MEMORY_TOTAL = Gauge(
+    'nanotrace_host_memory_total_bytes',
+    'Host memory installed',
+    multiprocess_mode='livemax',
+)
+
+
+def observe_cache(cache, hit):
+    CACHE_REQUESTS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+def set_queue_depth(queue, depth):
+    QUEUE_DEPTH.labels(queue=queue).set(depth)
+
+
+def _meminfo():
+    info = {}
+    try:
+        with open('/proc/meminfo') as fh:
+            for line in fh:
+                key, _, rest = line.partition(':')
+                info[key] = int(rest.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return info
+
+
+def system_stats(path='/'):
+    """Host CPU, memory and disk usage in the shape system/overview.html expects."""
+    stats = {}
+
+    cpu_count = os.cpu_count() or 1
+    try:
+        load1 = os.getloadavg()[0]
+        stats['cpu'] = {
+            'percent': min(100.0, load1 / cpu_count * 100),
+            'count': cpu_count,
+            'load': load1,
+        }
+    except OSError:
+        pass
+
+    mem = _meminfo()
+    if 'MemTotal' in mem:
+        total = mem['MemTotal']
+        used = total - mem.get('MemAvailable', mem.get('MemFree', 0))
+        stats['memory'] = {'total': total, 'used': used, 'percent': used / total * 100}
+
+    try:
+        disk = shutil.disk_usage(path)
+        stats['disk'] = {
+            'total': disk.total,
+            'used': disk.used,
+            'percent': disk.used / disk.total * 100 if disk.total else 0.0,
+        }
+    except OSError:
+        pass
+
+    return stats
+
+
+def _refresh_host_gauges():
+    stats = system_stats()
+    if 'cpu' in stats:
+        HOST_CPU_LOAD.set(stats['cpu']['load'] / stats['cpu']['count'])
+    if 'memory' in stats:
+        HOST_MEMORY_USED.set(stats['memory']['used'])
+        HOST_MEMORY_TOTAL.set(stats['memory']['total'])
+
+
+def _refresh_queue_depths():
+    from backend.app.redis_client import get_redis
+
+    queues = [q.strip() for q in current_app.config.get('METRICS_QUEUES', '').split(',') if q.strip()]
+    client = get_redis() if queues else None
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        for queue in queues:
+            pipe.llen(queue)
+        for queue, depth in zip(queues, pipe.execute()):
+            set_queue_depth(queue, depth)
+    except Exception:
+        # a scrape must never fail because Redis is down
+        pass
+
+
+def _registry():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def _instrument_pool(app, service):
+    from sqlalchemy import event
+
+    db = app.extensions['sqlalchemy']
+    with app.app_context():
+        engine = db.engine
+
+    checked_out = DB_POOL_CHECKED_OUT.labels(service=service)
+    connections = DB_POOL_CONNECTIONS.labels(service=service)
+
+    event.listen(engine, 'connect', lambda *a: connections.inc())
+    event.listen(engine, 'close', lambda *a: connections.dec())
+    event.listen(engine, 'checkout', lambda *a: checked_out.inc())
+    event.listen(engine, 'checkin', lambda *a: checked_out.dec())
+
+
+def init_metrics(app, service):
+    """Instrument `app` and expose /metrics. Call early in the app factory."""
+    app.config.setdefault('METRICS_ALLOWED_IPS', '127.0.0.1,::1')
+    app.config.setdefault('METRICS_QUEUES', 'celery')
+
+    in_flight = REQUESTS_IN_FLIGHT.labels(service=service)
+
+    @app.before_request
+    def _metrics_start():
+        g._metrics_start = time.perf_counter()
+        g._metrics_in_flight = True
+        in_flight.inc()
+
+    @app.after_request
+    def _metrics_observe(response):
+        start = g.pop('_metrics_start', None)
+        if start is not None:
+            REQUEST_LATENCY.labels(
+                service=service,
+                endpoint=request.endpoint or 'unmatched',
+                method=request.method,
+                status=response.status_code,
+            ).observe(time.perf_counter() - start)
+        return response
+
+    @app.teardown_request
+    def _metrics_finish(exc):
+        if exc is not None and '_metrics_start' in g:
+            REQUEST_LATENCY.labels(
+                service=service,
+                endpoint=request.endpoint or 'unmatched',
+                method=request.method,
+                status=500,
+            ).observe(time.perf_counter() - g.pop('_metrics_start'))
+        # an earlier before_request hook may have aborted before ours ran
+        if g.pop('_metrics_in_flight', False):
+            in_flight.dec()
+
+    if 'sqlalchemy' in app.extensions:
+        _instrument_pool(app, service)
+
+    def metrics():
+        # the services bind to loopback; Nginx-proxied requests carry the client IP via ProxyFix
+        allowed = {ip.strip() for ip in app.config['METRICS_ALLOWED_IPS'].split(',')}
+        if request.remote_addr not in allowed:
+            abort(404)
+        # an app without ProxyFix sees Nginx's own loopback address, so a forwarded request
+        # it did not unwrap is never a local scrape
+        if 'werkzeug.proxy_fix.orig' not in request.environ and 'X-Forwarded-For' in request.headers:
+            abort(404)
+        _refresh_host_gauges()
+        _refresh_queue_depths()
+        return Response(generate_latest(_registry()), mimetype=CONTENT_TYPE_LATEST)
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
+    return app
@@ -1,6 +1,8 @@
 # backend/app/models/__init__.py
 from backend.app import db
 from .certificate import Certificate
+from .certificate_archive import CertificateArchive
+from .revocation import CertificateRevocation
 from .user import User
 
-__all__ = ["db", "Certificate", "User"]
+__all__ = ["db", "Certificate", "CertificateArchive", "CertificateRevocation", "User"]
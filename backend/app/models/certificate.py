@@ -1,21 +1,98 @@
 # backend/app/models/certificate.py
-from datetime import datetime
-import uuid
+from datetime import datetime, timedelta
 
 from backend.app import db
+from backend.app.certids import new_uid, format_public_id, issued_at, parse_public_id, uid_for_time
 # do NOT import Certificate from this module (self-import causes the circular)
 # from backend.app.models.certificate import Certificate  # ❌ remove
 # You also don't need to import User class at top-level just to declare FK/relationship
 
+CERTIFICATE_STATUSES = ("pending", "approved", "rejected", "expired", "revoked")
+
+# The certificate state machine: every status change must be listed here
+CERTIFICATE_TRANSITIONS = {
+    "pending": ("approved", "rejected"),
+    "approved": ("expired", "revoked"),
+    "expired": ("approved",),  # renewed
+    "revoked": ("approved",),  # reinstated
+    "rejected": (),
+}
+
+
+class InvalidTransition(ValueError):
+    """A status change the certificate state machine does not allow."""
+
+
+def check_transition(from_status, to_status):
+    if to_status not in CERTIFICATE_TRANSITIONS.get(from_status, ()):
+        raise InvalidTransition(f"certificate cannot go from {from_status} to {to_status}")
+
+
+def _utc_iso(value):
+    return value.isoformat() + "Z" if value else None
+
+
+def public_certificate_dict(cert):
+    """What the public verify API exposes for a certificate (never owner details).
+
+    Works on anything with certificate attributes, not only Certificate instances.
+    """
+    expires_at = getattr(cert, "expires_at", None)
+    return {
+        "certificate_id": cert.certificate_id,
+        "status": cert.status,
+        # the expiry job may not have run yet, so check the date as well
+        "valid": cert.status == "approved" and (expires_at is None or expires_at > datetime.utcnow()),
+        "product_name": cert.product_name,
+        "material_type": cert.material_type,
+        "supplier": cert.supplier,
+        "concentration": cert.concentration,
+        "particle_size": cert.particle_size,
+        "issued_at": _utc_iso(cert.created_at),
+        "approved_at": _utc_iso(cert.approved_at),
+        "expires_at": _utc_iso(expires_at),
+        "archived": getattr(cert, "archived_at", None) is not None,
+    }
+
+
 class Certificate(db.Model):
     __tablename__ = "certificates"  # explicit is better than implicit
+    __table_args__ = (
+        # my_certificates: WHERE user_id = ? ORDER BY created_at DESC
+        db.Index("ix_certificates_user_id_created_at", "user_id", "created_at"),
+        # admin lists filtered by status, newest first; also index-only status counts
+        db.Index("ix_certificates_status_created_at", "status", "created_at"),
+        # unfiltered admin list
+        db.Index("ix_certificates_created_at", "created_at"),
+        # pending review queue: tiny index that only holds pending rows
+        db.Index(
+            "ix_certificates_pending_created_at",
+            "created_at",
+            postgresql_where=db.text("status = 'pending'"),
+            sqlite_where=db.text("status = 'pending'"),
+        ),
+        # expiry job: only approved rows can expire, so index just those
+        db.Index(
+            "ix_certificates_approved_expires_at",
+            "expires_at",
+            postgresql_where=db.text("status = 'approved'"),
+            sqlite_where=db.text("status = 'approved'"),
+        ),
+    )
 
+    # On PostgreSQL this table is range-partitioned by created_at month (see
+    # backend/app/partitions.py), so the real primary key and unique constraints there also
+    # include created_at; the ORM only needs id to identify a row. A trigger reserves every
+    # uid / certificate_id in the unpartitioned certificate_public_ids table, which keeps
+    # them unique across partitions (migration 7c3f9a2e5b18).
     id = db.Column(db.Integer, primary_key=True)
+    # UUIDv7: time-ordered, so inserts append to the index instead of splitting random pages
+    uid = db.Column(db.Uuid, unique=True, nullable=False, default=new_uid)
+    # public form of uid (NT-2025-...); legacy rows keep their uuid4 string
     certificate_id = db.Column(
         db.String(64),
         unique=True,
         nullable=False,
-        default=lambda: str(uuid.uuid4()),
         index=True
     )
 
@@ -26,24 +103,144 @@ class Certificate(db.Model):
     particle_size = db.Column(db.String(100))
     msds_link = db.Column(db.Text)
 
-    status = db.Column(db.String(20), default="pending", nullable=False)  # pending|approved|rejected
+    # active_history: the old value is loaded before a change even when the attribute was
+    # expired, so flush listeners (revocation log, snapshots) always see the transition
+    status = db.column_property(
+        db.Column(
+            db.Enum(*CERTIFICATE_STATUSES, name="certificate_status"),
+            default="pending",
+            nullable=False,
+        ),
+        active_history=True,
+    )
 
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     approved_at = db.Column(db.DateTime)
     rejected_at = db.Column(db.DateTime)
+    # set on approval (CERT_VALIDITY_DAYS); backend/app/expiry.py moves due rows to expired
+    expires_at = db.Column(db.DateTime)
+    # review queue lease (backend/app/review.py): admin user id and when the claim lapses
+    claimed_by = db.Column(db.Integer)
+    claim_expires_at = db.Column(db.DateTime)
+
+    # optimistic concurrency: ORM updates run as UPDATE ... WHERE id = :id AND version = :v
+    # and bump it, so a concurrent change fails the flush (StaleDataError) instead of being
+    # overwritten; set-based updates go through Certificate.transition(), which does the same
+    version = db.Column(db.Integer, nullable=False, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
 
     # NOTE: Adjust the FK target to match your User.__tablename__
     # If your User model has __tablename__ = "users", use "users.id"
     # If it's "user", keep "user.id".
-    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
 
     # lightweight relationship via string lookup avoids import-time circulars
     user = db.relationship("User", backref=db.backref("certificates", lazy=True))
 
+    # set on the detached copies CertificateArchive.to_certificate() hands out
+    archived_at = None
+    # optional note for the revocation log when an approved certificate is withdrawn
+    revocation_reason = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.generate_certificate_id()
+
     def __repr__(self):
         return f"<Certificate {self.certificate_id}>"
 
+    def to_public_dict(self):
+        return public_certificate_dict(self)
+
+    @db.validates("status")
+    def _check_status_change(self, key, status):
+        current = self.status
+        if current is not None and status != current:
+            check_transition(current, status)
+        return status
+
+    @classmethod
+    def transition(cls, from_status, to_status, *criteria, version=None, **values):
+        """Set-based status change: a conditional UPDATE, ready for .returning().
+
+        Only rows still in from_status (and at `version`, when given) match, and their
+        version is bumped, so rows changed concurrently drop out instead of being overwritten.
+        """
+        check_transition(from_status, to_status)
+        condition = [cls.status == from_status, *criteria]
+        if version is not None:
+            condition.append(cls.version == version)
+        return (
+            db.update(cls)
+            .where(*condition)
+            .values(status=to_status, version=cls.version + 1, **values)
+            .execution_options(synchronize_session=False)
+        )
+
+    def set_expiry(self, approved_at=None):
+        """expires_at for a certificate being approved now (or at approved_at)."""
+        from flask import current_app
+
+        days = current_app.config.get("CERT_VALIDITY_DAYS", 730)
+        self.expires_at = (approved_at or self.approved_at or datetime.utcnow()) + timedelta(days=days)
+
+    @property
+    def qr_code_path(self):
+        """Public QR image (verify URL + signed token) for approved certificates."""
+        if self.status != "approved":
+            return None
+        from flask import current_app
+
+        base = current_app.config.get("PUBLIC_CERT_URL", "").rstrip("/")
+        return f"{base}/certificate/qr/{self.certificate_id}.png"
+
     def generate_certificate_id(self):
+        # created_at is the partition key on PostgreSQL and must agree with the timestamp
+        # inside uid, so find_by_public_id can go straight to the right monthly partition
+        if self.uid is None:
+            self.uid = uid_for_time(self.created_at) if self.created_at else new_uid()
+        if self.created_at is None and self.uid.version == 7:
+            self.created_at = issued_at(self.uid).replace(tzinfo=None)
         if not self.certificate_id:
-            self.certificate_id = str(uuid.uuid4())
+            self.certificate_id = format_public_id(self.uid)
+
+    @classmethod
+    def find_by_public_id(cls, public_id, include_archived=False):
+        """Look up by public ID; malformed IDs return None without touching the database.
+
+        With include_archived, a miss falls back to certificates_archive and returns a
+        detached copy of the archived certificate.
+        """
+        uid = parse_public_id(public_id)
+        if uid is None:
+            return None
+        query = cls.query.filter_by(uid=uid)
+        if uid.version == 7:
+            # bound the partition key so PostgreSQL only probes one or two partitions
+            issued = issued_at(uid).replace(tzinfo=None)
+            query = query.filter(
+                cls.created_at >= issued - timedelta(days=1),
+                cls.created_at < issued + timedelta(days=1),
+            )
+        cert = query.first()
+        if cert is None and include_archived:
+            from backend.app.models.certificate_archive import CertificateArchive
+
+            archived = CertificateArchive.query.filter_by(uid=uid).first()
+            if archived is not None:
+                cert = archived.to_certificate()
+        return cert
+
+    @classmethod
+    def status_counts(cls):
+        """Per-status totals in a single GROUP BY instead of one COUNT per status."""
+        rows = (
+            db.session.query(cls.status, db.func.count(cls.id))
+            .group_by(cls.status)
+            .all()
+        )
+        counts = dict.fromkeys(CERTIFICATE_STATUSES, 0)
+        counts.update({status: n for status, n in rows})
+        counts["total"] = sum(n for _, n in rows)
+        return counts
 
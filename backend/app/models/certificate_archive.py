@@ -0,0 +1,77 @@
+# backend/app/models/certificate_archive.py
+#
+# Cold tier for certificates nobody lists any more (see backend/app/archive.py). Only the
+# columns we look rows up by stay as real columns; everything else is packed into one
+# zlib-compressed JSON blob, which keeps the table and its indexes small.
+import json
+import zlib
+from datetime import datetime
+
+from backend.app import db
+
+# Certificate columns that live inside payload
+PAYLOAD_FIELDS = (
+    "product_name",
+    "material_type",
+    "supplier",
+    "concentration",
+    "particle_size",
+    "msds_link",
+    "approved_at",
+    "rejected_at",
+    "expires_at",
+)
+_DATETIME_FIELDS = {"approved_at", "rejected_at", "expires_at"}
+
+
+class CertificateArchive(db.Model):
+    __tablename__ = "certificates_archive"
+
+    # same id as the row had in certificates
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    uid = db.Column(db.Uuid, unique=True, nullable=False)
+    certificate_id = db.Column(db.String(64), unique=True, nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    payload = db.Column(db.LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f"<CertificateArchive {self.certificate_id}>"
+
+    @classmethod
+    def from_certificate(cls, cert):
+        data = {}
+        for field in PAYLOAD_FIELDS:
+            value = getattr(cert, field)
+            data[field] = value.isoformat() if field in _DATETIME_FIELDS and value else value
+        return cls(
+            id=cert.id,
+            uid=cert.uid,
+            certificate_id=cert.certificate_id,
+            status=cert.status,
+            user_id=cert.user_id,
+            created_at=cert.created_at,
+            payload=zlib.compress(json.dumps(data, separators=(",", ":")).encode(), 9),
+        )
+
+    def to_certificate(self):
+        """Detached, read-only Certificate with the archived values (never add it to a session)."""
+        from backend.app.models.certificate import Certificate
+
+        data = json.loads(zlib.decompress(self.payload))
+        for field in _DATETIME_FIELDS:
+            if data.get(field):
+                data[field] = datetime.fromisoformat(data[field])
+        cert = Certificate(
+            uid=self.uid,
+            certificate_id=self.certificate_id,
+            status=self.status,
+            user_id=self.user_id,
+            created_at=self.created_at,
+            **data,
+        )
+        cert.id = self.id
+        cert.archived_at = self.archived_at
+        return cert
@@ -0,0 +1,44 @@
+# backend/app/models/email_outbox.py
+from datetime import datetime
+
+from backend.app import db
+
+OUTBOX_STATUSES = ("pending", "sent", "failed")
+
+
+class OutboxEmail(db.Model):
+    """One outgoing email, written in the same transaction as the change it announces."""
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # the worker's claim query: WHERE status = 'pending' AND next_attempt_at <= now
+        db.Index(
+            "ix_email_outbox_pending_next_attempt",
+            "next_attempt_at",
+            postgresql_where=db.text("status = 'pending'"),
+            sqlite_where=db.text("status = 'pending'"),
+        ),
+        # "was this person mailed about X recently?" (bulk re-sends skip them)
+        db.Index("ix_email_outbox_recipient_kind_created_at", "recipient", "kind", "created_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipient = db.Column(db.String(255), nullable=False)
+    # throttling bucket: lower-cased part after the @
+    domain = db.Column(db.String(255), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body_text = db.Column(db.Text, nullable=False)
+    body_html = db.Column(db.Text)
+    # what the email is about, e.g. "verify_email", "certificate_decision"
+    kind = db.Column(db.String(50))
+
+    status = db.Column(db.String(20), default="pending", nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_error = db.Column(db.Text)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"<OutboxEmail {self.id} {self.recipient} {self.status}>"
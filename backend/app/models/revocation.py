@@ -0,0 +1,23 @@
+# backend/app/models/revocation.py
+from datetime import datetime
+
+from backend.app import db
+
+
+class CertificateRevocation(db.Model):
+    """Append-only log of certificates leaving (or returning to) the approved state.
+
+    The row id doubles as the revocation list version (see backend/app/revocations.py).
+    """
+
+    __tablename__ = "certificate_revocations"
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True)
+    certificate_id = db.Column(db.String(64), nullable=False, index=True)
+    # False: the certificate was approved again and is no longer revoked
+    revoked = db.Column(db.Boolean, nullable=False, default=True)
+    reason = db.Column(db.String(255))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<CertificateRevocation {self.id} {self.certificate_id} {'revoked' if self.revoked else 'restored'}>"
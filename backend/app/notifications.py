@@ -0,0 +1,154 @@
+# backend/app/notifications.py
+#
+# User-facing emails. Everything here only queues (see outbox.py), so call it before the
+# commit of the change being announced.
+
+from flask import current_app
+
+from backend.app.email_verification import verification_url
+from backend.app.outbox import enqueue_email, enqueue_emails
+
+
+def _verify_url(cert):
+    return f"{current_app.config.get('PUBLIC_CERT_URL', '').rstrip('/')}/certificate/verify/{cert.certificate_id}"
+
+
+def _decision_message(cert, reason=None):
+    """(subject, body) telling an owner about an approval or rejection; None otherwise."""
+    if cert.status == 'approved':
+        subject = f'Certificate approved: {cert.product_name}'
+        body = (
+            f'Your certificate for "{cert.product_name}" has been approved.\n\n'
+            f'Certificate ID: {cert.certificate_id}\n'
+            f'Public verification page: {_verify_url(cert)}\n'
+        )
+    elif cert.status == 'rejected':
+        subject = f'Certificate rejected: {cert.product_name}'
+        body = f'Your certificate application for "{cert.product_name}" has been rejected.\n'
+        if reason:
+            body += f'\nReason: {reason}\n'
+    else:
+        return None
+    return subject, body + '\n-- \nNanoTrace\n'
+
+
+def queue_certificate_decision(cert, reason=None):
+    """Tell the owner their certificate was approved or rejected."""
+    recipient = cert.user.email if cert.user else None
+    message = _decision_message(cert, reason)
+    if not recipient or message is None:
+        return None
+    subject, body = message
+    return enqueue_email(recipient, subject, body, kind='certificate_decision')
+
+
+def queue_certificate_decisions(decided, reason=None):
+    """queue_certificate_decision for a batch of rows (certificate_id, product_name,
+    status, user_id), with one owner lookup and one outbox INSERT."""
+    from backend.app import db
+    from backend.app.models.user import User
+
+    user_ids = {row.user_id for row in decided}
+    if not user_ids:
+        return 0
+    emails = dict(db.session.query(User.id, User.email).filter(User.id.in_(user_ids)))
+    messages = []
+    for row in decided:
+        message = _decision_message(row, reason)
+        if emails.get(row.user_id) and message is not None:
+            subject, body = message
+            messages.append({'recipient': emails[row.user_id], 'subject': subject, 'body_text': body, 'kind': 'certificate_decision'})
+    return enqueue_emails(messages)
+
+
+def queue_expiry_notices(expired):
+    """One email per owner for a batch of expired certificates.
+
+    `expired` holds rows with user_id, certificate_id and product_name (e.g. the RETURNING
+    rows of the expiry UPDATE). Owners are looked up in a single query.
+    """
+    from backend.app import db
+    from backend.app.models.user import User
+
+    by_user = {}
+    for row in expired:
+        by_user.setdefault(row.user_id, []).append(row)
+    if not by_user:
+        return 0
+    emails = dict(db.session.query(User.id, User.email).filter(User.id.in_(list(by_user))))
+
+    base = current_app.config.get('PUBLIC_CERT_URL', '').rstrip('/')
+    messages = []
+    for user_id, rows in by_user.items():
+        if not emails.get(user_id):
+            continue
+        lines = [f'- {row.product_name} ({row.certificate_id})\n  {base}/certificate/verify/{row.certificate_id}' for row in rows]
+        subject = (
+            f'Certificate expired: {rows[0].product_name}' if len(rows) == 1
+            else f'{len(rows)} certificates expired'
+        )
+        body = (
+            'The following NanoTrace certificates have reached their expiry date and no longer verify as valid:\n\n'
+            + '\n'.join(lines)
+            + '\n\nApply for renewal from your NanoTrace account.\n\n-- \nNanoTrace\n'
+        )
+        messages.append({'recipient': emails[user_id], 'subject': subject, 'body_text': body, 'kind': 'certificate_expired'})
+    return enqueue_emails(messages)
+
+
+def queue_verification_email(user):
+    """Ask a user to confirm their address. The user must have an id (flush first)."""
+    body = (
+        'Please confirm your email address for your NanoTrace account:\n\n'
+        f'{verification_url(user)}\n\n'
+        'The link is valid for 48 hours. If you did not create an account, ignore this email.\n'
+        '\n-- \nNanoTrace\n'
+    )
+    return enqueue_email(user.email, 'Confirm your NanoTrace email address', body, kind='verify_email')
+
+
+def queue_verification_reminders(batch_size=1000, skip_recent_hours=24, limit=None):
+    """Queue verification emails for every unverified user, in committed batches.
+
+    Users mailed about verification within skip_recent_hours are skipped. Only writes to
+    the outbox; the Celery worker does the sending (throttled per domain). Returns the
+    number queued.
+    """
+    from datetime import datetime, timedelta
+
+    from backend.app import db
+    from backend.app.models.email_outbox import OutboxEmail
+    from backend.app.models.user import User
+
+    since = datetime.utcnow() - timedelta(hours=skip_recent_hours)
+    recently_sent = (
+        db.select(OutboxEmail.id)
+        .where(
+            OutboxEmail.recipient == User.email,
+            OutboxEmail.kind == 'verify_email',
+            OutboxEmail.created_at >= since,
+        )
+        .exists()
+    )
+
+    queued = 0
+    last_id = 0
+    while limit is None or queued < limit:
+        size = batch_size if limit is None else min(batch_size, limit - queued)
+        # keyset pagination: each batch is an index range scan, however deep we are
+        users = (
+            User.query
+            .filter(User.id > last_id, db.or_(User.is_verified.is_(False), User.is_verified.is_(None)))
+            .filter(~recently_sent)
+            .order_by(User.id)
+            .limit(size)
+            .all()
+        )
+        if not users:
+            break
+        last_id = users[-1].id
+        for user in users:
+            queue_verification_email(user)
+        db.session.commit()
+        queued += len(users)
+    return queued
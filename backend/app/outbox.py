@@ -0,0 +1,195 @@
+# backend/app/outbox.py
+# Transactional email outbox: rows commit with the change they announce and a Celery task
+# sends them (at least once). For local debugging point MAIL_SERVER at scripts/smtp_sink.py.
+
+import random
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from flask_mail import Message
+
+from backend.app import db, mail
+from backend.app.ratelimit import acquire
+
+_SESSION_FLAG = 'outbox_pending'
+_BROKER_RETRY_AFTER = 30.0  # seconds to leave it to the sweep after a failed kick
+
+_broker_down_until = 0.0
+
+
+def enqueue_email(recipient, subject, body_text, body_html=None, kind=None):
+    """Queue an email in the current transaction; it is sent after commit."""
+    from backend.app.models.email_outbox import OutboxEmail
+
+    email = OutboxEmail(
+        recipient=recipient,
+        domain=recipient.rpartition('@')[2].lower(),
+        subject=subject,
+        body_text=body_text,
+        body_html=body_html,
+        kind=kind,
+    )
+    db.session.add(email)
+    db.session.info[_SESSION_FLAG] = True
+    return email
+
+
+def enqueue_emails(messages):
+    """Queue many emails with one INSERT (dicts with enqueue_email's arguments)."""
+    from backend.app.models.email_outbox import OutboxEmail
+
+    rows = [
+        {
+            'recipient': m['recipient'],
+            'domain': m['recipient'].rpartition('@')[2].lower(),
+            'subject': m['subject'],
+            'body_text': m['body_text'],
+            'body_html': m.get('body_html'),
+            'kind': m.get('kind'),
+        }
+        for m in messages
+    ]
+    if rows:
+        db.session.execute(db.insert(OutboxEmail), rows)
+        db.session.info[_SESSION_FLAG] = True
+    return len(rows)
+
+
+def _backoff(attempts):
+    cfg = current_app.config
+    delay = min(cfg.get('OUTBOX_RETRY_MAX', 3600), cfg.get('OUTBOX_RETRY_BASE', 30) * 2 ** (attempts - 1))
+    # jitter so a failed burst doesn't come back as a burst
+    return timedelta(seconds=random.uniform(delay / 2, delay))
+
+
+def _is_permanent(exc):
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+
+def _message(email):
+    return Message(
+        subject=email.subject,
+        recipients=[email.recipient],
+        body=email.body_text,
+        html=email.body_html,
+        sender=current_app.config.get('MAIL_DEFAULT_SENDER'),
+    )
+
+
+def _claim(batch_size, now):
+    from backend.app.models.email_outbox import OutboxEmail
+
+    return (
+        OutboxEmail.query
+        .filter(OutboxEmail.status == 'pending', OutboxEmail.next_attempt_at <= now)
+        .order_by(OutboxEmail.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+
+def drain_outbox(batch_size=None, max_batches=20):
+    """Send due emails; returns a dict of counts by outcome.
+
+    Batches are claimed with SKIP LOCKED, so several workers can drain at once. Failures
+    are retried with exponential backoff.
+    """
+    cfg = current_app.config
+    batch_size = batch_size or cfg.get('OUTBOX_BATCH_SIZE', 50)
+    domain_limit = cfg.get('OUTBOX_DOMAIN_LIMIT', '60/minute')
+    max_attempts = cfg.get('OUTBOX_MAX_ATTEMPTS', 8)
+    counts = {'sent': 0, 'retry': 0, 'failed': 0, 'throttled': 0}
+
+    connection = None
+    try:
+        for _ in range(max_batches):
+            now = datetime.utcnow()
+            batch = _claim(batch_size, now)
+            if not batch:
+                break
+            for email in batch:
+                allowed, wait = acquire(f'outbox:domain:{email.domain}', domain_limit)
+                if not allowed:
+                    # not a failure: try again once the domain's bucket has refilled
+                    email.next_attempt_at = now + timedelta(seconds=wait)
+                    counts['throttled'] += 1
+                    continue
+                try:
+                    if connection is None:
+                        connection = mail.connect()
+                        connection.__enter__()
+                    connection.send(_message(email))
+                except (smtplib.SMTPException, OSError) as exc:
+                    email.attempts += 1
+                    email.last_error = f'{type(exc).__name__}: {exc}'[:1000]
+                    if _is_permanent(exc) or email.attempts >= max_attempts:
+                        email.status = 'failed'
+                        counts['failed'] += 1
+                    else:
+                        email.next_attempt_at = now + _backoff(email.attempts)
+                        counts['retry'] += 1
+                    if not isinstance(exc, smtplib.SMTPRecipientsRefused):
+                        # the connection may be unusable now; open a fresh one next time
+                        _close(connection)
+                        connection = None
+                else:
+                    email.attempts += 1
+                    email.status = 'sent'
+                    email.sent_at = datetime.utcnow()
+                    email.last_error = None
+                    counts['sent'] += 1
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        _close(connection)
+    return counts
+
+
+def _close(connection):
+    if connection is None:
+        return
+    try:
+        connection.__exit__(None, None, None)
+    except Exception:
+        pass
+
+
+def _publish_kick():
+    global _broker_down_until
+
+    try:
+        from backend.app.tasks import drain_email_outbox
+        drain_email_outbox.apply_async(retry=False)
+    except Exception:
+        # broker down: the periodic sweep picks the rows up
+        _broker_down_until = time.monotonic() + _BROKER_RETRY_AFTER
+
+
+def _kick_worker(session):
+    if not session.info.pop(_SESSION_FLAG, False):
+        return
+    if time.monotonic() < _broker_down_until:
+        return
+    # publishing can take seconds when the broker is unreachable; never make the request wait
+    threading.Thread(target=_publish_kick, name='outbox-kick', daemon=True).start()
+
+
+def _forget(session, previous_transaction=None):
+    session.info.pop(_SESSION_FLAG, None)
+
+
+def init_outbox(app):
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    if not event.contains(Session, 'after_commit', _kick_worker):
+        event.listen(Session, 'after_commit', _kick_worker)
+        event.listen(Session, 'after_soft_rollback', _forget)
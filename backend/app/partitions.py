@@ -0,0 +1,130 @@
+# backend/app/partitions.py
+# Monthly range partitions (PostgreSQL, migration 7c3f9a2e5b18) for append-mostly tables.
+# Hot queries should bound created_at so they only touch the matching months. On SQLite
+# these are ordinary tables and every function here is a no-op.
+
+from datetime import date
+
+from backend.app import db
+
+# table -> range column
+PARTITIONED_TABLES = {
+    'certificates': 'created_at',
+}
+
+ARCHIVE_SCHEMA = 'archive'
+
+# any constant will do, it only has to be the same for every caller
+_LOCK_ID = 0x4E54_5041
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f'{table}_y{month.year:04d}m{month.month:02d}'
+
+
+def partition_month(table, name):
+    """First day of the month a partition holds, or None (e.g. for the default partition)."""
+    prefix = f'{table}_y'
+    if not name.startswith(prefix):
+        return None
+    try:
+        year, month = name[len(prefix):].split('m')
+        return date(int(year), int(month), 1)
+    except ValueError:
+        return None
+
+
+def _is_postgres(conn):
+    return conn.dialect.name == 'postgresql'
+
+
+def is_partitioned(conn, table):
+    if not _is_postgres(conn):
+        return False
+    return bool(conn.execute(
+        db.text("SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = :table AND c.relnamespace = current_schema()::regnamespace"),
+        {'table': table},
+    ).scalar())
+
+
+def list_partitions(conn, table):
+    """[(name, bound expression, row estimate)] for the partitions attached to `table`."""
+    rows = conn.execute(
+        db.text("SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"),
+        {'table': table},
+    )
+    return [tuple(row) for row in rows]
+
+
+def create_partition_sql(table, month):
+    name = partition_name(table, month)
+    return (
+        f'CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} '
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def ensure_partitions(months_ahead=3, today=None):
+    """Create this month's and the next `months_ahead` monthly partitions; returns new names."""
+    today = today or date.today()
+    created = []
+    with db.engine.begin() as conn:
+        if not _is_postgres(conn):
+            return created
+        # several workers/cron hosts may run this at once
+        conn.execute(db.text('SELECT pg_advisory_xact_lock(:id)'), {'id': _LOCK_ID})
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(conn, table):
+                continue
+            existing = {name for name, _, _ in list_partitions(conn, table)}
+            for offset in range(months_ahead + 1):
+                month = add_months(month_start(today), offset)
+                if partition_name(table, month) in existing:
+                    continue
+                # fails if the default partition already holds rows for this month; those
+                # have to be moved by hand (detach default, create, re-insert, re-attach)
+                conn.execute(db.text(create_partition_sql(table, month)))
+                created.append(partition_name(table, month))
+    return created
+
+
+def detach_partitions(before, archive_schema=ARCHIVE_SCHEMA):
+    """Detach every monthly partition that ends on or before `before` and move it to
+    `archive_schema`. The data stays queryable as archive.<name>; returns the names."""
+    before = month_start(before)
+    detached = []
+    if db.engine.dialect.name != 'postgresql':
+        return detached
+
+    with db.engine.connect() as conn:
+        targets = []
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(conn, table):
+                continue
+            for name, _, _ in list_partitions(conn, table):
+                month = partition_month(table, name)
+                if month is not None and add_months(month, 1) <= before:
+                    targets.append((table, name))
+        conn.rollback()
+
+        # DETACH ... CONCURRENTLY only takes a SHARE UPDATE EXCLUSIVE lock on the parent,
+        # so inserts and lookups keep running; it refuses to run inside a transaction
+        autocommit = conn.execution_options(isolation_level='AUTOCOMMIT')
+        autocommit.execute(db.text(f'CREATE SCHEMA IF NOT EXISTS {archive_schema}'))
+        for table, name in targets:
+            autocommit.execute(db.text(f'ALTER TABLE {table} DETACH PARTITION {name} CONCURRENTLY'))
+            autocommit.execute(db.text(f'ALTER TABLE {name} SET SCHEMA {archive_schema}'))
+            detached.append(name)
+    return detached
@@ -0,0 +1,159 @@
+# backend/app/profiler.py
+# Per-endpoint CPU time (always on), plus an opt-in sampling profiler (PROFILER_ENABLED)
+# that writes collapsed stacks, as read by flamegraph.pl and speedscope, to PROFILER_DIR.
+
+import os
+import re
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+_IDLE_MODULES = ('threading.py', 'selectors.py', 'queue.py', 'socket.py', 'socketserver.py')
+_PROFILE_ID = re.compile(r'^[0-9a-f]{16}$')
+
+# thread ident -> endpoint being served, read by the sampler
+_active_endpoints = {}
+# endpoint -> [cpu seconds, requests] for this process
+_cpu_by_endpoint = {}
+_cpu_lock = threading.Lock()
+
+_running = threading.Lock()
+_labels = {}
+
+
+class ProfilerBusy(RuntimeError):
+    """A profile is already running in this process."""
+
+
+def _label(code):
+    label = _labels.get(code)
+    if label is None:
+        parts = code.co_filename.replace('\\', '/').split('/')
+        path = '/'.join(parts[-2:])
+        name = getattr(code, 'co_qualname', code.co_name)
+        label = _labels[code] = f'{name} ({path}:{code.co_firstlineno})'
+    return label
+
+
+def _is_idle(frame):
+    return frame.f_code.co_filename.endswith(_IDLE_MODULES)
+
+
+def sample_stacks(seconds, interval, include_idle=False):
+    """Sample every other thread's stack for `seconds`; returns a Counter of collapsed stacks."""
+    me = threading.get_ident()
+    counts = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = None
+        for ident, frame in sys._current_frames().items():
+            if ident == me or (not include_idle and _is_idle(frame)):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_label(frame.f_code))
+                frame = frame.f_back
+            # root the stack at the endpoint being served, or (thread name) outside a request
+            root = _active_endpoints.get(ident)
+            if root is None:
+                if names is None:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                root = f'({names.get(ident, ident)})'
+            stack.append(root)
+            counts[';'.join(reversed(stack))] += 1
+        time.sleep(interval)
+    return counts
+
+
+def collapse(counts):
+    # `frame;frame;... count` per line
+    return ''.join(f'{stack} {n}\n' for stack, n in counts.most_common())
+
+
+def profile_dir(config):
+    path = config.get('PROFILER_DIR') or os.path.join(tempfile.gettempdir(), 'nanotrace-profiles')
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+def _profile_path(directory, profile_id, done):
+    return os.path.join(directory, f'{profile_id}.collapsed' if done else f'{profile_id}.running')
+
+
+def start_profile(config, seconds, interval, include_idle=False):
+    """Start sampling this process in the background; returns the profile id."""
+    directory = profile_dir(config)
+    profile_id = secrets.token_hex(8)
+    if not _running.acquire(blocking=False):
+        raise ProfilerBusy('a profile is already running in this worker')
+
+    def run():
+        try:
+            counts = sample_stacks(seconds, interval, include_idle)
+            tmp = _profile_path(directory, profile_id, False)
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                fh.write(collapse(counts))
+            os.replace(tmp, _profile_path(directory, profile_id, True))
+        finally:
+            _running.release()
+
+    try:
+        open(_profile_path(directory, profile_id, False), 'w').close()
+        threading.Thread(target=run, name=f'profiler-{profile_id}', daemon=True).start()
+    except BaseException:
+        # the thread never ran, so nothing else will release the lock
+        _running.release()
+        raise
+    return profile_id
+
+
+def load_profile(config, profile_id):
+    """'running', the collapsed stacks as text, or None for an unknown id."""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    directory = profile_dir(config)
+    try:
+        with open(_profile_path(directory, profile_id, True), encoding='utf-8') as fh:
+            return fh.read()
+    except FileNotFoundError:
+        return 'running' if os.path.exists(_profile_path(directory, profile_id, False)) else None
+
+
+def cpu_by_endpoint():
+    """{endpoint: {'cpu_seconds', 'requests', 'avg_cpu_ms'}} for this process, busiest first."""
+    with _cpu_lock:
+        rows = [(endpoint, seconds, n) for endpoint, (seconds, n) in _cpu_by_endpoint.items()]
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return {
+        endpoint: {'cpu_seconds': round(seconds, 4), 'requests': n, 'avg_cpu_ms': round(seconds / n * 1000, 3)}
+        for endpoint, seconds, n in rows
+    }
+
+
+def init_profiler(app, service):
+    """Per-endpoint CPU accounting for `app` (the sampler itself is in admin/views/profiling.py)."""
+    from flask import g, request
+
+    from backend.app.metrics import ENDPOINT_CPU
+
+    @app.before_request
+    def _cpu_start():
+        g._cpu_start = time.thread_time()
+        _active_endpoints[threading.get_ident()] = request.endpoint or 'unmatched'
+
+    @app.teardown_request
+    def _cpu_finish(exc):
+        _active_endpoints.pop(threading.get_ident(), None)
+        start = g.pop('_cpu_start', None)
+        if start is None:
+            return
+        used = time.thread_time() - start
+        endpoint = request.endpoint or 'unmatched'
+        ENDPOINT_CPU.labels(service=service, endpoint=endpoint).inc(used)
+        with _cpu_lock:
+            totals = _cpu_by_endpoint.setdefault(endpoint, [0.0, 0])
+            totals[0] += used
+            totals[1] += 1
@@ -0,0 +1,174 @@
+# backend/app/ratelimit.py
+# Token buckets for public endpoints, in Redis so all workers share them; a per-process
+# bucket stands in while Redis is unavailable.
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+from werkzeug.exceptions import TooManyRequests
+
+from backend.app.metrics import RATELIMIT_REJECTIONS
+from backend.app.redis_client import get_redis, mark_redis_down, redis_down
+
+DEFAULT_LIMITS = {
+    'RATELIMIT_VERIFY': '120/minute',
+    'RATELIMIT_VERIFY_MISSES': '20/minute',
+    'RATELIMIT_LOGIN': '10/minute',
+}
+
+_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# KEYS[1] bucket; ARGV: rate (tokens/s), burst, cost. cost == 0 only peeks.
+_TOKEN_BUCKET_LUA = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if cost == 0 then
+  if tokens >= 1 then allowed = 1 end
+elseif tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+_REDIS_RETRY_AFTER = 5.0  # seconds to stay on the local fallback after a Redis error
+
+
+def parse_limit(limit):
+    """'30/minute' -> (rate per second, burst)."""
+    count, _, period = limit.partition('/')
+    count = int(count)
+    return count / _PERIODS[period.strip().rstrip('s')], count
+
+
+class _MemoryBuckets:
+    def __init__(self, max_keys=100_000):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_keys = max_keys
+
+    def take(self, key, rate, burst, cost):
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - ts) * rate)
+            if cost == 0:
+                allowed = tokens >= 1
+            else:
+                allowed = tokens >= cost
+                if allowed:
+                    tokens -= cost
+            self._buckets[key] = (tokens, now)
+            # LRU cap so an IP-spraying flood can't grow the dict without bound
+            while len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, tokens
+
+
+_memory = _MemoryBuckets()
+_script = None
+
+
+def _take(key, rate, burst, cost):
+    global _script
+
+    client = get_redis() if not redis_down() else None
+    if client is not None:
+        try:
+            if _script is None:
+                _script = client.register_script(_TOKEN_BUCKET_LUA)
+            allowed, tokens = _script(keys=[key], args=[rate, burst, cost], client=client)
+            return bool(allowed), float(tokens)
+        except Exception:
+            mark_redis_down(_REDIS_RETRY_AFTER)
+    return _memory.take(key, rate, burst, cost)
+
+
+def acquire(key, limit, cost=1):
+    """Take from a named bucket outside of a request (e.g. in a worker).
+
+    Returns (allowed, seconds until enough tokens are available).
+    """
+    rate, burst = parse_limit(limit)
+    allowed, tokens = _take(key, rate, burst, cost)
+    return allowed, 0.0 if allowed else max(0.0, (cost - tokens) / rate)
+
+
+def _client_identity():
+    try:
+        from flask_login import current_user
+        if getattr(current_user, 'is_authenticated', False):
+            return f'u{current_user.get_id()}'
+    except Exception:
+        pass
+    # ProxyFix has already resolved X-Forwarded-For
+    return request.remote_addr or 'unknown'
+
+
+def _limit_for(config_key):
+    return parse_limit(current_app.config.get(config_key) or DEFAULT_LIMITS[config_key])
+
+
+def _reject(scope, rate, tokens, cost=1):
+    RATELIMIT_REJECTIONS.labels(scope=scope).inc()
+    raise TooManyRequests(retry_after=max(1, int((cost - tokens) / rate + 0.999)))
+
+
+def _enabled():
+    return current_app.config.get('RATELIMIT_ENABLED', True)
+
+
+def rate_limit(config_key, scope=None):
+    """Reject with 429 once the client's bucket for this route is empty."""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if _enabled():
+                name = scope or request.endpoint
+                rate, burst = _limit_for(config_key)
+                allowed, tokens = _take(f'rl:{name}:{_client_identity()}', rate, burst, 1)
+                if not allowed:
+                    _reject(name, rate, tokens)
+            return f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def limit_not_found(config_key, scope=None):
+    """Budget 404s per client; once spent, reject before the view (and its DB work) runs.
+
+    Guessing certificate IDs produces a stream of 404s, so only misses are charged and
+    legitimate lookups of real certificates never consume the budget.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if not _enabled():
+                return f(*args, **kwargs)
+            name = f'{scope or request.endpoint}:miss'
+            key = f'rl:{name}:{_client_identity()}'
+            rate, burst = _limit_for(config_key)
+            allowed, tokens = _take(key, rate, burst, 0)
+            if not allowed:
+                _reject(name, rate, tokens)
+
+            rv = f(*args, **kwargs)
+            status = rv[1] if isinstance(rv, tuple) and len(rv) > 1 else getattr(rv, 'status_code', 200)
+            if status == 404:
+                _take(key, rate, burst, 1)
+            return rv
+        return wrapper
+    return decorator
@@ -0,0 +1,52 @@
+# backend/app/redis_client.py
+
+import os
+import threading
+import time
+
+import redis
+
+from backend.app.tracing import TracedRedis
+
+_clients = {}
+_lock = threading.Lock()
+# after a Redis error every caller skips Redis for a while instead of paying the timeout
+_down_until = 0.0
+
+
+def get_redis(url=None):
+    """Shared per-process Redis client, or None when Redis is not configured."""
+    if url is None:
+        try:
+            from flask import current_app
+            url = current_app.config.get('REDIS_URL')
+        except RuntimeError:
+            url = os.environ.get('REDIS_URL')
+    if not url:
+        return None
+
+    client = _clients.get(url)
+    if client is None:
+        with _lock:
+            client = _clients.get(url)
+            if client is None:
+                # short timeouts: callers treat Redis as best-effort and fall back locally;
+                # TracedRedis adds a span per command to sampled traces
+                client = (TracedRedis or redis.Redis).from_url(
+                    url,
+                    socket_timeout=0.25,
+                    socket_connect_timeout=0.25,
+                    health_check_interval=30,
+                )
+                _clients[url] = client
+    return client
+
+
+def redis_down():
+    """True while a recent Redis error says not to try again yet."""
+    return time.monotonic() < _down_until
+
+
+def mark_redis_down(seconds=5.0):
+    global _down_until
+    _down_until = time.monotonic() + seconds
@@ -0,0 +1,209 @@
+# backend/app/review.py
+# The claimable review queue (leases that lapse after REVIEW_LEASE_SECONDS) and bulk
+# approve / reject, each a single set-based statement guarded by the row's status.
+
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from backend.app import db
+
+DECISIONS = {'approve': 'approved', 'reject': 'rejected'}
+
+
+class BulkDecisionError(ValueError):
+    """The request itself is unusable (unknown action, no IDs, too many IDs)."""
+
+
+def _lease_until(now):
+    return now + timedelta(seconds=current_app.config.get('REVIEW_LEASE_SECONDS', 600))
+
+
+def _claimable_by(reviewer_id, now):
+    """Rows nobody else holds a live claim on."""
+    from backend.app.models.certificate import Certificate
+
+    return db.or_(
+        Certificate.claimed_by.is_(None),
+        Certificate.claimed_by == reviewer_id,
+        Certificate.claim_expires_at <= now,
+    )
+
+
+def _claimed_ids(reviewer_id, cert_ids):
+    from backend.app.models.certificate import Certificate
+
+    condition = [Certificate.claimed_by == reviewer_id, Certificate.status == 'pending']
+    if cert_ids is not None:
+        try:
+            condition.append(Certificate.id.in_([int(cert_id) for cert_id in cert_ids]))
+        except (TypeError, ValueError):
+            raise BulkDecisionError('ids must be integers')
+    return condition
+
+
+def claim_batch(reviewer_id, size=None, now=None):
+    """Claim the next pending certificates for reviewer_id; returns the claimed rows, oldest first.
+
+    SKIP LOCKED gives reviewers claiming at the same moment disjoint batches. The
+    reviewer's own live claims come back first, renewed.
+    """
+    from backend.app.models.certificate import Certificate
+
+    size = min(
+        int(size or current_app.config.get('REVIEW_BATCH_SIZE', 20)),
+        current_app.config.get('BULK_DECISION_MAX', 500),
+    )
+    if size < 1:
+        raise BulkDecisionError('batch size must be positive')
+    now = now or datetime.utcnow()
+    batch = (
+        db.select(Certificate.id, Certificate.created_at)
+        .where(Certificate.status == 'pending', _claimable_by(reviewer_id, now))
+        .order_by(Certificate.created_at)
+        .limit(size)
+        .with_for_update(skip_locked=True)
+    )
+    try:
+        rows = db.session.execute(
+            db.update(Certificate)
+            .where(db.tuple_(Certificate.id, Certificate.created_at).in_(batch))
+            .values(claimed_by=reviewer_id, claim_expires_at=_lease_until(now))
+            .returning(
+                Certificate.id, Certificate.certificate_id, Certificate.product_name,
+                Certificate.material_type, Certificate.supplier, Certificate.user_id,
+                Certificate.created_at, Certificate.claim_expires_at,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return sorted(rows, key=lambda row: (row.created_at, row.id))
+
+
+def renew_claims(reviewer_id, cert_ids=None, now=None):
+    """Extend reviewer_id's claims (all, or just cert_ids); returns how many were renewed."""
+    from backend.app.models.certificate import Certificate
+
+    now = now or datetime.utcnow()
+    try:
+        result = db.session.execute(
+            db.update(Certificate)
+            .where(*_claimed_ids(reviewer_id, cert_ids))
+            .values(claim_expires_at=_lease_until(now))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return result.rowcount
+
+
+def release_claims(reviewer_id, cert_ids=None):
+    """Hand reviewer_id's claims (all, or just cert_ids) back to the queue."""
+    from backend.app.models.certificate import Certificate
+
+    try:
+        result = db.session.execute(
+            db.update(Certificate)
+            .where(*_claimed_ids(reviewer_id, cert_ids))
+            .values(claimed_by=None, claim_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return result.rowcount
+
+
+def _failure(row, version):
+    if row is None:
+        return 'not_found'
+    if row.status != 'pending':
+        return 'not_pending'
+    if version is not None and row.version != version:
+        return 'stale'
+    # still pending but not updated: held by another reviewer's claim
+    return 'claimed'
+
+
+def bulk_decide(action, cert_ids, reason=None, now=None, reviewer_id=None, version=None):
+    """Approve or reject pending certificates in one transaction.
+
+    A certificate someone else decided in the meantime is simply not updated, and the
+    misses are looked up once to report why. Emails, snapshots and the audit entry are
+    handled once per batch in the same transaction.
+
+    With reviewer_id, certificates under another reviewer's live claim are left alone.
+    version (single certificate only) is the row version the decision was made on.
+    Returns {'succeeded': [{'id', 'certificate_id'}...], 'failed': [{'id', 'error'}...]}.
+    """
+    from backend.app.models.certificate import Certificate
+    from backend.app.notifications import queue_certificate_decisions
+    from backend.app.snapshots import mark_stale
+
+    status = DECISIONS.get(action)
+    if status is None:
+        raise BulkDecisionError(f'unknown action {action!r}')
+    try:
+        ids = sorted({int(cert_id) for cert_id in cert_ids})
+    except (TypeError, ValueError):
+        raise BulkDecisionError('ids must be integers')
+    if not ids:
+        raise BulkDecisionError('no certificate ids given')
+    max_ids = current_app.config.get('BULK_DECISION_MAX', 500)
+    if len(ids) > max_ids:
+        raise BulkDecisionError(f'at most {max_ids} certificates per request')
+    if version is not None and len(ids) != 1:
+        raise BulkDecisionError('version only applies to a single certificate')
+
+    now = now or datetime.utcnow()
+    values = {'claimed_by': None, 'claim_expires_at': None}
+    if status == 'approved':
+        values['approved_at'] = now
+        values['expires_at'] = now + timedelta(days=current_app.config.get('CERT_VALIDITY_DAYS', 730))
+    else:
+        values['rejected_at'] = now
+
+    condition = [Certificate.id.in_(ids)]
+    if reviewer_id is not None:
+        condition.append(_claimable_by(reviewer_id, now))
+
+    try:
+        decided = db.session.execute(
+            Certificate.transition('pending', status, *condition, version=version, **values)
+            .returning(
+                Certificate.id, Certificate.certificate_id, Certificate.product_name,
+                Certificate.status, Certificate.user_id,
+            )
+        ).all()
+
+        failed = []
+        missing = set(ids) - {row.id for row in decided}
+        if missing:
+            found = {
+                row.id: row
+                for row in db.session.query(Certificate.id, Certificate.status, Certificate.version)
+                .filter(Certificate.id.in_(missing))
+            }
+            failed = [
+                {'id': cert_id, 'error': _failure(found.get(cert_id), version)}
+                for cert_id in sorted(missing)
+            ]
+
+        if decided:
+            queue_certificate_decisions(decided, reason=reason)
+            mark_stale(db.session, [row.certificate_id for row in decided])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return {
+        'succeeded': [{'id': row.id, 'certificate_id': row.certificate_id} for row in decided],
+        'failed': failed,
+    }
@@ -0,0 +1,270 @@
+# backend/app/revocations.py
+# Versioned revocation list that offline verifiers sync incrementally (signed tokens and
+# cached pages outlive a revocation). RevocationList is the client side and, like the token
+# verifier, needs neither Flask nor the database.
+
+import hashlib
+
+from backend.app.certtokens import key_id
+
+MAGIC = b'NTRL'
+SNAPSHOT, DIFF = b'S', b'D'
+_FLAG_SIGNED = 0x01
+_SIGNATURE_LEN = 8 + 64
+_DIFF_CAP = 10000  # default REVOCATION_DIFF_MAX
+
+_snapshot_cache = {}  # version -> encoded snapshot, newest only
+
+
+class RevocationListError(ValueError):
+    """Malformed, unsigned/forged, or out-of-sequence revocation data."""
+
+
+# the ID printed in the token is all a client needs to check it
+def revocation_key(certificate_id):
+    return int.from_bytes(hashlib.sha256(certificate_id.encode('utf-8')).digest()[:8], 'big')
+
+
+# --- encoding ------------------------------------------------------------------------
+
+def _uvarint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _read_uvarint(data, pos):
+    value = shift = 0
+    while True:
+        if pos >= len(data) or shift > 63:
+            raise RevocationListError('truncated revocation list')
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def _encode_keys(keys):
+    out = [_uvarint(len(keys))]
+    previous = 0
+    for key in sorted(keys):
+        out.append(_uvarint(key - previous))
+        previous = key
+    return b''.join(out)
+
+
+def _decode_keys(data, pos):
+    count, pos = _read_uvarint(data, pos)
+    keys = []
+    previous = 0
+    for _ in range(count):
+        delta, pos = _read_uvarint(data, pos)
+        previous += delta
+        keys.append(previous)
+    return keys, pos
+
+
+# b'NTRL'  kind (b'S' snapshot | b'D' diff)  flags (bit 0: signed)
+# uvarint version, uvarint from_version
+# uvarint n_added,   n_added   uvarint deltas of the sorted keys
+# uvarint n_removed, n_removed uvarint deltas of the sorted keys
+# [8-byte kid + 64-byte Ed25519 signature over everything before]
+def encode(kind, version, from_version, added, removed=(), signing_key=None):
+    body = b''.join((
+        MAGIC,
+        kind,
+        bytes([_FLAG_SIGNED if signing_key is not None else 0]),
+        _uvarint(version),
+        _uvarint(from_version),
+        _encode_keys(added),
+        _encode_keys(removed),
+    ))
+    if signing_key is None:
+        return body
+    return body + key_id(signing_key.public_key()) + signing_key.sign(body)
+
+
+def decode(data, public_keys=None):
+    """(kind, version, from_version, added, removed).
+
+    With public_keys ({kid: Ed25519PublicKey}) the data must carry a valid signature.
+    """
+    from cryptography.exceptions import InvalidSignature
+
+    data = bytes(data)
+    if len(data) < 6 or data[:4] != MAGIC or data[4:5] not in (SNAPSHOT, DIFF):
+        raise RevocationListError('not a revocation list')
+    kind, signed = data[4:5], bool(data[5] & _FLAG_SIGNED)
+    body = data[:-_SIGNATURE_LEN] if signed else data
+    if public_keys is not None:
+        if not signed or len(data) < 6 + _SIGNATURE_LEN:
+            raise RevocationListError('revocation list is not signed')
+        kid, signature = data[-_SIGNATURE_LEN:-64], data[-64:]
+        key = public_keys.get(kid)
+        if key is None:
+            raise RevocationListError('unknown signing key')
+        try:
+            key.verify(signature, body)
+        except InvalidSignature as exc:
+            raise RevocationListError('bad signature') from exc
+
+    version, pos = _read_uvarint(body, 6)
+    from_version, pos = _read_uvarint(body, pos)
+    added, pos = _decode_keys(body, pos)
+    removed, pos = _decode_keys(body, pos)
+    if pos != len(body):
+        raise RevocationListError('trailing bytes in revocation list')
+    return kind, version, from_version, added, removed
+
+
+class RevocationList:
+    """Client-side copy of the revoked set, kept current with snapshots and diffs."""
+
+    def __init__(self, public_keys=None):
+        self.public_keys = public_keys
+        self.version = 0
+        self._keys = set()
+
+    def apply(self, data):
+        kind, version, from_version, added, removed = decode(data, self.public_keys)
+        if kind == SNAPSHOT:
+            self._keys = set(added)
+        else:
+            if from_version != self.version:
+                raise RevocationListError(f'diff starts at {from_version}, list is at {self.version}')
+            self._keys.difference_update(removed)
+            self._keys.update(added)
+        self.version = version
+        return self
+
+    def __contains__(self, certificate_id):
+        return revocation_key(certificate_id) in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+
+# --- server side ---------------------------------------------------------------------
+
+def current_version():
+    from backend.app import db
+    from backend.app.models.revocation import CertificateRevocation
+
+    return db.session.query(db.func.max(CertificateRevocation.id)).scalar() or 0
+
+
+def _changes(since, until):
+    """{certificate_id: revoked} after version `since`, up to `until`; last change wins."""
+    from backend.app.models.revocation import CertificateRevocation
+
+    rows = (
+        CertificateRevocation.query
+        .with_entities(CertificateRevocation.certificate_id, CertificateRevocation.revoked)
+        .filter(CertificateRevocation.id > since, CertificateRevocation.id <= until)
+        .order_by(CertificateRevocation.id)
+        .yield_per(5000)
+    )
+    return {certificate_id: revoked for certificate_id, revoked in rows}
+
+
+def _signing_key():
+    from backend.app.certtokens import signing_key
+
+    return signing_key()
+
+
+def build_revocation_list(since=None):
+    """(encoded list, version, kind) for a client at version `since` (None: full snapshot)."""
+    from flask import current_app
+
+    version = current_version()
+    diff_cap = current_app.config.get('REVOCATION_DIFF_MAX', _DIFF_CAP)
+    key = _signing_key()
+    if since is not None and 0 <= since <= version and version - since <= diff_cap:
+        changes = _changes(since, version)
+        added = [revocation_key(cid) for cid, revoked in changes.items() if revoked]
+        removed = [revocation_key(cid) for cid, revoked in changes.items() if not revoked]
+        return encode(DIFF, version, since, added, removed, signing_key=key), version, DIFF
+
+    cached = _snapshot_cache.get(version)
+    if cached is None:
+        revoked = [revocation_key(cid) for cid, is_revoked in _changes(0, version).items() if is_revoked]
+        cached = encode(SNAPSHOT, version, 0, revoked, signing_key=key)
+        _snapshot_cache.clear()
+        _snapshot_cache[version] = cached
+    return cached, version, SNAPSHOT
+
+
+def _lock_log(session):
+    # ids then commit in order, so a client at version N never misses a row <= N committed
+    # later; plain SELECTs are not blocked and revocations are rare
+    if session.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy import text
+
+        session.connection().execute(text('LOCK TABLE certificate_revocations IN EXCLUSIVE MODE'))
+
+
+def record_revocation(session, certificate_id, revoked=True, reason=None):
+    """Log a change made outside the ORM (bulk UPDATE); call before commit."""
+    from backend.app.models.revocation import CertificateRevocation
+
+    _lock_log(session)
+    session.add(CertificateRevocation(certificate_id=certificate_id, revoked=revoked, reason=reason))
+
+
+def _was_revoked(session, certificate_id):
+    from backend.app.models.revocation import CertificateRevocation
+
+    with session.no_autoflush:
+        last = (
+            session.query(CertificateRevocation.revoked)
+            .filter(CertificateRevocation.certificate_id == certificate_id)
+            .order_by(CertificateRevocation.id.desc())
+            .first()
+        )
+    return bool(last and last[0])
+
+
+def _log_status_changes(session, flush_context, instances):
+    from sqlalchemy import inspect
+
+    from backend.app.models.certificate import Certificate
+    from backend.app.models.revocation import CertificateRevocation
+
+    entries = []
+    for obj in session.deleted:
+        if isinstance(obj, Certificate) and obj.status == 'approved':
+            entries.append(CertificateRevocation(certificate_id=obj.certificate_id, revoked=True, reason='deleted'))
+    for obj in session.dirty:
+        if not isinstance(obj, Certificate):
+            continue
+        history = inspect(obj).attrs.status.history
+        if not history.deleted or history.deleted[0] == obj.status:
+            continue
+        if history.deleted[0] == 'approved':
+            if obj.status == 'expired':
+                # signed tokens carry the expiry themselves
+                continue
+            reason = obj.revocation_reason or obj.status
+            entries.append(CertificateRevocation(certificate_id=obj.certificate_id, revoked=True, reason=reason[:255]))
+        elif obj.status == 'approved' and _was_revoked(session, obj.certificate_id):
+            entries.append(CertificateRevocation(certificate_id=obj.certificate_id, revoked=False, reason='approved'))
+    if entries:
+        _lock_log(session)
+        session.add_all(entries)
+
+
+def init_revocations(app):
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    if not event.contains(Session, 'before_flush', _log_status_changes):
+        event.listen(Session, 'before_flush', _log_status_changes)
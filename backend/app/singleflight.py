@@ -0,0 +1,136 @@
+# backend/app/singleflight.py
+# Concurrent calls for the same key share one execution. With SINGLEFLIGHT_SHARED the
+# leader is elected across processes through Redis; any Redis trouble means everyone
+# computes for themselves.
+
+import asyncio
+import json
+import threading
+import time
+
+from flask import current_app
+
+from backend.app.metrics import COALESCED_REQUESTS, observe_cache
+from backend.app.redis_client import get_redis
+
+_POLL_INTERVAL = 0.02
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Thread-level single-flight, optionally shared across processes through Redis."""
+
+    def __init__(self, scope):
+        self.scope = scope
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        cfg = current_app.config
+        wait = cfg.get('SINGLEFLIGHT_WAIT', 2.0)
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(wait):
+                # the leader is stuck; don't let it take everyone down with it
+                return fn()
+            COALESCED_REQUESTS.labels(scope=self.scope).inc()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            if cfg.get('SINGLEFLIGHT_SHARED', False):
+                call.result = self._do_shared(key, fn, wait, cfg.get('SINGLEFLIGHT_RESULT_TTL_MS', 500))
+            else:
+                call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _do_shared(self, key, fn, wait, result_ttl_ms):
+        # the result is published as JSON and may be up to result_ttl_ms old when read
+        client = get_redis()
+        if client is None:
+            return fn()
+        base = f'sf:{self.scope}:{key}'
+        try:
+            cached = client.get(f'{base}:result')
+            if cached is None:
+                leader = client.set(f'{base}:lock', '1', nx=True, px=int(wait * 1000))
+        except Exception:
+            return fn()
+
+        observe_cache(f'{self.scope}_shared', cached is not None)
+        if cached is not None:
+            COALESCED_REQUESTS.labels(scope=f'{self.scope}_shared').inc()
+            return _load(cached)
+
+        if leader:
+            result = fn()
+            try:
+                pipe = client.pipeline()
+                pipe.set(f'{base}:result', json.dumps(result), px=result_ttl_ms)
+                pipe.delete(f'{base}:lock')
+                pipe.execute()
+            except Exception:
+                pass
+            return result
+
+        deadline = time.monotonic() + wait
+        try:
+            while time.monotonic() < deadline:
+                time.sleep(_POLL_INTERVAL)
+                cached = client.get(f'{base}:result')
+                if cached is not None:
+                    COALESCED_REQUESTS.labels(scope=f'{self.scope}_shared').inc()
+                    return _load(cached)
+                if not client.exists(f'{base}:lock'):
+                    # the leader failed without publishing
+                    break
+        except Exception:
+            pass
+        return fn()
+
+
+def _load(raw):
+    value = json.loads(raw)
+    # JSON has no tuples; callers return (status, body) pairs
+    return tuple(value) if isinstance(value, list) else value
+
+
+class AsyncSingleFlight:
+    """Concurrent coroutines with the same key share one execution (one event loop)."""
+
+    def __init__(self, scope):
+        self.scope = scope
+        self._calls = {}
+
+    async def do(self, key, fn):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _, key=key: self._calls.pop(key, None))
+        else:
+            COALESCED_REQUESTS.labels(scope=self.scope).inc()
+        # shield: a client that disconnects must not cancel the lookup for everyone else
+        return await asyncio.shield(task)
@@ -0,0 +1,282 @@
+# backend/app/slowqueries.py
+# Slow-query log for everything that goes through SQLAlchemy: statements over SLOW_QUERY_MS
+# are grouped by shape per process (/admin/system/queries), logged to nanotrace.slow_query
+# and counted; a sample of slow SELECTs is EXPLAINed in the background on PostgreSQL.
+
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+log = logging.getLogger('nanotrace.slow_query')
+
+_STATEMENT_MAX_LEN = 4000
+_PLACEHOLDER = r'(?:%\(\w+\)s|%s|\?|\$\d+|:\w+)'
+_IN_LIST = re.compile(r'\(\s*' + _PLACEHOLDER + r'(?:\s*,\s*' + _PLACEHOLDER + r')+\s*\)')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w$.])-?\d+(?:\.\d+)?\b')
+_SPACE = re.compile(r'\s+')
+_EXPLAINABLE = re.compile(r'^\s*(?:SELECT|WITH)\b', re.IGNORECASE)
+_LOCKING = re.compile(r'\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b', re.IGNORECASE)
+_SKIPPED_FILES = ('/sqlalchemy/', '/flask_sqlalchemy/', '/slowqueries.py')
+
+_settings = None  # set by setup_slow_queries
+_queries = {}  # shape -> aggregate, see _record
+_lock = threading.Lock()
+_explainer = None
+
+
+def normalize(statement):
+    """The statement's shape: literals and IN lists folded, whitespace collapsed."""
+    shape = _STRING.sub('?', statement)
+    shape = _NUMBER.sub('?', shape)
+    shape = _IN_LIST.sub('(...)', shape)
+    return _SPACE.sub(' ', shape).strip()[:_STATEMENT_MAX_LEN]
+
+
+def _redact_value(value):
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (str, bytes)):
+        return f'<{type(value).__name__}:{len(value)}>'
+    return f'<{type(value).__name__}>'
+
+
+def redact(parameters):
+    """Bound parameters with every value replaced by its type (and length for strings)."""
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):  # executemany
+            return {'rows': len(parameters), 'first': redact(parameters[0])}
+        return [_redact_value(value) for value in parameters]
+    return None
+
+
+def redact_plan(plan):
+    return _STRING.sub("'?'", plan)
+
+
+def _caller():
+    """'app/review.py:208 bulk_decide' for the innermost frame of our own code."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename.replace('\\', '/')
+        if '/backend/' in filename and not filename.endswith(_SKIPPED_FILES):
+            path = filename.rsplit('/backend/', 1)[1]
+            return f'{path}:{frame.f_lineno} {frame.f_code.co_name}'
+        frame = frame.f_back
+    return None
+
+
+def _endpoint():
+    from flask import has_request_context, request
+
+    if has_request_context():
+        return request.endpoint or 'unmatched'
+    return None
+
+
+def _record(shape, duration_ms, parameters, endpoint, caller):
+    """Add one slow execution to the aggregate; True if the shape is due for a plan."""
+    now = time.time()
+    with _lock:
+        entry = _queries.get(shape)
+        if entry is None:
+            if len(_queries) >= _settings['max_entries']:
+                # make room by forgetting the shape that cost the least so far
+                del _queries[min(_queries, key=lambda key: _queries[key]['total_ms'])]
+            entry = _queries[shape] = {
+                'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'first_seen': now,
+                'endpoints': Counter(), 'callers': Counter(),
+                'plan': None, 'plan_at': None, 'plan_error': None, '_plan_due': 0.0,
+            }
+        entry['calls'] += 1
+        entry['total_ms'] += duration_ms
+        entry['max_ms'] = max(entry['max_ms'], duration_ms)
+        entry['last_seen'] = now
+        entry['last_params'] = parameters
+        entry['endpoints'][endpoint or '(no request)'] += 1
+        if caller:
+            entry['callers'][caller] += 1
+        if entry['_plan_due'] <= now and random.random() < _settings['explain_rate']:
+            entry['_plan_due'] = now + _settings['explain_interval']
+            return True
+    return False
+
+
+def _store_plan(shape, plan=None, error=None):
+    with _lock:
+        entry = _queries.get(shape)
+        if entry is not None:
+            entry['plan'], entry['plan_error'], entry['plan_at'] = plan, error, time.time()
+
+
+class _Explainer:
+    """One background thread per process running EXPLAIN (ANALYZE, BUFFERS) off a queue."""
+
+    def __init__(self, timeout_ms, queue_size=32):
+        self.timeout_ms = int(timeout_ms)
+        self.queue_size = queue_size
+        self.queue = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _start(self):
+        with self._start_lock:
+            if self._pid != os.getpid():  # first use, or a forked child without the thread
+                self._pid = os.getpid()
+                self.queue = queue.Queue(self.queue_size)
+                threading.Thread(target=self._run, name='slow-query-explain', daemon=True).start()
+
+    def submit(self, engine, shape, statement, parameters):
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self.queue.put_nowait((engine, shape, statement, parameters))
+        except queue.Full:
+            pass  # a plan is a sample; skipping one is fine
+
+    def _run(self):
+        while True:
+            engine, shape, statement, parameters = self.queue.get()
+            try:
+                _store_plan(shape, plan=redact_plan(self.explain(engine, statement, parameters)))
+            except Exception as exc:
+                _store_plan(shape, error=f'{type(exc).__name__}: {exc}'[:500])
+
+    def explain(self, engine, statement, parameters):
+        # a raw DBAPI cursor: the statement is already in the driver's paramstyle, and
+        # SQLAlchemy's cursor events (and so this module) do not see it
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(f'SET LOCAL statement_timeout = {self.timeout_ms}')
+                cursor.execute('EXPLAIN (ANALYZE, BUFFERS) ' + statement, parameters)
+                return '\n'.join(row[0] for row in cursor.fetchall())
+            finally:
+                cursor.close()
+        finally:
+            connection.rollback()
+            connection.close()
+
+
+def _explainable(conn, statement, executemany):
+    # ANALYZE really executes the statement, so only plain reads
+    return (
+        not executemany
+        and conn.dialect.name == 'postgresql'
+        and _EXPLAINABLE.match(statement) is not None
+        and _LOCKING.search(statement) is None
+    )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._slow_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_slow_query_start', None)
+    if start is None:
+        return
+    duration_ms = (time.perf_counter() - start) * 1000
+    if duration_ms < _settings['threshold_ms']:
+        return
+    try:
+        _slow_query(conn, statement, parameters, executemany, duration_ms)
+    except Exception:
+        # never let the slow-query log fail the query it is reporting on
+        log.debug('Recording slow query failed', exc_info=True)
+
+
+def _slow_query(conn, statement, parameters, executemany, duration_ms):
+    from backend.app.metrics import SLOW_QUERIES
+
+    shape = normalize(statement)
+    endpoint, caller, redacted = _endpoint(), _caller(), redact(parameters)
+    explain = _record(shape, duration_ms, redacted, endpoint, caller)
+    SLOW_QUERIES.labels(service=_settings['service'], endpoint=endpoint or '').inc()
+    log.warning(
+        'Slow query (%.0f ms): %s', duration_ms, shape[:200],
+        extra={
+            'duration_ms': round(duration_ms, 2),
+            'statement': shape,
+            'params': redacted,
+            'endpoint': endpoint,
+            'caller': caller,
+        },
+    )
+    if explain and _explainer is not None and _explainable(conn, statement, executemany):
+        _explainer.submit(conn.engine, shape, statement, parameters)
+
+
+def slow_queries():
+    """This process's slow statements, most total time first, as plain dicts."""
+    result = []
+    with _lock:
+        rows = sorted(_queries.items(), key=lambda row: row[1]['total_ms'], reverse=True)
+        for shape, entry in rows:
+            result.append({
+                'statement': shape,
+                'calls': entry['calls'],
+                'total_ms': round(entry['total_ms'], 1),
+                'avg_ms': round(entry['total_ms'] / entry['calls'], 1),
+                'max_ms': round(entry['max_ms'], 1),
+                'first_seen': datetime.utcfromtimestamp(entry['first_seen']),
+                'last_seen': datetime.utcfromtimestamp(entry['last_seen']),
+                'last_params': entry['last_params'],
+                'endpoints': entry['endpoints'].most_common(5),
+                'callers': entry['callers'].most_common(5),
+                'plan': entry['plan'],
+                'plan_error': entry['plan_error'],
+                'plan_at': datetime.utcfromtimestamp(entry['plan_at']) if entry['plan_at'] else None,
+            })
+    return result
+
+
+def reset_slow_queries():
+    with _lock:
+        _queries.clear()
+
+
+def setup_slow_queries(service, config=None):
+    """Install the cursor-event timer for this process; once. SLOW_QUERY_MS=0 turns it off."""
+    global _settings, _explainer
+    if _settings is not None:
+        return
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from backend.config.config import Config
+
+    def setting(key):
+        value = config.get(key) if config is not None else None
+        return getattr(Config, key) if value is None else value
+
+    threshold_ms = float(setting('SLOW_QUERY_MS'))
+    if threshold_ms <= 0:
+        return
+    _settings = {
+        'service': service,
+        'threshold_ms': threshold_ms,
+        'explain_rate': float(setting('SLOW_QUERY_EXPLAIN_RATE')),
+        'explain_interval': float(setting('SLOW_QUERY_EXPLAIN_INTERVAL')),
+        'max_entries': int(setting('SLOW_QUERY_MAX_ENTRIES')),
+    }
+    if _settings['explain_rate'] > 0:
+        _explainer = _Explainer(setting('SLOW_QUERY_EXPLAIN_TIMEOUT_MS'))
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def init_slow_queries(app, service):
+    setup_slow_queries(service, app.config)
@@ -0,0 +1,231 @@
+# backend/app/snapshots.py
+# Static copies of the verify page and JSON for approved certificates under SNAPSHOT_DIR,
+# served by Nginx with try_files (a missing file falls through to the app). Kept in step
+# on commit; a no-op while SNAPSHOT_DIR is unset.
+
+import json
+import os
+import tempfile
+import threading
+
+from flask import current_app, has_app_context
+from jinja2 import Environment
+
+from backend.app.assets import asset_url
+
+_SESSION_KEY = 'snapshots_pending'
+_RELOAD = object()  # pending marker: re-render from the database after commit
+_LAYOUT = (('certificate/verify', '.html'), ('certificate/api/verify', '.json'))
+
+# Flask's url_for needs a request; on cert.* both targets are plain paths
+_URLS = {'main.index': '/', 'certificates.verify_form': '/certificate/verify'}
+_templates = Environment(autoescape=True)
+_templates.globals['url_for'] = lambda endpoint, **_: _URLS.get(endpoint, '/')
+_templates.globals['asset_url'] = asset_url
+_pages = {}
+
+
+def _page(name):
+    page = _pages.get(name)
+    if page is None:
+        from backend.app.views import certificates
+
+        page = _pages[name] = _templates.from_string(getattr(certificates, name))
+    return page
+
+
+def render_verify_page(cert):
+    return _page('VERIFY_TEMPLATE').render(cert=cert)
+
+
+def render_not_found_page():
+    return _page('NOT_FOUND_TEMPLATE').render()
+
+
+def render_verify_json(cert):
+    from backend.app.models.certificate import public_certificate_dict
+
+    return json.dumps(public_certificate_dict(cert))
+
+
+def snapshot_dir():
+    if not has_app_context():
+        return None
+    return current_app.config.get('SNAPSHOT_DIR') or None
+
+
+def snapshot_paths(root, public_id):
+    """(html path, json path) for a certificate."""
+    return tuple(os.path.join(root, directory, public_id + ext) for directory, ext in _LAYOUT)
+
+
+def _write(path, content):
+    # write-then-rename so Nginx never serves a half-written file
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.snap-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            fh.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _remove(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _render(cert):
+    """(html, json) for an approved certificate, None when it must not have a snapshot."""
+    if cert.status != 'approved' or not cert.certificate_id:
+        return None
+    return render_verify_page(cert), render_verify_json(cert)
+
+
+def apply_snapshot(root, public_id, rendered):
+    html_path, json_path = snapshot_paths(root, public_id)
+    if rendered is None:
+        _remove(json_path)
+        _remove(html_path)
+        return False
+    html, body = rendered
+    _write(html_path, html)
+    _write(json_path, body)
+    return True
+
+
+def refresh_snapshots(public_ids):
+    """Re-render (or remove) the snapshots for these IDs from the database."""
+    from backend.app.models.certificate import Certificate
+
+    root = snapshot_dir()
+    if not root:
+        return 0
+    public_ids = list(public_ids)
+    for start in range(0, len(public_ids), 500):
+        chunk = public_ids[start:start + 500]
+        certs = {c.certificate_id: c for c in Certificate.query.filter(Certificate.certificate_id.in_(chunk))}
+        for public_id in chunk:
+            cert = certs.get(public_id)
+            apply_snapshot(root, public_id, _render(cert) if cert is not None else None)
+    return len(public_ids)
+
+
+def mark_stale(session, public_ids):
+    """Refresh these snapshots after the session commits (for bulk UPDATEs)."""
+    if snapshot_dir():
+        session.info.setdefault(_SESSION_KEY, {}).update(dict.fromkeys(public_ids, _RELOAD))
+
+
+def build_snapshots(batch_size=1000, prune=True):
+    """Write a snapshot for every approved certificate; optionally remove the rest."""
+    from backend.app import db
+    from backend.app.models.certificate import Certificate
+
+    root = snapshot_dir()
+    if not root:
+        raise RuntimeError('SNAPSHOT_DIR is not configured')
+
+    written = set()
+    last_id = 0
+    while True:
+        batch = (
+            Certificate.query
+            .filter(Certificate.status == 'approved', Certificate.id > last_id)
+            .order_by(Certificate.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        for cert in batch:
+            if apply_snapshot(root, cert.certificate_id, _render(cert)):
+                written.add(cert.certificate_id)
+        last_id = batch[-1].id
+        db.session.expunge_all()
+
+    removed = 0
+    if prune:
+        for directory, ext in _LAYOUT:
+            directory = os.path.join(root, directory)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                public_id, file_ext = os.path.splitext(name)
+                if file_ext == ext and public_id not in written:
+                    _remove(os.path.join(directory, name))
+                    removed += 1
+    return len(written), removed
+
+
+def _collect(session, flush_context):
+    from backend.app.models.certificate import Certificate
+    from sqlalchemy import inspect
+
+    if not snapshot_dir():
+        return
+    pending = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, Certificate) or not obj.certificate_id:
+            continue
+        state = inspect(obj)
+        if obj in session.deleted:
+            rendered = None
+        elif obj in session.new or state.attrs.status.history.has_changes() or obj.status == 'approved':
+            # any change to an approved certificate is visible on its page
+            rendered = _render(obj)
+        else:
+            continue
+        if pending is None:
+            pending = session.info.setdefault(_SESSION_KEY, {})
+        pending[obj.certificate_id] = rendered
+
+
+def _reload(app, public_ids):
+    with app.app_context():
+        try:
+            refresh_snapshots(public_ids)
+        except Exception:
+            # the files are gone already, so the pages are served dynamically until the next build
+            app.logger.exception('Snapshot refresh failed for %d certificates', len(public_ids))
+
+
+def _write_pending(session):
+    pending = session.info.pop(_SESSION_KEY, None)
+    root = snapshot_dir()
+    if not pending or not root:
+        return
+    reload = []
+    for public_id, rendered in pending.items():
+        if rendered is _RELOAD:
+            # no SQL in after_commit: drop the file now, re-render from the database below
+            reload.append(public_id)
+            rendered = None
+        try:
+            apply_snapshot(root, public_id, rendered)
+        except OSError:
+            current_app.logger.exception('Could not write snapshot for %s', public_id)
+            apply_snapshot(root, public_id, None)
+    if reload:
+        app = current_app._get_current_object()
+        threading.Thread(target=_reload, args=(app, reload), name='snapshot-refresh', daemon=True).start()
+
+
+def _forget(session, previous_transaction=None):
+    session.info.pop(_SESSION_KEY, None)
+
+
+def init_snapshots(app):
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    if not event.contains(Session, 'after_flush', _collect):
+        event.listen(Session, 'after_flush', _collect)
+        event.listen(Session, 'after_commit', _write_pending)
+        event.listen(Session, 'after_soft_rollback', _forget)
@@ -0,0 +1,20 @@
+# backend/app/tasks.py
+#
+# Celery tasks. Keep them thin: the work lives in plain functions that can also be run
+# from the CLI.
+
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def drain_email_outbox():
+    from backend.app.outbox import drain_outbox
+
+    return drain_outbox()
+
+
+@shared_task(ignore_result=True)
+def expire_certificates():
+    from backend.app.expiry import expire_due_certificates
+
+    return expire_due_certificates()
@@ -0,0 +1,373 @@
+# backend/app/tracing.py
+# Request tracing across services via the W3C traceparent header, exported as OTLP/JSON to
+# TRACE_EXPORT_FILE or TRACE_OTLP_ENDPOINT (off unless one is set). Flask views, SQL and
+# Redis are instrumented here; wrap anything else worth timing in span().
+
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+INTERNAL, SERVER, CLIENT = 1, 2, 3  # OTLP span kinds
+
+_TRACEPARENT = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+_SQL_MAX_LEN = 1000
+
+log = logging.getLogger(__name__)
+
+# the active (trace_id, span_id, sampled, Span or None)
+_context = contextvars.ContextVar('nanotrace_trace', default=None)
+
+_exporter = None
+_sample_rate = 0.0
+
+
+def _new_id(nbytes):
+    return f'{random.getrandbits(nbytes * 8):0{nbytes * 2}x}'
+
+
+class Span:
+    __slots__ = ('name', 'kind', 'trace_id', 'span_id', 'parent_id', 'start_ns', 'end_ns',
+                 'attributes', 'error')
+
+    def __init__(self, name, trace_id, parent_id=None, kind=INTERNAL, attributes=None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exc):
+        self.error = f'{type(exc).__name__}: {exc}'
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            if _exporter is not None:
+                _exporter.submit(self)
+
+    def to_otlp(self):
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [_otlp_attribute(k, v) for k, v in self.attributes.items() if v is not None],
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        if self.error:
+            span['status'] = {'code': 2, 'message': self.error}
+        return span
+
+
+def _otlp_attribute(key, value):
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+# --- context -------------------------------------------------------------------------
+
+def current_trace_id():
+    ctx = _context.get()
+    return ctx[0] if ctx else None
+
+
+def current_span():
+    ctx = _context.get()
+    return ctx[3] if ctx else None
+
+
+def traceparent():
+    """Header value for an outbound call made in the current context, or None."""
+    ctx = _context.get()
+    if ctx is None:
+        return None
+    return f'00-{ctx[0]}-{ctx[1]}-{"01" if ctx[2] else "00"}'
+
+
+def inject(headers):
+    """Add traceparent to an outbound request's headers (a dict); returns headers."""
+    value = traceparent()
+    if value:
+        headers['traceparent'] = value
+    return headers
+
+
+def start_server_span(name, header=None, **attributes):
+    """Start (or continue, from a traceparent header) the trace of an incoming request.
+
+    Returns (span or None, token); pass both to finish_server_span(). Sampling is decided
+    here, where the trace starts, and inherited downstream; an unsampled request keeps its
+    trace ID for propagation and logs but creates no spans.
+    """
+    match = _TRACEPARENT.match(header or '')
+    if match and match.group(1) != '0' * 32:
+        trace_id, parent_id, sampled = match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+    else:
+        trace_id, parent_id = _new_id(16), None
+        sampled = _exporter is not None and random.random() < _sample_rate
+    if not sampled or _exporter is None:
+        return None, _context.set((trace_id, parent_id or _new_id(8), False, None))
+    span = Span(name, trace_id, parent_id, SERVER, attributes)
+    return span, _context.set((trace_id, span.span_id, True, span))
+
+
+def finish_server_span(span, token, status=None, exc=None):
+    if span is not None:
+        if status is not None:
+            span.set_attribute('http.status_code', status)
+            if status >= 500 and span.error is None:
+                span.error = f'HTTP {status}'
+        if exc is not None:
+            span.record_exception(exc)
+        span.end()
+    _context.reset(token)
+
+
+def start_span(name, kind=INTERNAL, **attributes):
+    """A child of the current span, or None when the current trace is not sampled."""
+    ctx = _context.get()
+    if ctx is None or not ctx[2]:
+        return None
+    return Span(name, ctx[0], ctx[1], kind, attributes)
+
+
+@contextmanager
+def span(name, kind=INTERNAL, **attributes):
+    """Time the block as a child span; nested span() calls become its children."""
+    child = start_span(name, kind, **attributes)
+    if child is None:
+        yield None
+        return
+    ctx = _context.get()
+    token = _context.set((ctx[0], child.span_id, True, child))
+    try:
+        yield child
+    except BaseException as exc:
+        child.record_exception(exc)
+        raise
+    finally:
+        _context.reset(token)
+        child.end()
+
+
+# --- export --------------------------------------------------------------------------
+
+class _Exporter:
+    """Background batch exporter; per process, restarted after fork."""
+
+    def __init__(self, service, path, endpoint, queue_size, interval=1.0, batch_size=512):
+        self.service = service
+        self.path = path
+        self.endpoint = endpoint
+        self.queue_size = queue_size
+        self.interval = interval
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._pid = None
+        self._queue = None
+        self._last_error_log = 0.0
+
+    def _start(self):
+        self._pid = os.getpid()
+        self._queue = queue.Queue(self.queue_size)
+        threading.Thread(target=self._run, name='trace-exporter', daemon=True).start()
+
+    def submit(self, span):
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.export(batch)
+
+    def flush(self):
+        if self._queue is None or self._pid != os.getpid():
+            return
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self.export(batch)
+
+    def encode(self, spans):
+        return json.dumps({'resourceSpans': [{
+            'resource': {'attributes': [_otlp_attribute('service.name', self.service)]},
+            'scopeSpans': [{
+                'scope': {'name': 'nanotrace'},
+                'spans': [s.to_otlp() for s in spans],
+            }],
+        }]}, separators=(',', ':'))
+
+    def export(self, spans):
+        body = self.encode(spans)
+        try:
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as fh:
+                    fh.write(body + '\n')
+            if self.endpoint:
+                import urllib.request
+
+                req = urllib.request.Request(
+                    self.endpoint, data=body.encode('utf-8'),
+                    headers={'Content-Type': 'application/json'}, method='POST',
+                )
+                urllib.request.urlopen(req, timeout=2).close()
+        except Exception:
+            # at most one complaint a minute; a broken collector must not flood the logs
+            if time.monotonic() - self._last_error_log > 60:
+                self._last_error_log = time.monotonic()
+                log.warning('Trace export failed; dropping %d spans', len(spans), exc_info=True)
+
+
+# --- instrumentation -----------------------------------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    child = start_span('db.query', CLIENT, **{
+        'db.system': conn.dialect.name,
+        'db.statement': statement[:_SQL_MAX_LEN],
+    })
+    if child is not None and context is not None:
+        context._trace_span = child
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    child = getattr(context, '_trace_span', None)
+    if child is not None:
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            child.set_attribute('db.rows', cursor.rowcount)
+        child.end()
+
+
+def _handle_error(exception_context):
+    child = getattr(exception_context.execution_context, '_trace_span', None)
+    if child is not None:
+        child.record_exception(exception_context.original_exception)
+        child.end()
+
+
+def _instrument_sqlalchemy():
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+
+
+try:
+    import redis as _redis
+
+    class TracedRedis(_redis.Redis):
+        """redis.Redis with a span per command (pipelines: one span per execute)."""
+
+        def execute_command(self, *args, **options):
+            if current_span() is None:
+                return super().execute_command(*args, **options)
+            with span(f'redis {args[0]}', CLIENT, **{'db.system': 'redis'}):
+                return super().execute_command(*args, **options)
+
+        def pipeline(self, transaction=True, shard_hint=None):
+            return _TracedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+    class _TracedPipeline(_redis.client.Pipeline):
+        def execute(self, raise_on_error=True):
+            if current_span() is None:
+                return super().execute(raise_on_error)
+            with span('redis pipeline', CLIENT, **{'db.system': 'redis', 'db.commands': len(self.command_stack)}):
+                return super().execute(raise_on_error)
+except ImportError:  # services without redis installed
+    TracedRedis = None
+
+
+def setup_tracing(service, config=None):
+    """Enable span export for this process if a file or endpoint is configured; once."""
+    global _exporter, _sample_rate
+    if _exporter is not None:
+        return
+    from backend.config.config import Config
+
+    def setting(key):
+        value = config.get(key) if config is not None else None
+        return getattr(Config, key) if value is None else value
+
+    path, endpoint = setting('TRACE_EXPORT_FILE'), setting('TRACE_OTLP_ENDPOINT')
+    if not (path or endpoint):
+        return
+    _sample_rate = float(setting('TRACE_SAMPLE_RATE'))
+    _exporter = _Exporter(service, path, endpoint, int(setting('TRACE_QUEUE_SIZE')))
+    _instrument_sqlalchemy()
+    atexit.register(_exporter.flush)
+
+
+def init_tracing(app, service):
+    """A server span per request of `app`, continuing the caller's traceparent."""
+    setup_tracing(service, app.config)
+    if _exporter is None:
+        return
+
+    from flask import g, request
+
+    @app.before_request
+    def _start_trace():
+        rule = request.url_rule.rule if request.url_rule else 'unmatched'
+        g._trace_span, g._trace_token = start_server_span(
+            f'{request.method} {rule}',
+            request.headers.get('traceparent'),
+            **{'http.method': request.method, 'http.route': rule, 'http.target': request.path},
+        )
+
+    @app.after_request
+    def _trace_status(response):
+        trace_span = g.get('_trace_span')
+        if trace_span is not None:
+            trace_span.set_attribute('http.status_code', response.status_code)
+        return response
+
+    @app.teardown_request
+    def _end_trace(exc):
+        token = g.pop('_trace_token', None)
+        if token is not None:
+            trace_span = g.pop('_trace_span', None)
+            status = trace_span.attributes.get('http.status_code') if trace_span else None
+            finish_server_span(trace_span, token, status=status if exc is None else 500, exc=exc)
@@ -22,6 +22,7 @@ def approve(cert_id):
         return redirect(url_for('main.index'))
     cert = Certificate.query.get_or_404(cert_id)
     cert.status = "approved"
+    cert.set_expiry()
     db.session.commit()
     flash("Certificate approved!")
     return redirect(url_for('admin.certificates'))
@@ -1,5 +1,21 @@
 from . import bp
+from backend.app.email_verification import confirm_email
+from backend.app.ratelimit import rate_limit
 
 @bp.route("/login")
+@rate_limit("RATELIMIT_LOGIN")
 def login():
     return "auth.nanotrace.org/login is live"
+
+VERIFY_MESSAGES = {
+    "confirmed": "Thanks, your email address is confirmed.",
+    "already": "This email address is already confirmed.",
+    "expired": "This confirmation link has expired. Log in to request a new one.",
+    "invalid": "This confirmation link is not valid.",
+}
+
+@bp.route("/verify-email/<token>")
+@rate_limit("RATELIMIT_LOGIN")
+def verify_email(token):
+    status = confirm_email(token)
+    return VERIFY_MESSAGES[status], 200 if status in ("confirmed", "already") else 400
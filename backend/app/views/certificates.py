@@ -1,12 +1,134 @@
-from flask import Blueprint, render_template_string, request, flash, redirect, url_for, jsonify
+from flask import Blueprint, current_app, render_template_string, request, flash, redirect, url_for, jsonify
 from flask_login import login_required, current_user
 from backend.app import db
 from backend.app.models.certificate import Certificate
+from backend.app.certids import canonical_public_id
+from backend.app.idfilter import might_exist
+from backend.app.ratelimit import rate_limit, limit_not_found
+from backend.app.singleflight import SingleFlight
 from datetime import datetime
+import json
 import uuid
 
 bp = Blueprint('certificates', __name__)
 
+_verify_flight = SingleFlight('verify')
+
+NOT_FOUND_TEMPLATE = '''
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Certificate Not Found - NanoTrace</title>
+        <link rel="stylesheet" href="{{ asset_url('css/certificates.css') }}">
+    </head>
+    <body class="page-not-found">
+        <div class="container">
+            <h1>Certificate Not Found</h1>
+            <p>The certificate ID you provided could not be found in our blockchain database.</p>
+            <p><a href="{{ url_for('main.index') }}">← Go Home</a></p>
+        </div>
+    </body>
+    </html>
+    '''
+
+# also rendered by the async verify service (backend/apps/verify/asgi.py)
+VERIFY_TEMPLATE = '''
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Certificate Verification - NanoTrace</title>
+        <link rel="stylesheet" href="{{ asset_url('css/certificates.css') }}">
+    </head>
+    <body class="page-verify">
+        <div class="container">
+            <div class="cert-header">
+                <h1>Certificate Verification</h1>
+                <p>Blockchain-verified nanotechnology certification</p>
+            </div>
+            
+            <div class="cert-status status-{{ cert.status }}">
+                {% if cert.status == 'approved' %}
+                    ✅ Certificate Verified and Approved
+                {% elif cert.status == 'rejected' %}
+                    ❌ Certificate Application Rejected
+                {% elif cert.status == 'expired' %}
+                    ⌛ Certificate Expired
+                {% elif cert.status == 'revoked' %}
+                    🚫 Certificate Revoked
+                {% else %}
+                    ⏳ Certificate Pending Administrator Review
+                {% endif %}
+            </div>
+            
+            <div class="cert-details">
+                <h3>Certificate Details</h3>
+                <div class="detail-row">
+                    <div class="detail-label">Certificate ID:</div>
+                    <div class="detail-value">{{ cert.certificate_id }}</div>
+                </div>
+                <div class="detail-row">
+                    <div class="detail-label">Product Name:</div>
+                    <div class="detail-value">{{ cert.product_name }}</div>
+                </div>
+                <div class="detail-row">
+                    <div class="detail-label">Nanomaterial Type:</div>
+                    <div class="detail-value">{{ cert.material_type }}</div>
+                </div>
+                <div class="detail-row">
+                    <div class="detail-label">Supplier/Manufacturer:</div>
+                    <div class="detail-value">{{ cert.supplier }}</div>
+                </div>
+                {% if cert.concentration %}
+                <div class="detail-row">
+                    <div class="detail-label">Concentration/Purity:</div>
+                    <div class="detail-value">{{ cert.concentration }}</div>
+                </div>
+                {% endif %}
+                {% if cert.particle_size %}
+                <div class="detail-row">
+                    <div class="detail-label">Particle Size:</div>
+                    <div class="detail-value">{{ cert.particle_size }}</div>
+                </div>
+                {% endif %}
+                <div class="detail-row">
+                    <div class="detail-label">Application Date:</div>
+                    <div class="detail-value">{{ cert.created_at.strftime('%B %d, %Y at %I:%M %p') }}</div>
+                </div>
+                <div class="detail-row">
+                    <div class="detail-label">Status:</div>
+                    <div class="detail-value">{{ cert.status.title() }}</div>
+                </div>
+                {% if cert.expires_at %}
+                <div class="detail-row">
+                    <div class="detail-label">{{ 'Expired' if cert.status == 'expired' else 'Valid Until' }}:</div>
+                    <div class="detail-value">{{ cert.expires_at.strftime('%B %d, %Y') }}</div>
+                </div>
+                {% endif %}
+            </div>
+            
+            {% if cert.status == 'approved' %}
+                <div class="blockchain-info">
+                    <h4>Blockchain Verification</h4>
+                    <p>This certificate has been verified and recorded on the NanoTrace blockchain network. The certification data is immutable and cryptographically secured.</p>
+                    <p><strong>Verification Method:</strong> Hyperledger Fabric</p>
+                    <p><strong>Network:</strong> NanoTrace Production Network</p>
+                </div>
+            {% endif %}
+            
+            <div class="nav-links">
+                <a href="{{ url_for('certificates.verify_form') }}">Verify Another Certificate</a> |
+                <a href="{{ url_for('main.index') }}">Back to Home</a>
+            </div>
+        </div>
+    </body>
+    </html>
+    '''
+
+def _certificate_not_found():
+    return render_template_string(NOT_FOUND_TEMPLATE), 404
+
 @bp.route('/apply', methods=['GET', 'POST'])
 @login_required
 def apply():
@@ -49,49 +171,9 @@ def apply():
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Apply for Certificate - NanoTrace</title>
-        <style>
-            body { 
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; 
-                margin: 0; padding: 0; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                min-height: 100vh; color: white;
-            }
-            .container { 
-                max-width: 800px; margin: 50px auto; padding: 20px;
-                background: rgba(255,255,255,0.1); border-radius: 15px; 
-                backdrop-filter: blur(10px); box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-            }
-            h2 { text-align: center; margin-bottom: 30px; font-size: 2.2em; }
-            .form-group { margin-bottom: 20px; }
-            label { display: block; margin-bottom: 8px; font-weight: bold; }
-            input, select, textarea {
-                width: 100%; padding: 12px; border: none; border-radius: 8px;
-                background: rgba(255,255,255,0.2); color: white; font-size: 16px;
-            }
-            input::placeholder, textarea::placeholder { color: rgba(255,255,255,0.7); }
-            .form-row { display: grid; grid-template-columns: 1fr 1fr; gap: 20px; }
-            .btn {
-                width: 100%; padding: 15px; border: none; border-radius: 8px;
-                background: rgba(40,167,69,0.8); color: white; font-size: 18px;
-                font-weight: bold; cursor: pointer; transition: all 0.3s ease;
-            }
-            .btn:hover { background: rgba(40,167,69,1); }
-            .flash-messages {
-                margin-bottom: 20px; padding: 15px; border-radius: 8px;
-                background: rgba(255,255,255,0.2); border-left: 4px solid #ffa500;
-            }
-            .nav-links { text-align: center; margin-top: 30px; }
-            .nav-links a { color: white; text-decoration: none; margin: 0 15px; }
-            .nano-types {
-                display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); 
-                gap: 10px; margin-top: 10px;
-            }
-            .nano-type { 
-                background: rgba(255,255,255,0.15); padding: 10px; border-radius: 5px; 
-                text-align: center; font-size: 14px;
-            }
-        </style>
+        <link rel="stylesheet" href="{{ asset_url('css/certificates.css') }}">
     </head>
-    <body>
+    <body class="page-apply">
         <div class="container">
             <h2>Apply for Nanotechnology Certificate</h2>
             
@@ -99,7 +181,7 @@ def apply():
                 {% if messages %}
                     <div class="flash-messages">
                         {% for message in messages %}
-                            <p style="margin: 5px 0;">{{ message }}</p>
+                            <p>{{ message }}</p>
                         {% endfor %}
                     </div>
                 {% endif %}
@@ -169,7 +251,7 @@ def apply():
             
             <div class="nav-links">
                 <a href="{{ url_for('certificates.my_certificates') }}">My Certificates</a> |
-                <a href="{{ url_for('home') }}">Back to Home</a>
+                <a href="{{ url_for('main.index') }}">Back to Home</a>
             </div>
         </div>
     </body>
@@ -188,53 +270,9 @@ def my_certificates():
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>My Certificates - NanoTrace</title>
-        <style>
-            body { 
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; 
-                margin: 0; padding: 0; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                min-height: 100vh; color: white;
-            }
-            .container { 
-                max-width: 1000px; margin: 50px auto; padding: 20px;
-                background: rgba(255,255,255,0.1); border-radius: 15px; 
-                backdrop-filter: blur(10px); box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-            }
-            h2 { text-align: center; margin-bottom: 30px; font-size: 2.2em; }
-            .stats { 
-                display: grid; grid-template-columns: repeat(auto-fit, minmax(150px, 1fr)); 
-                gap: 20px; margin-bottom: 30px;
-            }
-            .stat-card {
-                background: rgba(255,255,255,0.2); padding: 20px; border-radius: 10px; text-align: center;
-            }
-            .stat-number { font-size: 2em; font-weight: bold; }
-            table { 
-                width: 100%; border-collapse: collapse; margin-top: 20px;
-                background: rgba(255,255,255,0.1); border-radius: 10px; overflow: hidden;
-            }
-            th, td { padding: 15px; text-align: left; border-bottom: 1px solid rgba(255,255,255,0.1); }
-            th { background: rgba(255,255,255,0.2); font-weight: bold; }
-            .status {
-                padding: 6px 12px; border-radius: 15px; font-size: 12px; font-weight: bold;
-            }
-            .status-pending { background: rgba(255,193,7,0.3); color: #fff3cd; }
-            .status-approved { background: rgba(40,167,69,0.3); color: #d4edda; }
-            .status-rejected { background: rgba(220,53,69,0.3); color: #f8d7da; }
-            .empty-state {
-                text-align: center; padding: 60px 20px;
-                background: rgba(255,255,255,0.1); border-radius: 10px; margin-top: 20px;
-            }
-            .btn {
-                display: inline-block; padding: 10px 20px; border-radius: 8px;
-                background: rgba(40,167,69,0.8); color: white; text-decoration: none;
-                font-weight: bold; transition: all 0.3s ease;
-            }
-            .btn:hover { background: rgba(40,167,69,1); }
-            .nav-links { text-align: center; margin-top: 30px; }
-            .nav-links a { color: white; text-decoration: none; margin: 0 15px; }
-        </style>
+        <link rel="stylesheet" href="{{ asset_url('css/certificates.css') }}">
     </head>
-    <body>
+    <body class="page-mine">
         <div class="container">
             <h2>My Certificate Applications</h2>
             
@@ -279,12 +317,11 @@ def my_certificates():
                                 </span>
                             </td>
                             <td>{{ cert.created_at.strftime('%Y-%m-%d') }}</td>
-                            <td style="font-family: monospace; font-size: 0.9em;">
+                            <td class="cert-id">
                                 {% if cert.status == 'approved' %}
-                                    <a href="{{ url_for('certificates.verify', certificate_id=cert.certificate_id) }}" 
-                                       style="color: #90EE90;">{{ cert.certificate_id[:16] }}...</a>
+                                    <a href="{{ url_for('certificates.verify', certificate_id=cert.certificate_id) }}">{{ cert.certificate_id }}</a>
                                 {% else %}
-                                    {{ cert.certificate_id[:16] }}...
+                                    {{ cert.certificate_id }}
                                 {% endif %}
                             </td>
                         </tr>
@@ -301,7 +338,7 @@ def my_certificates():
             
             <div class="nav-links">
                 <a href="{{ url_for('certificates.apply') }}">Apply for New Certificate</a> |
-                <a href="{{ url_for('home') }}">Back to Home</a>
+                <a href="{{ url_for('main.index') }}">Back to Home</a>
             </div>
         </div>
     </body>
@@ -309,141 +346,44 @@ def my_certificates():
     ''', certs=certs)
 
 @bp.route('/verify/<certificate_id>')
+@rate_limit('RATELIMIT_VERIFY')
+@limit_not_found('RATELIMIT_VERIFY_MISSES', scope='certificates.verify')
 def verify(certificate_id):
-    cert = Certificate.query.filter_by(certificate_id=certificate_id).first()
-    
+    # malformed / bad check digit, then Bloom filter: unknown IDs never reach Postgres
+    public_id = canonical_public_id(certificate_id)
+    if public_id is None or not might_exist(public_id):
+        return _certificate_not_found()
+
+    # a burst of scans for one certificate shares a single lookup + render
+    body, status = _verify_flight.do(f'html:{public_id}', lambda: _render_verify(public_id))
+    return body, status
+
+def _render_verify(public_id):
+    # falls back to the archive tier, so old and rejected certificates still verify
+    cert = Certificate.find_by_public_id(public_id, include_archived=True)
     if not cert:
-        return render_template_string('''
-        <!DOCTYPE html>
-        <html>
-        <head><title>Certificate Not Found - NanoTrace</title></head>
-        <body style="font-family: Arial; text-align: center; padding: 100px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; min-height: 100vh;">
-            <div style="background: rgba(255,255,255,0.1); padding: 40px; border-radius: 15px; backdrop-filter: blur(10px); max-width: 500px; margin: 0 auto;">
-                <h1>Certificate Not Found</h1>
-                <p>The certificate ID you provided could not be found in our blockchain database.</p>
-                <p><a href="{{ url_for('home') }}" style="color: white;">← Go Home</a></p>
-            </div>
-        </body>
-        </html>
-        '''), 404
-    
-    return render_template_string('''
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Certificate Verification - NanoTrace</title>
-        <style>
-            body { 
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; 
-                margin: 0; padding: 0; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                min-height: 100vh; color: white;
-            }
-            .container { 
-                max-width: 700px; margin: 50px auto; padding: 20px;
-                background: rgba(255,255,255,0.1); border-radius: 15px; 
-                backdrop-filter: blur(10px); box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-            }
-            .cert-header { text-align: center; margin-bottom: 30px; }
-            .cert-status {
-                padding: 20px; border-radius: 10px; margin: 20px 0; text-align: center; font-weight: bold;
-            }
-            .status-approved { background: rgba(40,167,69,0.3); border: 2px solid #28a745; }
-            .status-pending { background: rgba(255,193,7,0.3); border: 2px solid #ffc107; }
-            .status-rejected { background: rgba(220,53,69,0.3); border: 2px solid #dc3545; }
-            .cert-details {
-                background: rgba(255,255,255,0.1); padding: 25px; border-radius: 10px; margin: 20px 0;
-            }
-            .detail-row { 
-                display: grid; grid-template-columns: 1fr 2fr; gap: 15px; 
-                padding: 12px 0; border-bottom: 1px solid rgba(255,255,255,0.1);
-            }
-            .detail-row:last-child { border-bottom: none; }
-            .detail-label { font-weight: bold; opacity: 0.8; }
-            .detail-value { font-family: monospace; }
-            .blockchain-info {
-                background: rgba(0,255,0,0.1); padding: 20px; border-radius: 10px; 
-                border-left: 4px solid #00ff00; margin-top: 20px;
-            }
-            .nav-links { text-align: center; margin-top: 30px; }
-            .nav-links a { color: white; text-decoration: none; margin: 0 15px; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="cert-header">
-                <h1>Certificate Verification</h1>
-                <p>Blockchain-verified nanotechnology certification</p>
-            </div>
-            
-            <div class="cert-status status-{{ cert.status }}">
-                {% if cert.status == 'approved' %}
-                    ✅ Certificate Verified and Approved
-                {% elif cert.status == 'rejected' %}
-                    ❌ Certificate Application Rejected
-                {% else %}
-                    ⏳ Certificate Pending Administrator Review
-                {% endif %}
-            </div>
-            
-            <div class="cert-details">
-                <h3>Certificate Details</h3>
-                <div class="detail-row">
-                    <div class="detail-label">Certificate ID:</div>
-                    <div class="detail-value">{{ cert.certificate_id }}</div>
-                </div>
-                <div class="detail-row">
-                    <div class="detail-label">Product Name:</div>
-                    <div class="detail-value">{{ cert.product_name }}</div>
-                </div>
-                <div class="detail-row">
-                    <div class="detail-label">Nanomaterial Type:</div>
-                    <div class="detail-value">{{ cert.material_type }}</div>
-                </div>
-                <div class="detail-row">
-                    <div class="detail-label">Supplier/Manufacturer:</div>
-                    <div class="detail-value">{{ cert.supplier }}</div>
-                </div>
-                {% if cert.concentration %}
-                <div class="detail-row">
-                    <div class="detail-label">Concentration/Purity:</div>
-                    <div class="detail-value">{{ cert.concentration }}</div>
-                </div>
-                {% endif %}
-                {% if cert.particle_size %}
-                <div class="detail-row">
-                    <div class="detail-label">Particle Size:</div>
-                    <div class="detail-value">{{ cert.particle_size }}</div>
-                </div>
-                {% endif %}
-                <div class="detail-row">
-                    <div class="detail-label">Application Date:</div>
-                    <div class="detail-value">{{ cert.created_at.strftime('%B %d, %Y at %I:%M %p') }}</div>
-                </div>
-                <div class="detail-row">
-                    <div class="detail-label">Status:</div>
-                    <div class="detail-value">{{ cert.status.title() }}</div>
-                </div>
-            </div>
-            
-            {% if cert.status == 'approved' %}
-                <div class="blockchain-info">
-                    <h4>Blockchain Verification</h4>
-                    <p>This certificate has been verified and recorded on the NanoTrace blockchain network. The certification data is immutable and cryptographically secured.</p>
-                    <p><strong>Verification Method:</strong> Hyperledger Fabric</p>
-                    <p><strong>Network:</strong> NanoTrace Production Network</p>
-                </div>
-            {% endif %}
-            
-            <div class="nav-links">
-                <a href="{{ url_for('certificates.verify_form') }}">Verify Another Certificate</a> |
-                <a href="{{ url_for('home') }}">Back to Home</a>
-            </div>
-        </div>
-    </body>
-    </html>
-    ''', cert=cert)
+        return _certificate_not_found()
+    return render_template_string(VERIFY_TEMPLATE, cert=cert), 200
+
+@bp.route('/api/verify/<certificate_id>')
+@rate_limit('RATELIMIT_VERIFY', scope='certificates.verify')
+@limit_not_found('RATELIMIT_VERIFY_MISSES', scope='certificates.verify')
+def verify_api(certificate_id):
+    public_id = canonical_public_id(certificate_id)
+    if public_id is None or not might_exist(public_id):
+        body, status = _verify_api_not_found(certificate_id)
+    else:
+        body, status = _verify_flight.do(f'json:{public_id}', lambda: _render_verify_api(public_id))
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+def _verify_api_not_found(certificate_id):
+    return json.dumps({'error': 'not_found', 'certificate_id': certificate_id}), 404
+
+def _render_verify_api(public_id):
+    cert = Certificate.find_by_public_id(public_id, include_archived=True)
+    if not cert:
+        return _verify_api_not_found(public_id)
+    return json.dumps(cert.to_public_dict()), 200
 
 @bp.route('/verify')
 def verify_form():
@@ -454,52 +394,18 @@ def verify_form():
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Verify Certificate - NanoTrace</title>
-        <style>
-            body { 
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; 
-                margin: 0; padding: 0; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                min-height: 100vh; color: white; display: flex; align-items: center; justify-content: center;
-            }
-            .container { 
-                max-width: 500px; padding: 40px;
-                background: rgba(255,255,255,0.1); border-radius: 15px; 
-                backdrop-filter: blur(10px); box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-            }
-            h2 { text-align: center; margin-bottom: 30px; font-size: 2.2em; }
-            .form-group { margin-bottom: 25px; }
-            label { display: block; margin-bottom: 8px; font-weight: bold; }
-            input {
-                width: 100%; padding: 15px; border: none; border-radius: 8px;
-                background: rgba(255,255,255,0.2); color: white; font-size: 16px;
-                font-family: monospace;
-            }
-            input::placeholder { color: rgba(255,255,255,0.7); }
-            .btn-container { display: flex; gap: 10px; }
-            .btn {
-                flex: 1; padding: 15px; border: none; border-radius: 8px;
-                background: rgba(0,123,255,0.8); color: white; font-size: 16px;
-                font-weight: bold; cursor: pointer; transition: all 0.3s ease; text-decoration: none;
-                display: block; text-align: center;
-            }
-            .btn:hover { background: rgba(0,123,255,1); }
-            .help-text {
-                background: rgba(255,255,255,0.1); padding: 20px; border-radius: 8px; 
-                margin-top: 25px; font-size: 14px; line-height: 1.6;
-            }
-            .nav-links { text-align: center; margin-top: 30px; }
-            .nav-links a { color: white; text-decoration: none; margin: 0 15px; }
-        </style>
+        <link rel="stylesheet" href="{{ asset_url('css/certificates.css') }}">
     </head>
-    <body>
+    <body class="page-lookup">
         <div class="container">
             <h2>Verify Certificate</h2>
-            <p style="text-align: center; margin-bottom: 30px;">Enter a certificate ID to verify its authenticity on the blockchain</p>
+            <p class="lead">Enter a certificate ID to verify its authenticity on the blockchain</p>
             
             <form method="get" action="{{ url_for('certificates.verify_lookup') }}">
                 <div class="form-group">
                     <label for="cert_id">Certificate ID</label>
                     <input type="text" id="cert_id" name="cert_id" required
-                           placeholder="e.g., 550e8400-e29b-41d4-a716-446655440000">
+                           placeholder="e.g., NT-2025-01K3CW3600FB9RTWDYG4S9852V7">
                 </div>
                 
                 <div class="btn-container">
@@ -509,13 +415,14 @@ def verify_form():
             
             <div class="help-text">
                 <strong>How to verify:</strong>
-                <br>• Enter the complete certificate ID (usually starts with numbers/letters)
-                <br>• Certificate IDs are case-sensitive
+                <br>• Certificate IDs look like NT-2025-01K3CW3600FB9RTWDYG4S9852V7: NT, the year of issue and a 27-character code
+                <br>• Case doesn't matter, and spaces or dashes inside the code are ignored
+                <br>• Older certificates have a 36-character ID with dashes; enter it as printed
                 <br>• You can find certificate IDs on official certification documents or QR codes
             </div>
             
             <div class="nav-links">
-                <a href="{{ url_for('home') }}">Back to Home</a>
+                <a href="{{ url_for('main.index') }}">Back to Home</a>
             </div>
         </div>
     </body>
@@ -523,10 +430,89 @@ def verify_form():
     ''')
 
 @bp.route('/verify-lookup')
+@rate_limit('RATELIMIT_VERIFY')
+@limit_not_found('RATELIMIT_VERIFY_MISSES', scope='certificates.verify')
 def verify_lookup():
     cert_id = request.args.get('cert_id', '').strip()
     if cert_id:
-        return redirect(url_for('certificates.verify', certificate_id=cert_id))
+        public_id = canonical_public_id(cert_id)
+        if public_id is None or not might_exist(public_id):
+            return _certificate_not_found()
+        return redirect(url_for('certificates.verify', certificate_id=public_id))
     else:
         flash('Please enter a certificate ID.')
         return redirect(url_for('certificates.verify_form'))
+
+def _approved_certificate(certificate_id):
+    public_id = canonical_public_id(certificate_id)
+    if public_id is None or not might_exist(public_id):
+        return None
+    cert = Certificate.find_by_public_id(public_id)
+    return cert if cert is not None and cert.status == 'approved' else None
+
+@bp.route('/api/token/<certificate_id>')
+@rate_limit('RATELIMIT_VERIFY', scope='certificates.verify')
+@limit_not_found('RATELIMIT_VERIFY_MISSES', scope='certificates.verify')
+def token_api(certificate_id):
+    from backend.app.certtokens import mint_token, qr_payload
+
+    cert = _approved_certificate(certificate_id)
+    token = mint_token(cert) if cert is not None else None
+    if token is None:
+        return jsonify({'error': 'not_found', 'certificate_id': certificate_id}), 404
+    return jsonify({'certificate_id': cert.certificate_id, 'token': token, 'qr_payload': qr_payload(cert, token)})
+
+@bp.route('/qr/<certificate_id>.png')
+@rate_limit('RATELIMIT_VERIFY', scope='certificates.verify')
+@limit_not_found('RATELIMIT_VERIFY_MISSES', scope='certificates.verify')
+def qr_code(certificate_id):
+    from backend.app.certtokens import qr_payload, qr_png
+
+    cert = _approved_certificate(certificate_id)
+    if cert is None:
+        return _certificate_not_found()
+    response = current_app.response_class(qr_png(qr_payload(cert)), mimetype='image/png')
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+@bp.route('/api/verify-token', methods=['GET', 'POST'])
+@rate_limit('RATELIMIT_VERIFY', scope='certificates.verify')
+def verify_token_api():
+    # signature and expiry only, no database: the same check scanners run offline
+    from backend.app.certtokens import TokenError, trusted_keys, verify_token
+
+    token = request.args.get('t') or (request.get_json(silent=True) or {}).get('token') or ''
+    try:
+        claims = verify_token(token.strip(), trusted_keys())
+    except TokenError as exc:
+        return jsonify({'valid': False, 'error': str(exc)}), 422
+    return jsonify({'valid': True, **claims})
+
+@bp.route('/api/keys')
+def signing_keys():
+    from backend.app.certtokens import public_key_b64, trusted_keys
+
+    keys = [
+        {'kty': 'OKP', 'crv': 'Ed25519', 'alg': 'EdDSA', 'kid': kid.hex(), 'x': public_key_b64(key)}
+        for kid, key in trusted_keys().items()
+    ]
+    response = jsonify({'keys': keys})
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
+
+@bp.route('/api/revocations')
+@rate_limit('RATELIMIT_VERIFY', scope='certificates.verify')
+def revocation_list():
+    # ?since=<version>: only what changed after that version; otherwise the full set
+    from backend.app.revocations import build_revocation_list
+
+    since = request.args.get('since', type=int)
+    data, version, kind = build_revocation_list(since)
+    etag = f'{kind.decode()}{since or 0}-{version}'
+    if request.if_none_match.contains(etag):
+        return '', 304, {'ETag': f'"{etag}"'}
+    response = current_app.response_class(data, mimetype='application/octet-stream')
+    response.set_etag(etag)
+    response.headers['X-Revocation-Version'] = str(version)
+    response.headers['Cache-Control'] = f"public, max-age={current_app.config.get('REVOCATION_MAX_AGE', 60)}"
+    return response
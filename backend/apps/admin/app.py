@@ -1,7 +1,15 @@
 from flask import Flask, render_template_string, request, session, redirect
+from backend.app.health import init_health
+from backend.app.logconfig import init_logging
+from backend.app.tracing import init_tracing
+from backend.app.metrics import init_metrics
 
 app = Flask(__name__)
 app.secret_key = 'admin-app-secret'
+init_logging(app, 'admin')
+init_tracing(app, 'admin')
+init_metrics(app, 'admin')
+init_health(app, 'admin')
 
 @app.route('/')
 def admin_home():
@@ -1,15 +1,24 @@
 #!/usr/bin/env python3
+import logging
 import sys
 import os
 sys.path.insert(0, '/home/michal/NanoTrace')
 
 from flask import Flask, render_template_string, request, redirect, flash, session
+from backend.app.health import init_health
+from backend.app.logconfig import init_logging
+from backend.app.tracing import init_tracing
+from backend.app.metrics import init_metrics
 import uuid
 from datetime import datetime, timedelta
 
 def create_app():
     app = Flask(__name__)
     app.secret_key = 'cert-app-secret-key'
+    init_logging(app, 'cert')
+    init_tracing(app, 'cert')
+    init_metrics(app, 'cert')
+    init_health(app, 'cert')
     
     @app.route('/')
     def cert_home():
@@ -301,5 +310,5 @@ def create_app():
 
 if __name__ == '__main__':
     app = create_app()
-    print("Starting NanoTrace Cert Service on port 8004...")
+    logging.getLogger('nanotrace.cert').info("Starting NanoTrace Cert Service on port %d", 8004)
     app.run(host='127.0.0.1', port=8004, debug=False)
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import logging
 import sys
 import os
 
@@ -6,10 +7,18 @@ import os
 sys.path.insert(0, '/home/michal/NanoTrace')
 
 from flask import Flask, render_template_string
+from backend.app.health import init_health
+from backend.app.logconfig import init_logging
+from backend.app.tracing import init_tracing
+from backend.app.metrics import init_metrics
 
 def create_app():
     app = Flask(__name__)
     app.secret_key = 'main-app-secret-key'
+    init_logging(app, 'main')
+    init_tracing(app, 'main')
+    init_metrics(app, 'main')
+    init_health(app, 'main')
     
     @app.route('/')
     def home():
@@ -80,5 +89,5 @@ def create_app():
 
 if __name__ == '__main__':
     app = create_app()
-    print("Starting NanoTrace Main Service on port 8000...")
+    logging.getLogger('nanotrace.main').info("Starting NanoTrace Main Service on port %d", 8001)
     app.run(host='127.0.0.1', port=8001, debug=False)
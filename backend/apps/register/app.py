@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
+import logging
 import sys
 import os
 sys.path.insert(0, '/home/michal/NanoTrace')
 
 from flask import Flask, render_template_string, request, redirect, flash, session
+from backend.app.health import init_health
+from backend.app.logconfig import init_logging
+from backend.app.tracing import init_tracing
+from backend.app.metrics import init_metrics
 
 def create_app():
     app = Flask(__name__)
     app.secret_key = 'register-app-secret-key'
+    init_logging(app, 'register')
+    init_tracing(app, 'register')
+    init_metrics(app, 'register')
+    init_health(app, 'register')
     
     @app.route('/')
     def register_home():
@@ -117,5 +126,5 @@ def create_app():
 
 if __name__ == '__main__':
     app = create_app()
-    print("Starting NanoTrace Register Service on port 8001...")
+    logging.getLogger('nanotrace.register').info("Starting NanoTrace Register Service on port %d", 8001)
     app.run(host='127.0.0.1', port=8001, debug=False)
@@ -1,14 +1,29 @@
 #!/usr/bin/env python3
+import logging
 import sys
 import os
 sys.path.insert(0, '/home/michal/NanoTrace')
 
 from flask import Flask, render_template_string, request, redirect
+from werkzeug.middleware.proxy_fix import ProxyFix
+from backend.config.config import Config
+from backend.app.health import init_health
+from backend.app.logconfig import init_logging
+from backend.app.tracing import init_tracing
+from backend.app.metrics import init_metrics
+from backend.app.ratelimit import rate_limit
 import json
 
 def create_app():
     app = Flask(__name__)
-    app.secret_key = 'verify-app-secret-key'
+    # behind Nginx: real client IP for @rate_limit and the /metrics allowlist
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=0)
+    # RATELIMIT_* and REDIS_URL as in the main app, so limits are shared across workers
+    app.config.from_object(Config)
+    init_logging(app, 'verify')
+    init_tracing(app, 'verify')
+    init_metrics(app, 'verify')
+    init_health(app, 'verify')
     
     @app.route('/')
     def verify_home():
@@ -68,6 +83,7 @@ def create_app():
         ''')
 
     @app.route('/verify')
+    @rate_limit('RATELIMIT_VERIFY')
     def verify_cert():
         cert_id = request.args.get('cert_id', '').strip()
         
@@ -160,5 +176,5 @@ def create_app():
 
 if __name__ == '__main__':
     app = create_app()
-    print("Starting NanoTrace Verify Service on port 8002...")
+    logging.getLogger('nanotrace.verify').info("Starting NanoTrace Verify Service on port %d", 8002)
     app.run(host='127.0.0.1', port=8002, debug=False)
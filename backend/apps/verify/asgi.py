@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# backend/apps/verify/asgi.py
+# The verify page and API on Starlette + asyncpg for scan bursts, with identical in-flight
+# lookups coalesced; everything else falls through to the Flask verify app.
+#
+#     python3 backend/apps/verify/asgi.py          # uvicorn, VERIFY_WORKERS processes
+#     uvicorn backend.apps.verify.asgi:app --workers 4 --proxy-headers --port 8002
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import re
+import sys
+import time
+import zlib
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, '/home/michal/NanoTrace')
+
+import asyncpg
+from jinja2 import Environment
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
+from starlette.routing import Mount, Route
+
+from backend.app.assets import asset_url
+from backend.app.certids import canonical_public_id, issued_at, parse_public_id
+from backend.app.idfilter import might_exist
+from backend.app.logconfig import VERIFY_ACCESS_LOGGER, bind_request_id, setup_logging, unbind_request_id
+from backend.app.metrics import REQUEST_LATENCY
+from backend.app.models.certificate import public_certificate_dict
+from backend.app.models.certificate_archive import PAYLOAD_FIELDS
+from backend.app.ratelimit import acquire
+from backend.app.singleflight import AsyncSingleFlight
+from backend.app.tracing import CLIENT, finish_server_span, setup_tracing, span, start_server_span, traceparent
+from backend.app.views.certificates import NOT_FOUND_TEMPLATE, VERIFY_TEMPLATE
+from backend.apps.verify.app import create_app as create_wsgi_app
+from backend.config.config import Config
+
+_COLUMNS = (
+    'certificate_id, status, product_name, material_type, supplier, concentration, '
+    'particle_size, msds_link, created_at, approved_at, rejected_at, expires_at'
+)
+# created_at bounds let PostgreSQL prune to the partition the UUIDv7 was issued in
+_HOT_SQL_BOUNDED = f'SELECT {_COLUMNS} FROM certificates WHERE uid = $1 AND created_at >= $2 AND created_at < $3'
+_HOT_SQL = f'SELECT {_COLUMNS} FROM certificates WHERE uid = $1'
+_ARCHIVE_SQL = (
+    'SELECT certificate_id, status, created_at, archived_at, payload FROM certificates_archive WHERE uid = $1'
+)
+
+# the Flask templates call url_for(); on verify.* both targets are the search page
+_URLS = {'main.index': '/', 'certificates.verify_form': '/'}
+_templates = Environment(autoescape=True)
+_templates.globals['url_for'] = lambda endpoint, **_: _URLS.get(endpoint, '/')
+_templates.globals['asset_url'] = asset_url
+_verify_page = _templates.from_string(VERIFY_TEMPLATE)
+_not_found_page = _templates.from_string(NOT_FOUND_TEMPLATE)
+
+
+_lookups = AsyncSingleFlight('asgi_verify_lookup')
+_responses = AsyncSingleFlight('asgi_verify_render')
+
+
+def _dsn():
+    return re.sub(r'^postgres(ql)?(\+\w+)?://', 'postgresql://', Config.SQLALCHEMY_DATABASE_URI)
+
+
+async def _fetch(pool, public_id):
+    """Certificate attributes for a canonical public ID (hot table, then archive), or None."""
+    uid = parse_public_id(public_id)
+    async with pool.acquire() as conn:
+        if uid.version == 7:
+            issued = issued_at(uid).replace(tzinfo=None)
+            with span('db.query', CLIENT, **{'db.system': 'postgresql', 'db.statement': _HOT_SQL_BOUNDED}):
+                row = await conn.fetchrow(_HOT_SQL_BOUNDED, uid, issued - timedelta(days=1), issued + timedelta(days=1))
+        else:
+            with span('db.query', CLIENT, **{'db.system': 'postgresql', 'db.statement': _HOT_SQL}):
+                row = await conn.fetchrow(_HOT_SQL, uid)
+        if row is not None:
+            return SimpleNamespace(archived_at=None, **dict(row))
+
+        with span('db.query', CLIENT, **{'db.system': 'postgresql', 'db.statement': _ARCHIVE_SQL}):
+            row = await conn.fetchrow(_ARCHIVE_SQL, uid)
+    if row is None:
+        return None
+    data = json.loads(zlib.decompress(row['payload']))
+    for field in ('approved_at', 'rejected_at', 'expires_at'):
+        if data.get(field):
+            data[field] = datetime.fromisoformat(data[field])
+    fields = {field: data.get(field) for field in PAYLOAD_FIELDS}
+    return SimpleNamespace(
+        certificate_id=row['certificate_id'],
+        status=row['status'],
+        created_at=row['created_at'],
+        archived_at=row['archived_at'],
+        **fields,
+    )
+
+
+def _known(flask_app, public_id):
+    # the filter reads its geometry and REDIS_URL from app config; the verify app has no
+    # certificate tables, so a missing filter is left for the main app to rebuild
+    with flask_app.app_context():
+        return might_exist(public_id, rebuild=False)
+
+
+def _check_limits(identity):
+    """Same buckets as the Flask views: per-client verify budget plus the 404 budget."""
+    allowed, wait = acquire(f'rl:certificates.verify:{identity}', Config.RATELIMIT_VERIFY)
+    if allowed:
+        allowed, wait = acquire(f'rl:certificates.verify:miss:{identity}', Config.RATELIMIT_VERIFY_MISSES, cost=0)
+    return allowed, wait
+
+
+def _charge_miss(identity):
+    acquire(f'rl:certificates.verify:miss:{identity}', Config.RATELIMIT_VERIFY_MISSES)
+
+
+async def _respond(request, kind):
+    identity = request.client.host if request.client else 'unknown'
+    if Config.RATELIMIT_ENABLED:
+        allowed, wait = await run_in_threadpool(_check_limits, identity)
+        if not allowed:
+            return Response('Too Many Requests', status_code=429, headers={'Retry-After': str(max(1, int(wait + 0.999)))})
+
+    raw_id = request.path_params['certificate_id']
+    public_id = canonical_public_id(raw_id)
+
+    async def render():
+        cert = None
+        # malformed / bad check digit, then Bloom filter: unknown IDs never reach Postgres
+        if public_id is not None and await run_in_threadpool(_known, request.app.state.flask, public_id):
+            cert = await _lookups.do(public_id, lambda: _fetch(request.app.state.pool, public_id))
+        if kind == 'json':
+            if cert is None:
+                return 404, json.dumps({'error': 'not_found', 'certificate_id': raw_id})
+            return 200, json.dumps(public_certificate_dict(cert))
+        if cert is None:
+            return 404, _not_found_page.render()
+        return 200, _verify_page.render(cert=cert)
+
+    # key on the raw ID for misses so distinct garbage IDs don't share a 404 body
+    status, body = await _responses.do((kind, public_id or raw_id), render)
+    if status == 404 and Config.RATELIMIT_ENABLED:
+        await run_in_threadpool(_charge_miss, identity)
+    if kind == 'json':
+        return Response(body, status_code=status, media_type='application/json')
+    return HTMLResponse(body, status_code=status)
+
+
+async def verify(request):
+    return await _respond(request, 'html')
+
+
+async def verify_api(request):
+    return await _respond(request, 'json')
+
+
+async def verify_lookup(request):
+    cert_id = request.query_params.get('cert_id', '').strip()
+    if not cert_id:
+        return RedirectResponse('/', status_code=302)
+    public_id = canonical_public_id(cert_id) or cert_id
+    return RedirectResponse(f'/certificate/verify/{public_id}', status_code=302)
+
+
+async def readyz(request):
+    try:
+        await asyncio.wait_for(request.app.state.pool.fetchval('SELECT 1'), timeout=Config.HEALTH_PROBE_TIMEOUT)
+    except Exception as exc:
+        return JSONResponse({'status': 'unavailable', 'error': str(exc)}, status_code=503)
+    return JSONResponse({'status': 'ok', 'service': 'verify'})
+
+
+_access_log = logging.getLogger(VERIFY_ACCESS_LOGGER)
+
+
+class MetricsMiddleware:
+    """Latency, request IDs, trace spans and (sampled) access logs for the async routes.
+
+    Mounted Flask routes get the same from init_metrics / init_logging / init_tracing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = [500]
+        incoming = dict(scope['headers'])
+        request_id, token = bind_request_id(incoming.get(b'x-request-id', b'').decode('latin-1'))
+        trace_span, trace_token = start_server_span(
+            f"{scope['method']} wsgi", incoming.get(b'traceparent', b'').decode('latin-1'),
+            **{'http.method': scope['method'], 'http.target': scope['path']},
+        )
+        # the mounted Flask app reads the same request ID, and continues this trace
+        headers = [(k, v) for k, v in scope['headers'] if k not in (b'x-request-id', b'traceparent')]
+        headers.append((b'x-request-id', request_id.encode('latin-1')))
+        if traceparent():
+            headers.append((b'traceparent', traceparent().encode('latin-1')))
+        scope = dict(scope, headers=headers)
+
+        async def send_with_status(message):
+            if message['type'] == 'http.response.start':
+                status[0] = message['status']
+                response_headers = list(message.get('headers', []))
+                if not any(k.lower() == b'x-request-id' for k, _ in response_headers):
+                    response_headers.append((b'x-request-id', request_id.encode('latin-1')))
+                message['headers'] = response_headers
+            await send(message)
+
+        exc = None
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as e:
+            exc = e
+            raise
+        finally:
+            endpoint = scope.get('endpoint')
+            if trace_span is not None and inspect.isfunction(endpoint):
+                # name by route, not path, so traces group per endpoint
+                trace_span.name = f"{scope['method']} asgi.{endpoint.__name__}"
+            if inspect.isfunction(endpoint):
+                elapsed = time.perf_counter() - start
+                REQUEST_LATENCY.labels(
+                    service='verify',
+                    endpoint=f'asgi.{endpoint.__name__}',
+                    method=scope['method'],
+                    status=status[0],
+                ).observe(elapsed)
+            if inspect.isfunction(endpoint) and endpoint.__name__ != 'readyz':
+                _access_log.log(
+                    logging.ERROR if status[0] >= 500 else logging.INFO,
+                    '%s %s %s', scope['method'], scope['path'], status[0],
+                    extra={
+                        'method': scope['method'],
+                        'path': scope['path'],
+                        'endpoint': f'asgi.{endpoint.__name__}',
+                        'status': status[0],
+                        'duration_ms': round(elapsed * 1000, 2),
+                    },
+                )
+            finish_server_span(trace_span, trace_token, status=status[0], exc=exc)
+            unbind_request_id(token)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    app.state.pool = await asyncpg.create_pool(
+        _dsn(),
+        min_size=Config.VERIFY_DB_POOL_MIN,
+        max_size=Config.VERIFY_DB_POOL_MAX,
+        statement_cache_size=Config.VERIFY_DB_STATEMENT_CACHE,
+        command_timeout=5,
+    )
+    try:
+        yield
+    finally:
+        await app.state.pool.close()
+
+
+def create_app(wsgi_app=None):
+    setup_logging('verify')
+    setup_tracing('verify')
+    wsgi_app = wsgi_app or create_wsgi_app()
+    routes = [
+        Route('/certificate/verify/{certificate_id}', verify),
+        Route('/certificate/api/verify/{certificate_id}', verify_api),
+        Route('/verify', verify_lookup),
+        Route('/readyz', readyz),
+        Mount('/', app=WSGIMiddleware(wsgi_app)),
+    ]
+    app = Starlette(routes=routes, lifespan=lifespan)
+    app.state.flask = wsgi_app
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+app = create_app()
+
+if __name__ == '__main__':
+    import uvicorn
+
+    logging.getLogger('nanotrace.verify').info("Starting NanoTrace async Verify Service on port %d", 8002)
+    uvicorn.run(
+        'backend.apps.verify.asgi:app',
+        host='127.0.0.1',
+        port=8002,
+        workers=int(os.environ.get('VERIFY_WORKERS', 2)),
+        proxy_headers=True,
+        forwarded_allow_ips='127.0.0.1',
+        # keep the root JSON handler (setup_logging); MetricsMiddleware writes access logs
+        log_config=None,
+        access_log=False,
+    )
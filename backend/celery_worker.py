@@ -0,0 +1,13 @@
+# backend/celery_worker.py
+#
+#     celery -A backend.celery_worker worker -B --loglevel=info
+
+from backend.app import create_app
+from backend.app.logconfig import setup_logging
+from backend.app.slowqueries import setup_slow_queries
+
+# before create_app, so worker records are tagged service=worker rather than main
+setup_logging('worker')
+setup_slow_queries('worker')
+flask_app = create_app()
+celery = flask_app.extensions['celery']
@@ -32,6 +32,121 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER')
+    # outgoing mail goes through the email_outbox table (backend/app/outbox.py)
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 50))
+    OUTBOX_DOMAIN_LIMIT = os.environ.get('OUTBOX_DOMAIN_LIMIT', '60/minute')
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 8))
+    OUTBOX_RETRY_BASE = int(os.environ.get('OUTBOX_RETRY_BASE', 30))
+    OUTBOX_RETRY_MAX = int(os.environ.get('OUTBOX_RETRY_MAX', 3600))
+    # absolute base for links in emails (no request context in the worker)
+    PUBLIC_CERT_URL = os.environ.get('PUBLIC_CERT_URL', 'https://cert.nanotrace.org')
+    PUBLIC_AUTH_URL = os.environ.get('PUBLIC_AUTH_URL', 'https://auth.nanotrace.org/auth')
+
+    # Static verify snapshots of approved certificates, served by Nginx (backend/app/snapshots.py).
+    # Empty disables them. Set it in .env so web workers, the Celery worker and the CLI all
+    # keep the files in step.
+    SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', '')
+
+    # Certificate expiry (backend/app/expiry.py): validity granted on approval, and how
+    # often / in what batches the beat job expires due certificates
+    CERT_VALIDITY_DAYS = int(os.environ.get('CERT_VALIDITY_DAYS', 730))
+    CERT_EXPIRY_INTERVAL = int(os.environ.get('CERT_EXPIRY_INTERVAL', 300))
+    CERT_EXPIRY_BATCH_SIZE = int(os.environ.get('CERT_EXPIRY_BATCH_SIZE', 1000))
+
+    # Admin bulk approve/reject (backend/app/review.py): most certificates per request
+    BULK_DECISION_MAX = int(os.environ.get('BULK_DECISION_MAX', 500))
+    # Review queue: certificates handed out per claim, and how long a claim holds them
+    REVIEW_BATCH_SIZE = int(os.environ.get('REVIEW_BATCH_SIZE', 20))
+    REVIEW_LEASE_SECONDS = int(os.environ.get('REVIEW_LEASE_SECONDS', 600))
+
+    # Offline-verifiable certificate tokens (backend/app/certtokens.py). Signing is off
+    # without a key file; CERT_TRUSTED_KEYS lists retired public keys (base64url, comma
+    # separated) whose tokens should still verify.
+    CERT_SIGNING_KEY_FILE = os.environ.get('CERT_SIGNING_KEY_FILE', '')
+    CERT_TRUSTED_KEYS = os.environ.get('CERT_TRUSTED_KEYS', '')
+    CERT_TOKEN_TTL_DAYS = int(os.environ.get('CERT_TOKEN_TTL_DAYS', 365))
+    # Revocation list for offline verifiers (backend/app/revocations.py): clients further
+    # behind than REVOCATION_DIFF_MAX versions get a full snapshot instead of a diff
+    REVOCATION_DIFF_MAX = int(os.environ.get('REVOCATION_DIFF_MAX', 10000))
+    REVOCATION_MAX_AGE = int(os.environ.get('REVOCATION_MAX_AGE', 60))
+
+    # Email verification links: signed, stateless, valid for EMAIL_VERIFY_MAX_AGE seconds.
+    # One secret for every service, since the link may be confirmed by a different app
+    # than the one that issued it.
+    EMAIL_TOKEN_SECRET = os.environ.get('EMAIL_TOKEN_SECRET', SECRET_KEY)
+    EMAIL_VERIFY_MAX_AGE = int(os.environ.get('EMAIL_VERIFY_MAX_AGE', 2 * 24 * 3600))
+
+    # Redis (shared by caches, rate limiting and Celery)
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', REDIS_URL)
+
+    # Metrics: /metrics is only answered for these client addresses
+    METRICS_ALLOWED_IPS = os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1')
+    METRICS_QUEUES = os.environ.get('METRICS_QUEUES', 'celery')
+
+    # Logging (backend/app/logconfig.py): JSON lines to stdout, or to LOG_DIR/<service>.log
+    # rotated at LOG_MAX_BYTES; LOG_VERIFY_SAMPLE_RATE of verify access logs are kept
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_DIR = os.environ.get('LOG_DIR', '')
+    LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', 50 * 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', 10))
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+    LOG_ACCESS = os.environ.get('LOG_ACCESS', 'True').lower() == 'true'
+    LOG_VERIFY_SAMPLE_RATE = float(os.environ.get('LOG_VERIFY_SAMPLE_RATE', 0.05))
+
+    # Tracing (backend/app/tracing.py): off unless spans have somewhere to go; then
+    # TRACE_SAMPLE_RATE of the traces started here are recorded (OTLP/JSON)
+    TRACE_EXPORT_FILE = os.environ.get('TRACE_EXPORT_FILE', '')
+    TRACE_OTLP_ENDPOINT = os.environ.get('TRACE_OTLP_ENDPOINT', '')  # e.g. http://127.0.0.1:4318/v1/traces
+    TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', 0.01))
+    TRACE_QUEUE_SIZE = int(os.environ.get('TRACE_QUEUE_SIZE', 4096))
+
+    # Sampling profiler (backend/app/profiler.py): admin-only, off unless enabled
+    PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', 'False').lower() == 'true'
+    PROFILER_DIR = os.environ.get('PROFILER_DIR', '')  # default: <tmp>/nanotrace-profiles
+    PROFILER_MAX_SECONDS = int(os.environ.get('PROFILER_MAX_SECONDS', 60))
+    PROFILER_INTERVAL = float(os.environ.get('PROFILER_INTERVAL', 0.005))
+
+    # Slow-query log (backend/app/slowqueries.py): statements at or over SLOW_QUERY_MS
+    # (0 = off) are logged and aggregated at /admin/system/queries; SLOW_QUERY_EXPLAIN_RATE
+    # of slow SELECTs get an EXPLAIN (ANALYZE, BUFFERS), at most one per shape per interval
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 250))
+    SLOW_QUERY_EXPLAIN_RATE = float(os.environ.get('SLOW_QUERY_EXPLAIN_RATE', 0.1))
+    SLOW_QUERY_EXPLAIN_INTERVAL = int(os.environ.get('SLOW_QUERY_EXPLAIN_INTERVAL', 300))
+    SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.environ.get('SLOW_QUERY_EXPLAIN_TIMEOUT_MS', 5000))
+    SLOW_QUERY_MAX_ENTRIES = int(os.environ.get('SLOW_QUERY_MAX_ENTRIES', 200))
+
+    # Health checks (/livez, /readyz)
+    FABRIC_PEER_ADDRESS = os.environ.get('FABRIC_PEER_ADDRESS', 'localhost:7051')
+    HEALTH_CACHE_TTL = float(os.environ.get('HEALTH_CACHE_TTL', 5))
+    HEALTH_PROBE_TIMEOUT = float(os.environ.get('HEALTH_PROBE_TIMEOUT', 1))
+    HEALTH_OPTIONAL_DEPENDENCIES = os.environ.get('HEALTH_OPTIONAL_DEPENDENCIES', 'fabric')
+
+    # Rate limiting ("<count>/<second|minute|hour|day>", per client per route)
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'True').lower() == 'true'
+    RATELIMIT_VERIFY = os.environ.get('RATELIMIT_VERIFY', '120/minute')
+    RATELIMIT_VERIFY_MISSES = os.environ.get('RATELIMIT_VERIFY_MISSES', '20/minute')
+    RATELIMIT_LOGIN = os.environ.get('RATELIMIT_LOGIN', '10/minute')
+
+    # Certificate ID Bloom filter (Redis bitmap, rebuilt when missing or expired)
+    ID_FILTER_CAPACITY = int(os.environ.get('ID_FILTER_CAPACITY', 1_000_000))
+    ID_FILTER_ERROR_RATE = float(os.environ.get('ID_FILTER_ERROR_RATE', 0.001))
+    ID_FILTER_TTL = int(os.environ.get('ID_FILTER_TTL', 3600))
+
+    # Request coalescing for verify lookups (backend/app/singleflight.py)
+    SINGLEFLIGHT_SHARED = os.environ.get('SINGLEFLIGHT_SHARED', 'False').lower() == 'true'
+    SINGLEFLIGHT_WAIT = float(os.environ.get('SINGLEFLIGHT_WAIT', 2.0))
+    SINGLEFLIGHT_RESULT_TTL_MS = int(os.environ.get('SINGLEFLIGHT_RESULT_TTL_MS', 500))
+
+    # Async verify service (backend/apps/verify/asgi.py): asyncpg pool per worker process
+    VERIFY_DB_POOL_MIN = int(os.environ.get('VERIFY_DB_POOL_MIN', 2))
+    VERIFY_DB_POOL_MAX = int(os.environ.get('VERIFY_DB_POOL_MAX', 20))
+    # set to 0 behind PgBouncer in transaction mode (no server-side prepared statements)
+    VERIFY_DB_STATEMENT_CACHE = int(os.environ.get('VERIFY_DB_STATEMENT_CACHE', 100))
+
+    # Cold storage: rejected certificates older than this move to certificates_archive
+    ARCHIVE_REJECTED_AFTER_DAYS = int(os.environ.get('ARCHIVE_REJECTED_AFTER_DAYS', 180))
+    ARCHIVE_EXPIRED_AFTER_DAYS = int(os.environ.get('ARCHIVE_EXPIRED_AFTER_DAYS', 365))
 
 class DevelopmentConfig(Config):
     DEBUG = True
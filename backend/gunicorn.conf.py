@@ -0,0 +1,11 @@
+# backend/gunicorn.conf.py
+# Picked up automatically when gunicorn is started from backend/ (see the systemd units).
+
+import os
+
+
+def child_exit(server, worker):
+    # drop the dead worker's live gauges from the aggregated /metrics output
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
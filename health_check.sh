@@ -29,3 +29,15 @@ for endpoint in "http://127.0.0.1:8000/" "http://127.0.0.1:8002/"; do
         echo "   ❌ $endpoint: HTTP $response"
     fi
 done
+
+echo "🩺 Readiness:"
+for port in 8001 8002 8003 8004; do
+    body=$(curl -s "http://127.0.0.1:$port/readyz" 2>/dev/null)
+    if [ -z "$body" ]; then
+        echo "   ❌ Port $port: no response"
+    elif echo "$body" | grep -q '"status": *"ok"'; then
+        echo "   ✅ Port $port: ready"
+    else
+        echo "   ⚠️  Port $port: not ready - $body"
+    fi
+done
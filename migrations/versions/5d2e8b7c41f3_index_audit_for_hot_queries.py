@@ -0,0 +1,96 @@
+"""Index audit for hot queries, native certificate status enum
+
+Revision ID: 5d2e8b7c41f3
+Revises: a67fc5acd001
+Create Date: 2026-10-19 11:03:27.904116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8b7c41f3'
+down_revision = 'a67fc5acd001'
+branch_labels = None
+depends_on = None
+
+STATUSES = ('pending', 'approved', 'rejected')
+
+# (name, table, columns, partial predicate)
+INDEXES = [
+    ('ix_certificates_user_id_created_at', 'certificates', ['user_id', 'created_at'], None),
+    ('ix_certificates_status_created_at', 'certificates', ['status', 'created_at'], None),
+    ('ix_certificates_created_at', 'certificates', ['created_at'], None),
+    ('ix_certificates_pending_created_at', 'certificates', ['created_at'], "status = 'pending'"),
+    ('ix_user_created_at', 'user', ['created_at'], None),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    is_pg = bind.dialect.name == 'postgresql'
+
+    # status: free-form VARCHAR(20) -> native enum (rewrites the table, so do it before
+    # building the new indexes)
+    if is_pg:
+        certificate_status = postgresql.ENUM(*STATUSES, name='certificate_status')
+        certificate_status.create(bind, checkfirst=True)
+        op.alter_column(
+            'certificates', 'status',
+            existing_type=sa.String(length=20),
+            type_=certificate_status,
+            existing_nullable=False,
+            postgresql_using='status::certificate_status',
+        )
+    else:
+        with op.batch_alter_table('certificates', schema=None) as batch_op:
+            batch_op.alter_column(
+                'status',
+                existing_type=sa.String(length=20),
+                type_=sa.Enum(*STATUSES, name='certificate_status'),
+                existing_nullable=False,
+            )
+
+    if is_pg:
+        # CONCURRENTLY keeps the tables writable while the indexes build
+        with op.get_context().autocommit_block():
+            for name, table, columns, where in INDEXES:
+                op.create_index(
+                    name, table, columns,
+                    postgresql_concurrently=True,
+                    postgresql_where=sa.text(where) if where else None,
+                    if_not_exists=True,
+                )
+            op.execute('ANALYZE certificates')
+            op.execute('ANALYZE "user"')
+    else:
+        for name, table, columns, where in INDEXES:
+            op.create_index(name, table, columns, sqlite_where=sa.text(where) if where else None)
+
+
+def downgrade():
+    bind = op.get_bind()
+    is_pg = bind.dialect.name == 'postgresql'
+
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+
+    if is_pg:
+        op.alter_column(
+            'certificates', 'status',
+            existing_type=postgresql.ENUM(*STATUSES, name='certificate_status'),
+            type_=sa.String(length=20),
+            existing_nullable=False,
+            postgresql_using='status::text',
+        )
+        postgresql.ENUM(name='certificate_status').drop(bind, checkfirst=True)
+    else:
+        with op.batch_alter_table('certificates', schema=None) as batch_op:
+            batch_op.alter_column(
+                'status',
+                existing_type=sa.Enum(*STATUSES, name='certificate_status'),
+                type_=sa.String(length=20),
+                existing_nullable=False,
+            )
@@ -0,0 +1,152 @@
+"""Range-partition certificates by created_at month
+
+Revision ID: 7c3f9a2e5b18
+Revises: 5d2e8b7c41f3
+Create Date: 2026-10-19 12:20:54.337190
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3f9a2e5b18'
+down_revision = '5d2e8b7c41f3'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+# same indexes as 5d2e8b7c41f3; on a partitioned table they cascade to every partition
+INDEXES = [
+    ('ix_certificates_user_id_created_at', ['user_id', 'created_at'], None),
+    ('ix_certificates_status_created_at', ['status', 'created_at'], None),
+    ('ix_certificates_created_at', ['created_at'], None),
+    ('ix_certificates_pending_created_at', ['created_at'], "status = 'pending'"),
+]
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+# Every uid / certificate_id ever issued, one row each. The partitioned table can only
+# enforce UNIQUE (uid, created_at), which lets a legacy uuid4 row or a row with an
+# explicit created_at share its ID with another month; this table keeps them unique
+# across all partitions. Rows are never deleted, so archived IDs stay taken.
+RESERVE_FUNCTION = """
+CREATE FUNCTION certificates_reserve_public_id() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO certificate_public_ids (uid, certificate_id) VALUES (NEW.uid, NEW.certificate_id);
+    ELSIF NEW.uid IS DISTINCT FROM OLD.uid OR NEW.certificate_id IS DISTINCT FROM OLD.certificate_id THEN
+        UPDATE certificate_public_ids SET uid = NEW.uid, certificate_id = NEW.certificate_id
+        WHERE uid = OLD.uid;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def _copy_indexes():
+    for name, columns, where in INDEXES:
+        op.create_index(name, 'certificates', columns, postgresql_where=sa.text(where) if where else None)
+
+
+def _drop_public_ids():
+    op.execute('DROP TRIGGER IF EXISTS certificates_reserve_public_id ON certificates')
+    op.execute('DROP FUNCTION IF EXISTS certificates_reserve_public_id()')
+    op.execute('DROP TABLE IF EXISTS certificate_public_ids')
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # SQLite and friends keep the plain table
+        return
+
+    # Takes an exclusive lock for the duration of the copy; run in a maintenance window.
+    op.execute('ALTER TABLE certificates RENAME TO certificates_unpartitioned')
+    for name, _, _ in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute(
+        'CREATE TABLE certificates (LIKE certificates_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        'PARTITION BY RANGE (created_at)'
+    )
+
+    oldest = bind.execute(sa.text('SELECT min(created_at) FROM certificates_unpartitioned')).scalar()
+    today = date.today()
+    month = date((oldest or today).year, (oldest or today).month, 1)
+    last = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f'CREATE TABLE certificates_y{month.year:04d}m{month.month:02d} PARTITION OF certificates '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    op.execute('CREATE TABLE certificates_default PARTITION OF certificates DEFAULT')
+
+    op.execute('INSERT INTO certificates SELECT * FROM certificates_unpartitioned')
+    # the id sequence belongs to the old table's column and would be dropped with it
+    op.execute('ALTER SEQUENCE certificates_id_seq OWNED BY certificates.id')
+    op.execute('DROP TABLE certificates_unpartitioned')
+
+    # unique keys on a partitioned table must contain the partition key; global
+    # uniqueness of uid and certificate_id comes from certificate_public_ids below
+    op.execute('ALTER TABLE certificates ADD CONSTRAINT certificates_pkey PRIMARY KEY (id, created_at)')
+    op.execute('ALTER TABLE certificates ADD CONSTRAINT certificates_uid_created_at_key UNIQUE (uid, created_at)')
+    op.execute(
+        'ALTER TABLE certificates ADD CONSTRAINT certificates_certificate_id_created_at_key '
+        'UNIQUE (certificate_id, created_at)'
+    )
+    op.execute(
+        'ALTER TABLE certificates ADD CONSTRAINT certificates_user_id_fkey '
+        'FOREIGN KEY (user_id) REFERENCES "user" (id)'
+    )
+
+    op.create_table(
+        'certificate_public_ids',
+        sa.Column('uid', sa.Uuid(), primary_key=True),
+        sa.Column('certificate_id', sa.String(length=64), nullable=False, unique=True),
+    )
+    op.execute('INSERT INTO certificate_public_ids (uid, certificate_id) SELECT uid, certificate_id FROM certificates')
+    op.execute(RESERVE_FUNCTION)
+    op.execute(
+        'CREATE TRIGGER certificates_reserve_public_id AFTER INSERT OR UPDATE OF uid, certificate_id '
+        'ON certificates FOR EACH ROW EXECUTE FUNCTION certificates_reserve_public_id()'
+    )
+
+    # indexes are built after the copy: one sorted build per partition instead of
+    # row-by-row maintenance
+    _copy_indexes()
+    op.execute('ANALYZE certificates')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    _drop_public_ids()
+    op.execute('ALTER TABLE certificates RENAME TO certificates_partitioned')
+    for name, _, _ in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+    op.execute(
+        'CREATE TABLE certificates (LIKE certificates_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    )
+    op.execute('INSERT INTO certificates SELECT * FROM certificates_partitioned')
+    op.execute('ALTER SEQUENCE certificates_id_seq OWNED BY certificates.id')
+    op.execute('DROP TABLE certificates_partitioned CASCADE')
+
+    op.execute('ALTER TABLE certificates ADD CONSTRAINT certificates_pkey PRIMARY KEY (id)')
+    op.execute('ALTER TABLE certificates ADD CONSTRAINT certificates_uid_key UNIQUE (uid)')
+    op.execute('ALTER TABLE certificates ADD CONSTRAINT certificates_certificate_id_key UNIQUE (certificate_id)')
+    op.execute(
+        'ALTER TABLE certificates ADD CONSTRAINT certificates_user_id_fkey '
+        'FOREIGN KEY (user_id) REFERENCES "user" (id)'
+    )
+    _copy_indexes()
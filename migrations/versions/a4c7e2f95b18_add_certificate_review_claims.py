@@ -0,0 +1,29 @@
+"""Add review queue claims to certificates
+
+Revision ID: a4c7e2f95b18
+Revises: f2a6d3c91e07
+Create Date: 2026-10-19 20:12:37.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c7e2f95b18'
+down_revision = 'f2a6d3c91e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # nullable without defaults: no table rewrite on PostgreSQL
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('claimed_by', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('claim_expires_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.drop_column('claim_expires_at')
+        batch_op.drop_column('claimed_by')
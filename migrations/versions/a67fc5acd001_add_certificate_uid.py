@@ -0,0 +1,45 @@
+"""Add time-ordered certificate uid
+
+Revision ID: a67fc5acd001
+Revises: 435f408fc467
+Create Date: 2026-10-19 10:12:41.518302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a67fc5acd001'
+down_revision = '435f408fc467'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('uid', sa.Uuid(), nullable=True))
+
+    # existing certificates were issued with uuid4 strings; reuse them as their uid so old
+    # QR codes and links keep resolving through the new column
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("UPDATE certificates SET uid = certificate_id::uuid WHERE uid IS NULL")
+    else:
+        import uuid
+        rows = bind.execute(sa.text("SELECT id, certificate_id FROM certificates WHERE uid IS NULL")).fetchall()
+        for row_id, certificate_id in rows:
+            bind.execute(
+                sa.text("UPDATE certificates SET uid = :uid WHERE id = :id"),
+                {'uid': uuid.UUID(certificate_id).hex, 'id': row_id},
+            )
+
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.alter_column('uid', existing_type=sa.Uuid(), nullable=False)
+        batch_op.create_unique_constraint('certificates_uid_key', ['uid'])
+
+
+def downgrade():
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.drop_constraint('certificates_uid_key', type_='unique')
+        batch_op.drop_column('uid')
@@ -0,0 +1,46 @@
+"""Add certificates_archive cold storage table
+
+Revision ID: b81d4e6f2a90
+Revises: 7c3f9a2e5b18
+Create Date: 2026-10-19 13:02:11.870455
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b81d4e6f2a90'
+down_revision = '7c3f9a2e5b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'certificates_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('uid', sa.Uuid(), nullable=False),
+        sa.Column('certificate_id', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('uid'),
+        sa.UniqueConstraint('certificate_id'),
+    )
+    with op.batch_alter_table('certificates_archive', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_certificates_archive_user_id'), ['user_id'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # payload is already zlib-compressed; don't let TOAST try again
+        op.execute('ALTER TABLE certificates_archive ALTER COLUMN payload SET STORAGE EXTERNAL')
+
+
+def downgrade():
+    with op.batch_alter_table('certificates_archive', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_certificates_archive_user_id'))
+
+    op.drop_table('certificates_archive')
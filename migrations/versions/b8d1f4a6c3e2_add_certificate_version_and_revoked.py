@@ -0,0 +1,45 @@
+"""Add certificates.version and the revoked status
+
+Revision ID: b8d1f4a6c3e2
+Revises: a4c7e2f95b18
+Create Date: 2026-10-19 21:03:18.264907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d1f4a6c3e2'
+down_revision = 'a4c7e2f95b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # committed on its own, so the backfill below can use the new value
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE certificate_status ADD VALUE IF NOT EXISTS 'revoked'")
+
+    # constant default: metadata-only on PostgreSQL 11+, no table rewrite
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+    # revocations used to be recorded as 'rejected'; an approved certificate whose last
+    # log entry revokes it was revoked, not rejected
+    op.execute(
+        "UPDATE certificates SET status = 'revoked' "
+        "WHERE status = 'rejected' AND approved_at IS NOT NULL AND certificate_id IN ("
+        "SELECT r.certificate_id FROM certificate_revocations r WHERE r.id = ("
+        "SELECT max(l.id) FROM certificate_revocations l WHERE l.certificate_id = r.certificate_id) "
+        "AND r.revoked)"
+    )
+
+
+def downgrade():
+    # PostgreSQL cannot drop an enum value; revoked certificates go back to rejected
+    op.execute("UPDATE certificates SET status = 'rejected' WHERE status = 'revoked'")
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,45 @@
+"""Add email_outbox table
+
+Revision ID: c4a7e19d3b52
+Revises: b81d4e6f2a90
+Create Date: 2026-10-19 13:41:06.215930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a7e19d3b52'
+down_revision = 'b81d4e6f2a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('recipient', sa.String(length=255), nullable=False),
+        sa.Column('domain', sa.String(length=255), nullable=False),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('body_text', sa.Text(), nullable=False),
+        sa.Column('body_html', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_email_outbox_pending_next_attempt', 'email_outbox', ['next_attempt_at'],
+        postgresql_where=sa.text("status = 'pending'"),
+        sqlite_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_email_outbox_pending_next_attempt', table_name='email_outbox')
+    op.drop_table('email_outbox')
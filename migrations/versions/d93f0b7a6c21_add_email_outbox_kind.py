@@ -0,0 +1,30 @@
+"""Add email_outbox.kind
+
+Revision ID: d93f0b7a6c21
+Revises: c4a7e19d3b52
+Create Date: 2026-10-19 14:18:33.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd93f0b7a6c21'
+down_revision = 'c4a7e19d3b52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('kind', sa.String(length=50), nullable=True))
+        batch_op.create_index(
+            'ix_email_outbox_recipient_kind_created_at', ['recipient', 'kind', 'created_at'], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('email_outbox', schema=None) as batch_op:
+        batch_op.drop_index('ix_email_outbox_recipient_kind_created_at')
+        batch_op.drop_column('kind')
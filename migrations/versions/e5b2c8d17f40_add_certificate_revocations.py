@@ -0,0 +1,36 @@
+"""Add certificate_revocations log
+
+Revision ID: e5b2c8d17f40
+Revises: d93f0b7a6c21
+Create Date: 2026-10-19 17:42:09.118254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b2c8d17f40'
+down_revision = 'd93f0b7a6c21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'certificate_revocations',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+        sa.Column('certificate_id', sa.String(length=64), nullable=False),
+        sa.Column('revoked', sa.Boolean(), nullable=False),
+        sa.Column('reason', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_certificate_revocations_certificate_id', 'certificate_revocations', ['certificate_id'], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_certificate_revocations_certificate_id', table_name='certificate_revocations')
+    op.drop_table('certificate_revocations')
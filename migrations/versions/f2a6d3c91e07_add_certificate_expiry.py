@@ -0,0 +1,55 @@
+"""Add certificates.expires_at and the expired status
+
+Revision ID: f2a6d3c91e07
+Revises: e5b2c8d17f40
+Create Date: 2026-10-19 19:06:51.734420
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6d3c91e07'
+down_revision = 'e5b2c8d17f40'
+branch_labels = None
+depends_on = None
+
+# validity given to certificates approved before expiry existed (CERT_VALIDITY_DAYS default)
+BACKFILL_DAYS = 730
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # ADD VALUE cannot be used in the transaction that adds it; nothing here uses it
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE certificate_status ADD VALUE IF NOT EXISTS 'expired'")
+
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('expires_at', sa.DateTime(), nullable=True))
+
+    if bind.dialect.name == 'postgresql':
+        op.execute(
+            "UPDATE certificates SET expires_at = COALESCE(approved_at, created_at) "
+            f"+ interval '{BACKFILL_DAYS} days' WHERE status = 'approved'"
+        )
+    else:
+        op.execute(
+            "UPDATE certificates SET expires_at = datetime(COALESCE(approved_at, created_at), "
+            f"'+{BACKFILL_DAYS} days') WHERE status = 'approved'"
+        )
+
+    op.create_index(
+        'ix_certificates_approved_expires_at', 'certificates', ['expires_at'],
+        postgresql_where=sa.text("status = 'approved'"),
+        sqlite_where=sa.text("status = 'approved'"),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_certificates_approved_expires_at', table_name='certificates')
+    # PostgreSQL cannot drop an enum value; put expired rows back where they came from
+    op.execute("UPDATE certificates SET status = 'approved' WHERE status = 'expired'")
+    with op.batch_alter_table('certificates', schema=None) as batch_op:
+        batch_op.drop_column('expires_at')
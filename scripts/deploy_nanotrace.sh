@@ -10,6 +10,7 @@ PROJECT_DIR="/home/michal/NanoTrace"
 VENV_DIR="$PROJECT_DIR/venv"
 APP_MODULE="backend.app:create_app()"
 GUNICORN_BIND="127.0.0.1:8000"
+SNAPSHOT_DIR="/var/www/nanotrace/snapshots"
 SYSTEMD_SERVICE="/etc/systemd/system/nanotrace.service"
 DOMAIN="nanotrace.org"
 ADMIN_EMAIL="admin@nanotrace.org"
@@ -48,6 +49,9 @@ with app.app_context():
         print("✓ Admin already exists.")
 EOF
 
+log "Building static assets..."
+"$VENV_DIR/bin/flask" --app "$APP_MODULE" nanotrace assets build
+
 log "Generating systemd service..."
 cat <<SERVICE | sudo tee "$SYSTEMD_SERVICE" > /dev/null
 [Unit]
@@ -67,6 +71,12 @@ RestartSec=3
 WantedBy=multi-user.target
 SERVICE
 
+log "Preparing static verify snapshots..."
+sudo mkdir -p "$SNAPSHOT_DIR"
+sudo chown "$USER" "$SNAPSHOT_DIR"
+# in .env rather than the unit: the Celery worker and the flask CLI update snapshots too
+grep -q '^SNAPSHOT_DIR=' "$PROJECT_DIR/.env" || echo "SNAPSHOT_DIR=$SNAPSHOT_DIR" >> "$PROJECT_DIR/.env"
+
 log "Reloading systemd and enabling service..."
 sudo systemctl daemon-reexec
 sudo systemctl enable --now nanotrace
@@ -74,10 +84,61 @@ sudo systemctl enable --now nanotrace
 log "Configuring NGINX (manual review required)..."
 NGINX_CONF="/etc/nginx/sites-available/$DOMAIN"
 sudo tee "$NGINX_CONF" > /dev/null <<EOF
+# approved certificates verify from pre-rendered files; anything missing goes to the app
+server {
+    listen 80;
+    server_name cert.$DOMAIN;
+    root $SNAPSHOT_DIR;
+
+    location /certificate/verify/ {
+        default_type text/html;
+        add_header Cache-Control "public, max-age=60";
+        try_files \$uri.html @app;
+    }
+
+    location /certificate/api/verify/ {
+        default_type application/json;
+        add_header Cache-Control "public, max-age=60";
+        try_files \$uri.json @app;
+    }
+
+    # fingerprinted assets (flask nanotrace assets build): a name never changes content
+    location /static/dist/ {
+        alias $PROJECT_DIR/backend/app/static/dist/;
+        gzip_static on;
+        gzip_vary on;
+        # brotli_static on;  # with the ngx_brotli module
+        add_header Cache-Control "public, max-age=31536000, immutable";
+        access_log off;
+    }
+
+    location / {
+        try_files /nonexistent @app;
+    }
+
+    location @app {
+        proxy_pass http://$GUNICORN_BIND;
+        proxy_set_header Host \$host;
+        proxy_set_header X-Real-IP \$remote_addr;
+        proxy_set_header X-Forwarded-For \$proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto \$scheme;
+    }
+}
+
 server {
     listen 80;
     server_name $DOMAIN *.${DOMAIN};
 
+    # fingerprinted assets (flask nanotrace assets build): a name never changes content
+    location /static/dist/ {
+        alias $PROJECT_DIR/backend/app/static/dist/;
+        gzip_static on;
+        gzip_vary on;
+        # brotli_static on;  # with the ngx_brotli module
+        add_header Cache-Control "public, max-age=31536000, immutable";
+        access_log off;
+    }
+
     location / {
         proxy_pass http://$GUNICORN_BIND;
         proxy_set_header Host \$host;
@@ -89,6 +150,7 @@ server {
 EOF
 
 sudo ln -sf "$NGINX_CONF" /etc/nginx/sites-enabled/
+(cd "$PROJECT_DIR" && "$VENV_DIR/bin/flask" --app "$APP_MODULE" nanotrace snapshots build)
 sudo nginx -t && sudo systemctl reload nginx
 
 log "Installing SSL certificates via Certbot..."
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Local SMTP sink for development: accepts every message and writes it to disk.
+
+    python3 scripts/smtp_sink.py --port 1025 --dir /tmp/nanotrace-mail
+    MAIL_SERVER=localhost MAIL_PORT=1025 MAIL_USE_TLS=False flask ...
+
+Each message is stored as <dir>/<timestamp>-<n>.eml and its headers are echoed to stdout.
+Speaks just enough SMTP for smtplib/Flask-Mail; no auth, no TLS.
+"""
+import argparse
+import itertools
+import os
+import socketserver
+import time
+
+_counter = itertools.count(1)
+
+
+class SinkHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        self.reply('220 nanotrace-sink ESMTP')
+        mail_from, rcpt_to = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+            if verb == 'EHLO':
+                self.wfile.write(b'250-nanotrace-sink\r\n250 8BITMIME\r\n')
+            elif verb == 'HELO':
+                self.reply('250 nanotrace-sink')
+            elif verb == 'MAIL':
+                mail_from, rcpt_to = command[10:].strip(), []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                rcpt_to.append(command[8:].strip())
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                self.save(mail_from, rcpt_to, self.read_data())
+                self.reply('250 OK: queued')
+            elif verb in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+    def read_data(self):
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line in (b'.\r\n', b'.\n'):
+                break
+            # undo dot-stuffing
+            lines.append(line[1:] if line.startswith(b'..') else line)
+        return b''.join(lines)
+
+    def save(self, mail_from, rcpt_to, data):
+        name = f'{time.strftime("%Y%m%d-%H%M%S")}-{next(_counter)}.eml'
+        with open(os.path.join(self.server.maildir, name), 'wb') as fh:
+            fh.write(data)
+        print(f'{name}: from {mail_from} to {", ".join(rcpt_to)}', flush=True)
+
+
+class SinkServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1025)
+    parser.add_argument('--dir', default='/tmp/nanotrace-mail')
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    with SinkServer((args.host, args.port), SinkHandler) as server:
+        server.maildir = args.dir
+        print(f'SMTP sink on {args.host}:{args.port}, writing to {args.dir}', flush=True)
+        server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
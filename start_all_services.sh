@@ -42,7 +42,7 @@ wait_for_service() {
     log_info "Waiting for $service_name to start on port $port..."
     
     while [ $attempt -le $max_attempts ]; do
-        if curl -s "http://127.0.0.1:$port/healthz" > /dev/null 2>&1; then
+        if curl -sf "http://127.0.0.1:$port/livez" > /dev/null 2>&1; then
             log_success "$service_name is ready!"
             return 0
         fi
@@ -64,8 +64,6 @@ start_service() {
     local service_name=$1
     local port=$2
     local app_path=$3
-    local log_file="$PROJECT_DIR/logs/${service_name}.log"
-    
     log_info "Starting $service_name on port $port..."
     
     # Check if port is available
@@ -80,11 +78,12 @@ start_service() {
         fi
     fi
     
-    # Start the service in background
+    # Start the service in background; it writes rotated JSON logs to $LOG_DIR itself,
+    # stdout/stderr only catch what happens before logging is set up
     cd "$PROJECT_DIR"
     source "$VENV_PATH/bin/activate"
     
-    nohup python3 "$app_path" > "$log_file" 2>&1 &
+    LOG_DIR="$PROJECT_DIR/logs" nohup python3 "$app_path" >> "$PROJECT_DIR/logs/${service_name}.out" 2>&1 &
     local pid=$!
     
     echo "$pid" > "$PROJECT_DIR/pids/${service_name}.pid"
@@ -99,12 +98,24 @@ start_service() {
     fi
 }
 
+# Celery worker + beat (email outbox and other background jobs)
+start_worker() {
+    log_info "Starting background worker..."
+    cd "$PROJECT_DIR"
+    source "$VENV_PATH/bin/activate"
+
+    LOG_DIR="$PROJECT_DIR/logs" nohup celery -A backend.celery_worker worker -B --loglevel=info \
+        >> "$PROJECT_DIR/logs/worker.out" 2>&1 &
+    echo "$!" > "$PROJECT_DIR/pids/worker.pid"
+    log_success "worker started with PID $!"
+}
+
 # Function to stop all services
 stop_all_services() {
     log_section "Stopping All Services"
     
     # Stop services in reverse order
-    for service in admin cert verify main; do
+    for service in worker admin cert verify main; do
         local pid_file="$PROJECT_DIR/pids/${service}.pid"
         if [ -f "$pid_file" ]; then
             local pid=$(cat "$pid_file")
@@ -138,8 +149,10 @@ show_status() {
         if check_port $port; then
             echo -e "${service}: ${RED}Not Running${NC} (port $port available)"
         else
-            if curl -s "http://127.0.0.1:$port/healthz" > /dev/null 2>&1; then
+            if curl -sf "http://127.0.0.1:$port/readyz" > /dev/null 2>&1; then
                 echo -e "${service}: ${GREEN}Running${NC} (port $port)"
+            elif curl -sf "http://127.0.0.1:$port/livez" > /dev/null 2>&1; then
+                echo -e "${service}: ${YELLOW}Degraded${NC} (port $port, see /readyz)"
             else
                 echo -e "${service}: ${YELLOW}Port Busy${NC} (port $port occupied by other process)"
             fi
@@ -163,10 +176,11 @@ main() {
             log_info "Starting all NanoTrace services..."
             
             # Start services in order
-            if start_service "verify" 8002 "backend/apps/verify/app.py"; then
+            if start_service "verify" 8002 "backend/apps/verify/asgi.py"; then
                 if start_service "admin" 8003 "backend/apps/admin/app.py"; then
                     if start_service "cert" 8004 "backend/apps/cert/app.py"; then
                         if start_service "main" 8001 "backend/app.py"; then
+                            start_worker
                             log_section "All Services Started Successfully!"
                             
                             echo ""
@@ -216,12 +230,15 @@ main() {
             
         "logs")
             log_section "Recent Logs"
-            for service in main verify admin cert; do
-                local log_file="$PROJECT_DIR/logs/${service}.log"
-                if [ -f "$log_file" ]; then
-                    echo -e "\n${BLUE}=== $service ===${NC}"
-                    tail -n 5 "$log_file"
-                fi
+            # <service>.log is the JSON log; <service>.out has startup output and crashes
+            # from before logging was set up
+            for service in main verify admin cert worker; do
+                for log_file in "$PROJECT_DIR/logs/${service}.log" "$PROJECT_DIR/logs/${service}.out"; do
+                    if [ -s "$log_file" ]; then
+                        echo -e "\n${BLUE}=== $(basename "$log_file") ===${NC}"
+                        tail -n 5 "$log_file"
+                    fi
+                done
             done
             ;;
             
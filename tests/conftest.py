@@ -0,0 +1,243 @@
+# tests/conftest.py
+#
+# The app runs against a throwaway SQLite file unless TEST_DATABASE_URL points at a real
+# database. Config reads the environment at import time, so this has to happen before
+# anything imports backend.app. Routes are reached through their subdomains, which need
+# a SERVER_NAME (nt.test here).
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+import redis
+from flask import g
+from sqlalchemy import event
+
+_tmp = tempfile.mkdtemp(prefix='nanotrace-tests-')
+os.environ['DATABASE_URL'] = os.environ.get('TEST_DATABASE_URL') or f'sqlite:///{_tmp}/test.db'
+os.environ['RATELIMIT_ENABLED'] = 'false'
+os.environ.setdefault('SNAPSHOT_DIR', '')
+
+ADMIN_URL = 'http://admin.nt.test'
+
+_test_database = os.environ.get('TEST_DATABASE_URL', '')
+postgres_only = pytest.mark.skipif(
+    not _test_database.startswith('postgresql'),
+    reason='set TEST_DATABASE_URL to a throwaway PostgreSQL database',
+)
+sqlite_only = pytest.mark.skipif(bool(_test_database), reason='SQLite only')
+
+
+@pytest.fixture(scope='session')
+def app():
+    from backend.app import create_app
+
+    app = create_app()
+    app.config.update(TESTING=True, SERVER_NAME='nt.test')
+
+    @app.teardown_request
+    def _forget_user(exc):
+        # requests share the app context the db fixture holds open, so drop the user
+        # Flask-Login cached in g or the next client's request would see it too
+        g.pop('_login_user', None)
+
+    return app
+
+
+@pytest.fixture
+def db(app):
+    """Fresh tables for each test."""
+    from backend.app import db
+    import backend.app.models  # noqa: F401
+    import backend.app.models.email_outbox  # noqa: F401
+
+    with app.app_context():
+        db.create_all()
+        try:
+            yield db
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+
+@pytest.fixture
+def make_user(db):
+    from backend.app.models.user import User
+
+    def make_user(email, is_admin=False):
+        user = User(email=email, is_admin=is_admin, is_verified=True)
+        user.set_password('secret-password')
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    return make_user
+
+
+@pytest.fixture
+def make_certificate(db):
+    from backend.app.models.certificate import Certificate
+
+    def make_certificate(owner, product_name='Nano TiO2', **kwargs):
+        cert = Certificate(
+            product_name=product_name, material_type='titanium dioxide', supplier='Acme',
+            user_id=owner.id, **kwargs,
+        )
+        db.session.add(cert)
+        db.session.commit()
+        return cert
+
+    return make_certificate
+
+
+def login(client, user):
+    """Log `user` in on the admin subdomain the way Flask-Login would."""
+    with client.session_transaction(base_url=ADMIN_URL) as session:
+        session['_user_id'] = str(user.id)
+        session['_fresh'] = True
+
+
+@pytest.fixture
+def admin_client(app, make_user):
+    """Factory: a test client logged in as a new admin user (client.user_id)."""
+
+    def admin_client(email='admin@nt.test'):
+        client = app.test_client()
+        user = make_user(email, is_admin=True)
+        login(client, user)
+        client.user_id = user.id
+        return client
+
+    return admin_client
+
+
+@contextmanager
+def count_selects(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+class FakeRedis:
+    """The handful of Redis commands the app uses, in memory. TTLs are ignored.
+
+    Set `down` to make every command fail the way an unreachable server does;
+    `commands` counts what reached the "server". Lua scripts need a Python version
+    registered in `scripts` under their source.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.scripts = {}
+        self.down = False
+        self.commands = 0
+
+    def _call(self):
+        self.commands += 1
+        if self.down:
+            raise redis.ConnectionError('Error 111 connecting to fake. Connection refused.')
+
+    def ping(self):
+        self._call()
+        return True
+
+    def get(self, key):
+        self._call()
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, px=None, nx=False):
+        self._call()
+        if nx and key in self.data:
+            return None
+        self.data[key] = value if isinstance(value, bytes) else str(value).encode()
+        return True
+
+    def exists(self, *keys):
+        self._call()
+        return sum(key in self.data for key in keys)
+
+    def delete(self, *keys):
+        self._call()
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def rename(self, src, dst):
+        self._call()
+        self.data[dst] = self.data.pop(src)
+
+    def getbit(self, key, offset):
+        self._call()
+        value = self.data.get(key, b'')
+        if offset >> 3 >= len(value):
+            return 0
+        return value[offset >> 3] >> (7 - (offset & 7)) & 1
+
+    def setbit(self, key, offset, bit):
+        self._call()
+        value = bytearray(self.data.get(key, b''))
+        value.extend(bytes(max(0, (offset >> 3) + 1 - len(value))))
+        old = value[offset >> 3] >> (7 - (offset & 7)) & 1
+        if bit:
+            value[offset >> 3] |= 0x80 >> (offset & 7)
+        else:
+            value[offset >> 3] &= ~(0x80 >> (offset & 7)) & 0xFF
+        self.data[key] = bytes(value)
+        return old
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def register_script(self, source):
+        def script(keys=(), args=(), client=None):
+            self._call()
+            if source not in self.scripts:
+                raise redis.ResponseError('NOSCRIPT no Python version of this script')
+            return self.scripts[source](self, list(keys), list(args))
+        return script
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._queued = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._queued.append((getattr(self._client, name), args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        queued, self._queued = self._queued, []
+        return [command(*args, **kwargs) for command, args, kwargs in queued]
+
+
+def _idfilter_add(client, keys, args):
+    if not client.data.get(keys[0]):
+        return 0
+    for offset in args:
+        client.setbit(keys[0], int(offset), 1)
+    return 1
+
+
+@pytest.fixture
+def fake_redis(app, monkeypatch):
+    """Point get_redis() at a FakeRedis, with no back-off left over from earlier tests."""
+    from backend.app import idfilter, redis_client
+
+    fake = FakeRedis()
+    fake.scripts[idfilter._ADD_LUA] = _idfilter_add
+    monkeypatch.setattr(idfilter, '_add_script', None)
+    monkeypatch.setattr(idfilter, '_pending', set())
+    monkeypatch.setitem(app.config, 'REDIS_URL', 'redis://fake/0')
+    monkeypatch.setitem(redis_client._clients, 'redis://fake/0', fake)
+    monkeypatch.setattr(redis_client, '_down_until', 0.0)
+    return fake
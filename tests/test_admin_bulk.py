@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+from conftest import ADMIN_URL
+
+
+def test_bulk_approve_reports_each_row(db, admin_client, make_user, make_certificate):
+    from backend.app.models.certificate import Certificate
+
+    client = admin_client()
+    other = make_user('other-admin@nt.test', is_admin=True)
+    owner = make_user('owner@nt.test')
+    fresh = make_certificate(owner, 'Fresh')
+    decided = make_certificate(owner, 'Already rejected')
+    claimed = make_certificate(owner, 'Claimed elsewhere')
+    ids = [fresh.id, decided.id, claimed.id]
+
+    # the admin's page is stale: since it loaded, one row was rejected by someone else
+    # and another was claimed by a second reviewer
+    decided.status = 'rejected'
+    claimed.claimed_by = other.id
+    claimed.claim_expires_at = datetime.utcnow() + timedelta(minutes=10)
+    db.session.commit()
+
+    response = client.post(
+        '/admin/certificates/bulk', base_url=ADMIN_URL,
+        json={'action': 'approve', 'ids': ids + [999999]},
+    )
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['success'] is False
+    assert [row['id'] for row in body['succeeded']] == [fresh.id]
+    assert {row['id']: row['error'] for row in body['failed']} == {
+        decided.id: 'not_pending',
+        claimed.id: 'claimed',
+        999999: 'not_found',
+    }
+
+    db.session.expire_all()
+    statuses = {c.id: c.status for c in Certificate.query.filter(Certificate.id.in_(ids))}
+    assert statuses == {fresh.id: 'approved', decided.id: 'rejected', claimed.id: 'pending'}
+
+
+def test_bulk_rejects_unusable_request(db, admin_client):
+    client = admin_client()
+
+    response = client.post(
+        '/admin/certificates/bulk', base_url=ADMIN_URL, json={'action': 'delete', 'ids': [1]},
+    )
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_bulk_is_hidden_from_non_admins(app, db, make_user):
+    from conftest import login
+
+    client = app.test_client()
+    login(client, make_user('someone@nt.test'))
+
+    response = client.post(
+        '/admin/certificates/bulk', base_url=ADMIN_URL, json={'action': 'approve', 'ids': [1]},
+    )
+
+    assert response.status_code == 404
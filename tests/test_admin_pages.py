@@ -0,0 +1,22 @@
+import pytest
+
+from conftest import ADMIN_URL
+
+
+@pytest.mark.parametrize('path', [
+    '/admin/',
+    '/admin/certificates',
+    '/admin/certificates/{cert}',
+    '/admin/users',
+    '/admin/users/{owner}',
+    '/admin/system',
+    '/admin/system/queries',
+])
+def test_admin_pages_render(db, admin_client, make_user, make_certificate, path):
+    client = admin_client()
+    owner = make_user('owner@nt.test')
+    cert = make_certificate(owner)
+
+    response = client.get(path.format(cert=cert.id, owner=owner.id), base_url=ADMIN_URL)
+
+    assert response.status_code == 200
@@ -0,0 +1,58 @@
+import pytest
+
+from conftest import ADMIN_URL, count_selects
+
+
+@pytest.fixture
+def certificates_by_many_owners(make_user, make_certificate):
+    def create(n):
+        for i in range(n):
+            owner = make_user(f'owner{i}@nt.test')
+            make_certificate(owner, f'Sample {i}')
+            make_certificate(owner, f'Sample {i}b', status='approved')
+
+    return create
+
+
+# one SELECT each: the logged-in admin, the page with its owners, the page count and
+# the per-status totals
+@pytest.mark.parametrize('owners', [1, 12])
+def test_certificate_list_query_count(db, admin_client, certificates_by_many_owners, owners):
+    client = admin_client()
+    certificates_by_many_owners(owners)
+
+    with count_selects(db.engine) as selects:
+        response = client.get('/admin/certificates', base_url=ADMIN_URL)
+
+    assert response.status_code == 200
+    assert f'owner{owners - 1}@nt.test' in response.get_data(as_text=True)
+    assert len(selects) == 4, '\n\n'.join(selects)
+
+
+@pytest.mark.parametrize('owners', [1, 12])
+def test_pending_certificates_query_count(db, admin_client, certificates_by_many_owners, owners):
+    client = admin_client()
+    certificates_by_many_owners(owners)
+
+    with count_selects(db.engine) as selects:
+        response = client.get('/admin/certificates/pending', base_url=ADMIN_URL)
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == owners
+    # the admin, then the pending rows with their owners' emails
+    assert len(selects) == 2, '\n\n'.join(selects)
+
+
+def test_status_counts_is_one_query(db, make_user, make_certificate):
+    from backend.app.models.certificate import Certificate
+
+    owner = make_user('owner@nt.test')
+    for status in ('pending', 'approved', 'approved', 'rejected'):
+        make_certificate(owner, status=status)
+
+    with count_selects(db.engine) as selects:
+        counts = Certificate.status_counts()
+
+    assert len(selects) == 1
+    assert counts['total'] == 4
+    assert (counts['pending'], counts['approved'], counts['rejected'], counts['revoked']) == (1, 2, 1, 0)
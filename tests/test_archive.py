@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+from backend.app.models.certificate_archive import PAYLOAD_FIELDS
+
+
+_FIELDS = ('uid', 'certificate_id', 'status', 'user_id', 'created_at', *PAYLOAD_FIELDS)
+
+
+def _snapshot(cert):
+    return {field: getattr(cert, field) for field in _FIELDS}
+
+
+def test_archive_moves_cold_rows_with_their_payload(db, make_user, make_certificate):
+    from backend.app.archive import archive_cold_certificates
+    from backend.app.models.certificate import Certificate
+    from backend.app.models.certificate_archive import CertificateArchive
+
+    now = datetime.utcnow()
+    owner = make_user('owner@nt.test')
+    rejected = make_certificate(
+        owner, 'Long rejected', status='rejected', concentration='5%', particle_size='20 nm',
+        created_at=now - timedelta(days=200), rejected_at=now - timedelta(days=190),
+    )
+    expired = make_certificate(
+        owner, 'Long expired', status='expired', msds_link='https://example.test/msds.pdf',
+        created_at=now - timedelta(days=800), approved_at=now - timedelta(days=790),
+        expires_at=now - timedelta(days=400),
+    )
+    recent = make_certificate(owner, 'Recently rejected', status='rejected', rejected_at=now - timedelta(days=3))
+    approved = make_certificate(owner, 'Old but approved', status='approved', created_at=now - timedelta(days=900))
+    moved = {cert.id: _snapshot(cert) for cert in (rejected, expired)}
+    kept = {recent.id, approved.id}
+
+    assert archive_cold_certificates(batch_size=1) == 2
+    assert archive_cold_certificates() == 0
+
+    assert {cert.id for cert in Certificate.query} == kept
+    archived = {row.id: row for row in CertificateArchive.query}
+    assert set(archived) == set(moved)
+    for cert_id, values in moved.items():
+        assert _snapshot(archived[cert_id].to_certificate()) == values
+
+
+def test_limit_stops_early(db, make_user, make_certificate):
+    from backend.app.archive import archive_cold_certificates
+    from backend.app.models.certificate import Certificate
+
+    owner = make_user('owner@nt.test')
+    for i in range(3):
+        make_certificate(owner, f'Sample {i}', status='rejected', created_at=datetime.utcnow() - timedelta(days=365))
+
+    assert archive_cold_certificates(batch_size=2, limit=1) == 1
+    assert Certificate.query.count() == 2
+
+
+def test_find_by_public_id_falls_back_to_the_archive(db, make_user, make_certificate):
+    from backend.app.archive import archive_cold_certificates
+    from backend.app.models.certificate import Certificate
+
+    cert = make_certificate(
+        make_user('owner@nt.test'), status='rejected', created_at=datetime.utcnow() - timedelta(days=365),
+    )
+    public_id, values = cert.certificate_id, _snapshot(cert)
+    assert archive_cold_certificates() == 1
+
+    assert Certificate.find_by_public_id(public_id) is None
+    found = Certificate.find_by_public_id(public_id.lower(), include_archived=True)
+    assert _snapshot(found) == values
+    assert found.archived_at is not None
+    assert Certificate.find_by_public_id('NT-2026-NOT-A-REAL-ID', include_archived=True) is None
@@ -0,0 +1,114 @@
+import pytest
+
+AUTH_URL = 'http://auth.nt.test'
+
+
+@pytest.fixture
+def fresh_buckets(monkeypatch):
+    from backend.app import ratelimit
+
+    monkeypatch.setattr(ratelimit, '_memory', ratelimit._MemoryBuckets())
+
+
+@pytest.fixture
+def auth_service(db, fresh_buckets):
+    from backend.apps.auth.app import create_app
+
+    app = create_app()
+    app.config.update(TESTING=True, RATELIMIT_ENABLED=True, RATELIMIT_LOGIN='3/minute')
+    return app
+
+
+def test_login_is_rate_limited_on_the_auth_service(auth_service, make_user):
+    make_user('someone@nt.test')
+    client = auth_service.test_client()
+
+    def attempt():
+        return client.post('/login', data={'email': 'someone@nt.test', 'password': 'wrong'}).status_code
+
+    assert [attempt() for _ in range(3)] == [200, 200, 200]
+    response = client.post('/login', data={'email': 'someone@nt.test', 'password': 'secret-password'})
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+
+
+def test_login_is_rate_limited_on_the_auth_blueprint(app, db, fresh_buckets, monkeypatch):
+    monkeypatch.setitem(app.config, 'RATELIMIT_ENABLED', True)
+    monkeypatch.setitem(app.config, 'RATELIMIT_LOGIN', '2/minute')
+    client = app.test_client()
+
+    statuses = [client.get('/auth/login', base_url=AUTH_URL).status_code for _ in range(3)]
+
+    assert statuses == [200, 200, 429]
+
+
+def test_registration_queues_a_confirmation_link(db, auth_service, monkeypatch):
+    from backend.app.models.email_outbox import OutboxEmail
+    from backend.app.models.user import User
+
+    monkeypatch.setattr('backend.app.outbox._broker_down_until', float('inf'))
+    client = auth_service.test_client()
+
+    response = client.post('/register', data={
+        'email': 'new@example.test', 'password': 'pw-123456', 'confirm_password': 'pw-123456',
+    })
+
+    assert response.status_code == 302
+    email = OutboxEmail.query.one()
+    assert (email.recipient, email.kind, email.status) == ('new@example.test', 'verify_email', 'pending')
+    link = next(line for line in email.body_text.splitlines() if '/verify-email/' in line)
+    token = link.rsplit('/', 1)[1]
+
+    assert client.get(f'/verify-email/{token}').status_code == 302
+    db.session.expire_all()
+    assert User.query.filter_by(email='new@example.test').one().is_verified is True
+
+
+def test_token_round_trip(app, db, make_user):
+    from backend.app.email_verification import make_token, read_token
+
+    user = make_user('someone@nt.test')
+
+    with app.test_request_context():
+        assert read_token(make_token(user)) == (user.id, 'someone@nt.test')
+
+
+def test_confirm_email(app, db, make_user, monkeypatch):
+    from backend.app.email_verification import confirm_email, make_token
+    from backend.app.models.user import User
+
+    user = make_user('someone@nt.test')
+    user.is_verified = False
+    db.session.commit()
+    token = make_token(user)
+    user_id = user.id
+    tampered = token[:-2] + ('A' if token[-2] != 'A' else 'B') + token[-1]
+    client = app.test_client()
+
+    assert confirm_email(tampered) == 'invalid'
+    assert confirm_email('not-a-token') == 'invalid'
+    monkeypatch.setitem(app.config, 'EMAIL_VERIFY_MAX_AGE', -1)
+    assert confirm_email(token) == 'expired'
+    monkeypatch.undo()
+    assert db.session.get(User, user_id).is_verified is False
+
+    response = client.get(f'/auth/verify-email/{token}', base_url=AUTH_URL)
+    assert response.status_code == 200
+    db.session.expire_all()
+    assert db.session.get(User, user_id).is_verified is True
+    assert confirm_email(token) == 'already'
+
+
+def test_changing_the_address_voids_old_links(app, db, make_user):
+    from backend.app.email_verification import confirm_email, make_token
+    from backend.app.models.user import User
+
+    user = make_user('old@nt.test')
+    user.is_verified = False
+    token = make_token(user)
+    user.email = 'new@nt.test'
+    db.session.commit()
+
+    assert confirm_email(token) == 'already'
+    db.session.expire_all()
+    assert User.query.one().is_verified is False
@@ -0,0 +1,164 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from backend.app import certtokens
+from backend.app.certtokens import TokenError, cbor_dumps, cbor_loads, decode_token, key_id, verify_token
+
+CERT_URL = 'http://cert.nt.test'
+
+
+def _sign(key, claims, kid=None):
+    protected = cbor_dumps({1: certtokens.ALG_EDDSA, 4: kid or key_id(key.public_key())})
+    payload = cbor_dumps(claims)
+    signature = key.sign(certtokens._sig_structure(protected, payload))
+    return certtokens._b64encode(certtokens._head(6, 18) + cbor_dumps([protected, {}, payload, signature]))
+
+
+def _claims(expires=None):
+    now = int(time.time())
+    return {
+        1: 'nanotrace', 4: expires or now + 3600, 6: now,
+        'cid': 'NT-2026-X', 'prd': 'Nano TiO2', 'sts': 'approved',
+    }
+
+
+def _flip(token, index):
+    raw = bytearray(certtokens._b64decode(token))
+    raw[index] ^= 0x01
+    return certtokens._b64encode(bytes(raw))
+
+
+@pytest.fixture
+def key():
+    return Ed25519PrivateKey.generate()
+
+
+def test_cbor_round_trip():
+    value = [0, 23, 24, 255, 65536, 2 ** 40, -1, -25, -2 ** 33, b'\x00\xff', 'Zürich', [], {1: [True, False, None]}]
+    assert cbor_loads(cbor_dumps(value)) == value
+
+
+def test_sign_and_verify(key):
+    token = _sign(key, _claims())
+
+    claims = verify_token(token, {key_id(key.public_key()): key.public_key()})
+
+    assert claims['certificate_id'] == 'NT-2026-X'
+    assert claims['status'] == 'approved'
+    assert claims['kid'] == key_id(key.public_key()).hex()
+
+
+def test_flipped_bytes_are_rejected(key):
+    keys = {key_id(key.public_key()): key.public_key()}
+    token = _sign(key, _claims())
+    _, _, protected, payload, signature = decode_token(token)
+    raw = certtokens._b64decode(token)
+    payload_at = raw.index(payload)
+    signature_at = raw.index(signature)
+
+    for index in (payload_at + len(payload) - 1, signature_at, signature_at + len(signature) - 1):
+        with pytest.raises(TokenError):
+            verify_token(_flip(token, index), keys)
+
+
+def test_unknown_key_is_rejected(key):
+    other = Ed25519PrivateKey.generate()
+    token = _sign(key, _claims())
+
+    with pytest.raises(TokenError, match='unknown signing key'):
+        verify_token(token, {key_id(other.public_key()): other.public_key()})
+    # a token naming a trusted kid but signed by someone else
+    forged = _sign(other, _claims(), kid=key_id(key.public_key()))
+    with pytest.raises(TokenError, match='bad signature'):
+        verify_token(forged, {key_id(key.public_key()): key.public_key()})
+
+
+def test_expired_token_is_rejected(key):
+    keys = {key_id(key.public_key()): key.public_key()}
+    token = _sign(key, _claims(expires=1_000_000))
+
+    with pytest.raises(TokenError, match='expired'):
+        verify_token(token, keys)
+    assert verify_token(token, keys, now=1_000_000 + 30)['expires_at'] == 1_000_000
+
+
+@pytest.mark.parametrize('raw', [
+    b'',
+    b'\x84',  # array of 4, nothing in it
+    b'\x84\x41',  # byte string cut short
+    b'\x5a\xff\xff\xff\xff',  # length beyond the data
+    b'\xa1\x80\x01',  # map with an array as key
+    b'\x1c',  # reserved additional info
+    b'\xf9\x3c\x00',  # half float
+    b'\x84\x40\xa0\x40\x40\x00',  # trailing byte
+    b'\x81' * 5000,  # nested too deep
+    b'\x62\xff\xfe',  # invalid UTF-8
+    b'\x84\x41\x01\xa0\x41\x01\x40',  # headers that are not maps
+    b'\x83\x40\xa0\x40',  # three items instead of four
+])
+def test_malformed_tokens_raise_token_error(key, raw):
+    with pytest.raises(TokenError):
+        verify_token(certtokens._b64encode(raw), {key_id(key.public_key()): key.public_key()})
+
+
+@pytest.mark.parametrize('token', ['', 'not base64!', 'é', 'A'])
+def test_garbage_strings_raise_token_error(key, token):
+    with pytest.raises(TokenError):
+        verify_token(token, {key_id(key.public_key()): key.public_key()})
+
+
+@pytest.fixture
+def signing(app, key, tmp_path, monkeypatch):
+    path = tmp_path / 'signing.pem'
+    path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+    ))
+    monkeypatch.setitem(app.config, 'CERT_SIGNING_KEY_FILE', str(path))
+    return key
+
+
+def test_token_routes(app, db, signing, make_user, make_certificate):
+    now = datetime.utcnow()
+    cert = make_certificate(
+        make_user('owner@nt.test'), status='approved', approved_at=now - timedelta(days=1),
+        expires_at=now + timedelta(days=30),
+    )
+    pending = make_certificate(make_user('other@nt.test'))
+    client = app.test_client()
+
+    response = client.get(f'/certificate/api/token/{cert.certificate_id}', base_url=CERT_URL)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['qr_payload'].endswith(f"/certificate/verify/{cert.certificate_id}#t={body['token']}")
+    # deterministic: minting again gives the same token
+    assert client.get(f'/certificate/api/token/{cert.certificate_id}', base_url=CERT_URL).get_json() == body
+    assert client.get(f'/certificate/api/token/{pending.certificate_id}', base_url=CERT_URL).status_code == 404
+
+    verified = client.get('/certificate/api/verify-token', base_url=CERT_URL, query_string={'t': body['token']})
+    assert verified.status_code == 200
+    claims = verified.get_json()
+    assert (claims['valid'], claims['certificate_id'], claims['status']) == (True, cert.certificate_id, 'approved')
+    # the token never outlives the certificate
+    assert claims['expires_at'] == int((cert.expires_at - datetime(1970, 1, 1)).total_seconds())
+
+    posted = client.post('/certificate/api/verify-token', base_url=CERT_URL, json={'token': _flip(body['token'], -1)})
+    assert posted.status_code == 422
+    assert posted.get_json() == {'valid': False, 'error': 'bad signature'}
+
+    keys = client.get('/certificate/api/keys', base_url=CERT_URL).get_json()['keys']
+    assert keys == [{
+        'kty': 'OKP', 'crv': 'Ed25519', 'alg': 'EdDSA',
+        'kid': key_id(signing.public_key()).hex(), 'x': certtokens.public_key_b64(signing.public_key()),
+    }]
+
+
+def test_no_tokens_without_a_signing_key(app, db, make_user, make_certificate):
+    cert = make_certificate(make_user('owner@nt.test'), status='approved', approved_at=datetime.utcnow())
+    client = app.test_client()
+
+    assert client.get(f'/certificate/api/token/{cert.certificate_id}', base_url=CERT_URL).status_code == 404
+    assert client.get('/certificate/api/keys', base_url=CERT_URL).get_json() == {'keys': []}
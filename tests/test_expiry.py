@@ -0,0 +1,97 @@
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from prometheus_client import REGISTRY
+
+
+def _expired_total():
+    return REGISTRY.get_sample_value('nanotrace_certificates_expired_total') or 0
+
+
+@pytest.fixture
+def approved(db, make_certificate):
+    def approved(owner, product_name, expires_in):
+        now = datetime.utcnow()
+        return make_certificate(
+            owner, product_name, status='approved', approved_at=now - timedelta(days=30),
+            expires_at=now + expires_in,
+        )
+
+    return approved
+
+
+def test_due_certificates_expire_in_batches(db, make_user, approved):
+    from backend.app.expiry import expire_due_certificates
+    from backend.app.models.certificate import Certificate
+    from backend.app.models.email_outbox import OutboxEmail
+
+    alice, bob = make_user('alice@nt.test'), make_user('bob@nt.test')
+    due = [
+        approved(alice, 'Due A1', timedelta(days=-2)),
+        approved(alice, 'Due A2', timedelta(days=-1)),
+        approved(bob, 'Due B', timedelta(minutes=-1)),
+    ]
+    current = approved(bob, 'Current', timedelta(days=10))
+    versions = {cert.id: cert.version for cert in due}
+    before = _expired_total()
+
+    assert expire_due_certificates(batch_size=2) == 3
+    assert expire_due_certificates() == 0
+
+    assert _expired_total() - before == 3
+    db.session.expire_all()
+    assert {cert.status for cert in due} == {'expired'}
+    assert all(cert.version == versions[cert.id] + 1 for cert in due)
+    assert db.session.get(Certificate, current.id).status == 'approved'
+    # one notice per owner per batch; oldest first, so alice's two rows share the first batch
+    assert sorted((row.recipient, row.subject) for row in OutboxEmail.query) == [
+        ('alice@nt.test', '2 certificates expired'),
+        ('bob@nt.test', 'Certificate expired: Due B'),
+    ]
+
+
+def test_limit_and_now(db, make_user, approved):
+    from backend.app.expiry import expire_due_certificates
+
+    owner = make_user('owner@nt.test')
+    for i in range(3):
+        approved(owner, f'Sample {i}', timedelta(days=i + 1))
+
+    assert expire_due_certificates() == 0
+    assert expire_due_certificates(limit=1, now=datetime.utcnow() + timedelta(days=5)) == 1
+    assert expire_due_certificates(now=datetime.utcnow() + timedelta(days=5)) == 2
+
+
+def test_expiry_drops_snapshots_and_verify_reports_it(app, db, make_user, approved, tmp_path, monkeypatch):
+    from backend.app import snapshots
+    from backend.app.expiry import expire_due_certificates
+
+    monkeypatch.setitem(app.config, 'SNAPSHOT_DIR', str(tmp_path))
+    marked = []
+    mark_stale = snapshots.mark_stale
+
+    def spy(session, public_ids):
+        marked.extend(public_ids)
+        mark_stale(session, public_ids)
+
+    monkeypatch.setattr(snapshots, 'mark_stale', spy)
+    owner = make_user('owner@nt.test')
+    cert = approved(owner, 'Due', timedelta(days=1))
+    public_id = cert.certificate_id
+    paths = snapshots.snapshot_paths(str(tmp_path), public_id)
+    assert all(os.path.exists(path) for path in paths)
+    client = app.test_client()
+    assert client.get(f'/certificate/api/verify/{public_id}', base_url='http://cert.nt.test').get_json()['valid']
+
+    assert expire_due_certificates(now=datetime.utcnow() + timedelta(days=2)) == 1
+
+    for thread in threading.enumerate():
+        if thread.name == 'snapshot-refresh':
+            thread.join(5)
+
+    assert marked == [public_id]
+    assert not any(os.path.exists(path) for path in paths)
+    body = client.get(f'/certificate/api/verify/{public_id}', base_url='http://cert.nt.test').get_json()
+    assert (body['status'], body['valid']) == ('expired', False)
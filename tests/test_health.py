@@ -0,0 +1,161 @@
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from backend.app import health
+
+
+@pytest.fixture
+def main_app(app, monkeypatch):
+    # the session app keeps its probe cache between tests
+    monkeypatch.setitem(app.extensions['health'], 'cached', None)
+    return app
+
+
+def test_livez_never_probes(main_app, monkeypatch):
+    def fail(app):
+        raise AssertionError('livez ran a probe')
+
+    monkeypatch.setattr(health, '_probe_postgres', fail)
+    monkeypatch.setattr(health, '_probe_redis', fail)
+
+    response = main_app.test_client().get('/livez', base_url='http://nt.test')
+
+    assert response.status_code == 200
+    assert response.get_json() == {'status': 'ok', 'service': 'main'}
+
+
+def test_readyz_reports_each_dependency(main_app, db, fake_redis):
+    client = main_app.test_client()
+
+    response = client.get('/readyz', base_url='http://nt.test')
+    assert response.status_code == 200
+    checks = response.get_json()['checks']
+    assert (checks['postgres']['status'], checks['redis']['status']) == ('ok', 'ok')
+
+    fake_redis.down = True
+    main_app.extensions['health']['cached'] = None
+    response = client.get('/readyz', base_url='http://nt.test')
+    assert response.status_code == 503
+    body = response.get_json()
+    assert body['status'] == 'unavailable'
+    assert body['checks']['redis']['status'] == 'error'
+    assert 'Connection refused' in body['checks']['redis']['error']
+    assert body['checks']['postgres']['healthy'] is True
+
+
+@pytest.fixture
+def service():
+    """A bare app whose only dependency is a fabric probe the test controls."""
+    app = Flask(__name__)
+    app.config.update(
+        FABRIC_PEER_ADDRESS='peer.test:7051', HEALTH_OPTIONAL_DEPENDENCIES='',
+        HEALTH_CACHE_TTL=60, HEALTH_PROBE_TIMEOUT=0.2,
+    )
+    health.init_health(app, 'test')
+    return app
+
+
+class Probe:
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+        self.entered = threading.Event()
+
+    def __call__(self, app):
+        self.calls += 1
+        self.entered.set()
+        if not self.release.wait(5):
+            raise RuntimeError('never released')
+
+
+def test_results_are_cached(service, monkeypatch):
+    probe = Probe()
+    monkeypatch.setattr(health, '_probe_fabric', probe)
+    client = service.test_client()
+
+    service.config['HEALTH_CACHE_TTL'] = 0.3
+
+    assert [client.get('/readyz').status_code for _ in range(3)] == [200] * 3
+    assert probe.calls == 1
+
+    time.sleep(0.35)
+    client.get('/readyz')
+    assert probe.calls == 2
+
+
+def test_hanging_probe_times_out_and_is_not_stacked(service, monkeypatch):
+    probe = Probe()
+    probe.release.clear()
+    monkeypatch.setattr(health, '_probe_fabric', probe)
+    service.config['HEALTH_CACHE_TTL'] = 0
+    client = service.test_client()
+
+    started = time.monotonic()
+    response = client.get('/readyz')
+    assert time.monotonic() - started < 1
+    assert response.status_code == 503
+    assert response.get_json()['checks']['fabric']['status'] == 'timeout'
+
+    # still hanging: the next rounds report it without starting another probe
+    for _ in range(3):
+        check = client.get('/readyz').get_json()['checks']['fabric']
+        assert (check['status'], check['error']) == ('timeout', 'previous probe still running')
+    assert probe.calls == 1
+
+    probe.release.set()
+    deadline = time.monotonic() + 5
+    while not service.extensions['health']['running']['fabric'].done() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert client.get('/readyz').status_code == 200
+    assert probe.calls == 2
+
+
+def test_refresh_lock_is_per_app(monkeypatch):
+    slow, fast = Probe(), Probe()
+    slow.release.clear()
+    apps = {}
+    for name, probe in (('slow', slow), ('fast', fast)):
+        app = Flask(name)
+        app.config.update(
+            FABRIC_PEER_ADDRESS=f'{name}.test:7051', HEALTH_OPTIONAL_DEPENDENCIES='',
+            HEALTH_CACHE_TTL=0, HEALTH_PROBE_TIMEOUT=2,
+        )
+        health.init_health(app, name)
+        apps[name] = app
+
+    probes = {'slow.test:7051': slow, 'fast.test:7051': fast}
+    monkeypatch.setattr(health, '_probe_fabric', lambda app: probes[app.config['FABRIC_PEER_ADDRESS']](app))
+
+    refreshing = threading.Thread(target=health.check_dependencies, args=(apps['slow'],))
+    refreshing.start()
+    try:
+        assert slow.entered.wait(5)
+        started = time.monotonic()
+        assert health.check_dependencies(apps['fast'])['fabric']['status'] == 'ok'
+        assert time.monotonic() - started < 1
+    finally:
+        slow.release.set()
+        refreshing.join()
+
+
+
+def test_cache_hits_and_misses_are_counted(service, monkeypatch):
+    from prometheus_client import REGISTRY
+
+    def counts():
+        return [
+            REGISTRY.get_sample_value('nanotrace_cache_requests_total', {'cache': 'health', 'result': result}) or 0
+            for result in ('hit', 'miss')
+        ]
+
+    monkeypatch.setattr(health, '_probe_fabric', Probe())
+    before = counts()
+
+    for _ in range(3):
+        health.check_dependencies(service)
+
+    assert [now - then for now, then in zip(counts(), before)] == [2, 1]
@@ -0,0 +1,76 @@
+import pytest
+
+from conftest import count_selects
+
+CERT_URL = 'http://cert.nt.test'
+
+
+@pytest.fixture
+def id_filter(db, fake_redis):
+    from backend.app import idfilter
+
+    return idfilter
+
+
+def test_absent_id_is_answered_without_the_database(app, db, id_filter, make_user, make_certificate):
+    from backend.app.certids import format_public_id, new_uid
+
+    known = make_certificate(make_user('owner@nt.test'), status='approved')
+    assert id_filter.rebuild() == 1
+    unknown = format_public_id(new_uid())
+
+    assert id_filter.might_exist(known.certificate_id)
+    assert not id_filter.might_exist(unknown)
+
+    client = app.test_client()
+    with count_selects(db.engine) as selects:
+        response = client.get(f'/certificate/verify/{unknown}', base_url=CERT_URL)
+    assert response.status_code == 404
+    assert selects == []
+
+
+def test_new_certificates_are_added(db, id_filter, make_user, make_certificate):
+    owner = make_user('owner@nt.test')
+    make_certificate(owner)
+    id_filter.rebuild()
+
+    # issued after the rebuild: added by the after_insert hook
+    cert = make_certificate(owner)
+
+    assert id_filter.might_exist(cert.certificate_id)
+
+
+def test_adds_before_the_first_rebuild_do_not_create_the_bitmap(db, id_filter, fake_redis, make_user, make_certificate):
+    make_certificate(make_user('owner@nt.test'))
+
+    assert fake_redis.data == {}
+
+
+def test_fails_open_and_backs_off_while_redis_is_down(db, id_filter, fake_redis, make_user, make_certificate, monkeypatch):
+    from backend.app import redis_client
+    from backend.app.certids import format_public_id, new_uid
+
+    make_certificate(make_user('owner@nt.test'))
+    id_filter.rebuild()
+    unknown = format_public_id(new_uid())
+    assert not id_filter.might_exist(unknown)
+
+    fake_redis.down = True
+    assert id_filter.might_exist(unknown)
+    failed_at = fake_redis.commands
+    # the next lookups don't wait on Redis again
+    assert id_filter.might_exist(unknown)
+    assert id_filter.might_exist(format_public_id(new_uid()))
+    assert fake_redis.commands == failed_at
+
+    # an ID issued during the outage is kept and added once Redis is back
+    cert = make_certificate(make_user('during-outage@nt.test'))
+    assert fake_redis.commands == failed_at
+    assert cert.certificate_id in id_filter._pending
+
+    fake_redis.down = False
+    monkeypatch.setattr(redis_client, '_down_until', 0.0)
+    assert id_filter.might_exist(cert.certificate_id)
+    assert not id_filter._pending
+    assert id_filter.might_exist(cert.certificate_id)
+    assert not id_filter.might_exist(unknown)
@@ -0,0 +1,87 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+from prometheus_client import REGISTRY
+
+
+@pytest.fixture
+def captured(app, monkeypatch):
+    """Records reaching the log queue (after _QueueHandler.prepare), instead of the writer."""
+    from backend.app import logconfig
+
+    records = queue.Queue()
+    monkeypatch.setattr(logconfig._queue_handler, 'queue', records)
+
+    def drain():
+        out = []
+        while not records.empty():
+            out.append(records.get_nowait())
+        return out
+
+    return drain
+
+
+def test_json_formatter_writes_one_object_per_record():
+    from backend.app.logconfig import JsonFormatter
+
+    try:
+        raise ValueError('bad row')
+    except ValueError:
+        exc_info = sys.exc_info()
+    record = logging.LogRecord('nanotrace.audit', logging.ERROR, __file__, 1, 'approved %s', ('NT-1',), exc_info)
+    record.certificate_id = 'NT-1'
+    record.request_id = 'req-1'
+    record.created = 1792444443.5123
+
+    line = JsonFormatter('main').format(record)
+
+    assert '\n' not in line
+    entry = json.loads(line)
+    assert entry.pop('exc').splitlines()[-1] == 'ValueError: bad row'
+    assert entry == {
+        'ts': '2026-10-19T21:14:03.512Z', 'level': 'ERROR', 'logger': 'nanotrace.audit',
+        'service': 'main', 'msg': 'approved NT-1', 'request_id': 'req-1', 'certificate_id': 'NT-1',
+    }
+
+
+def test_request_id_reaches_the_response_and_the_log(app, captured):
+    client = app.test_client()
+
+    response = client.get('/no-such-page', base_url='http://nt.test', headers={'X-Request-ID': 'nginx-req.42'})
+
+    assert response.headers['X-Request-ID'] == 'nginx-req.42'
+    (access,) = [r for r in captured() if r.name == 'nanotrace.access']
+    assert (access.request_id, access.status, access.path) == ('nginx-req.42', 404, '/no-such-page')
+    # unbound again once the request is over
+    logging.getLogger('nanotrace.test').warning('between requests')
+    assert [r.request_id for r in captured()] == [None]
+
+
+def test_malformed_request_id_is_replaced(app, captured):
+    client = app.test_client()
+
+    response = client.get('/no-such-page', base_url='http://nt.test', headers={'X-Request-ID': '<script>'})
+
+    request_id = response.headers['X-Request-ID']
+    assert len(request_id) == 32 and request_id != '<script>'
+    assert [r.request_id for r in captured() if r.name == 'nanotrace.access'] == [request_id]
+
+
+def test_full_queue_drops_and_counts(app, monkeypatch):
+    from backend.app import logconfig
+
+    def dropped():
+        return REGISTRY.get_sample_value('nanotrace_log_records_dropped_total') or 0
+
+    monkeypatch.setattr(logconfig._queue_handler, 'queue', queue.Queue(1))
+    before = dropped()
+    logger = logging.getLogger('nanotrace.test')
+
+    for i in range(3):
+        logger.warning('record %d', i)
+
+    assert dropped() - before == 2
+    assert logconfig._queue_handler.queue.get_nowait().msg == 'record 0'
@@ -0,0 +1,54 @@
+import pytest
+from flask import Flask
+
+
+def test_metrics_allowlist_behind_proxyfix(app):
+    client = app.test_client()
+
+    assert client.get('/metrics', base_url='http://nt.test').status_code == 200
+    forwarded = client.get('/metrics', base_url='http://nt.test', headers={'X-Forwarded-For': '198.51.100.9'})
+    assert forwarded.status_code == 404
+
+
+@pytest.fixture
+def bare_app():
+    """An app without ProxyFix, like the standalone cert/main/register services."""
+    from backend.app.metrics import init_metrics
+
+    app = Flask(__name__)
+    init_metrics(app, 'bare')
+    return app
+
+
+def test_metrics_without_proxyfix_refuses_forwarded_requests(bare_app):
+    client = bare_app.test_client()
+
+    assert client.get('/metrics').status_code == 200
+    # Nginx connects from loopback; only the forwarded header tells the request apart
+    assert client.get('/metrics', headers={'X-Forwarded-For': '198.51.100.9'}).status_code == 404
+
+
+def test_shared_single_flight_results_count_as_cache_hits(app, fake_redis, monkeypatch):
+    from prometheus_client import REGISTRY
+
+    from backend.app.singleflight import SingleFlight
+
+    def count(result):
+        labels = {'cache': 'metrics_test_shared', 'result': result}
+        return REGISTRY.get_sample_value('nanotrace_cache_requests_total', labels) or 0
+
+    monkeypatch.setitem(app.config, 'SINGLEFLIGHT_SHARED', True)
+    flight = SingleFlight('metrics_test')
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 200, 'body'
+
+    with app.app_context():
+        # the first call computes and publishes; the second reads it back, as another worker would
+        assert flight.do('a', compute) == (200, 'body')
+        assert flight.do('a', compute) == (200, 'body')
+
+    assert len(calls) == 1
+    assert (count('miss'), count('hit')) == (1, 1)
@@ -0,0 +1,117 @@
+import email
+import importlib.util
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+SMTP_SINK = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'smtp_sink.py')
+
+
+def _load_sink():
+    spec = importlib.util.spec_from_file_location('smtp_sink', SMTP_SINK)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def sink(app, tmp_path, monkeypatch):
+    """scripts/smtp_sink.py on a free port, with Flask-Mail pointed at it.
+
+    Recipients in sink.flaky get a 421 after DATA instead of being stored.
+    """
+    smtp_sink = _load_sink()
+
+    class Handler(smtp_sink.SinkHandler):
+        def save(self, mail_from, rcpt_to, data):
+            if any(recipient.strip('<>') in self.server.flaky for recipient in rcpt_to):
+                self.reply('421 4.3.0 try again later')
+                raise ConnectionAbortedError
+            super().save(mail_from, rcpt_to, data)
+
+    class Server(smtp_sink.SinkServer):
+        def handle_error(self, request, client_address):
+            pass  # the flaky recipients drop the connection on purpose
+
+    server = Server(('127.0.0.1', 0), Handler)
+    server.maildir = str(tmp_path)
+    server.flaky = set()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    state = app.extensions['mail']
+    for name, value in {
+        'server': '127.0.0.1', 'port': server.server_address[1], 'use_tls': False,
+        'use_ssl': False, 'username': None, 'password': None, 'suppress': False,
+    }.items():
+        monkeypatch.setattr(state, name, value)
+    monkeypatch.setitem(app.config, 'MAIL_DEFAULT_SENDER', 'noreply@nt.test')
+    monkeypatch.setitem(app.config, 'OUTBOX_DOMAIN_LIMIT', '1000/minute')
+    # no broker here; leave the draining to the test
+    monkeypatch.setattr('backend.app.outbox._broker_down_until', float('inf'))
+
+    def delivered():
+        return Counter(
+            email.message_from_bytes(path.read_bytes())['To'] for path in tmp_path.glob('*.eml')
+        )
+
+    server.delivered = delivered
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_drain_delivers_each_row_once(db, sink):
+    from backend.app.outbox import drain_outbox, enqueue_email
+    from backend.app.models.email_outbox import OutboxEmail
+
+    recipients = [f'user{i}@example{i % 2}.test' for i in range(5)]
+    for recipient in recipients:
+        enqueue_email(recipient, 'Certificate approved', f'Hello {recipient}')
+    db.session.commit()
+
+    assert drain_outbox(batch_size=2) == {'sent': 5, 'retry': 0, 'failed': 0, 'throttled': 0}
+    assert drain_outbox() == {'sent': 0, 'retry': 0, 'failed': 0, 'throttled': 0}
+
+    assert sink.delivered() == Counter(recipients)
+    rows = OutboxEmail.query.all()
+    assert {row.status for row in rows} == {'sent'}
+    assert all(row.attempts == 1 and row.sent_at is not None for row in rows)
+
+
+def test_failed_send_is_retried_with_backoff(app, db, sink):
+    from backend.app.outbox import drain_outbox, enqueue_email
+    from backend.app.models.email_outbox import OutboxEmail
+
+    sink.flaky.add('flaky@example.test')
+    enqueue_email('flaky@example.test', 'Certificate approved', 'Hello')
+    enqueue_email('fine@example.test', 'Certificate approved', 'Hello')
+    db.session.commit()
+
+    started = datetime.utcnow()
+    assert drain_outbox() == {'sent': 1, 'retry': 1, 'failed': 0, 'throttled': 0}
+
+    flaky = OutboxEmail.query.filter_by(recipient='flaky@example.test').one()
+    assert flaky.status == 'pending'
+    assert flaky.attempts == 1
+    assert flaky.sent_at is None
+    assert 'SMTP' in flaky.last_error
+    # first retry waits between half and all of OUTBOX_RETRY_BASE
+    base = app.config['OUTBOX_RETRY_BASE']
+    assert started + timedelta(seconds=base / 2) <= flaky.next_attempt_at
+    assert flaky.next_attempt_at <= datetime.utcnow() + timedelta(seconds=base)
+    # not due yet
+    assert drain_outbox()['sent'] == 0
+    assert sink.delivered() == Counter({'fine@example.test': 1})
+
+    # the server recovers and the backoff has passed
+    sink.flaky.clear()
+    flaky.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    assert drain_outbox() == {'sent': 1, 'retry': 0, 'failed': 0, 'throttled': 0}
+
+    db.session.refresh(flaky)
+    assert (flaky.status, flaky.attempts, flaky.last_error) == ('sent', 2, None)
+    assert sink.delivered() == Counter({'fine@example.test': 1, 'flaky@example.test': 1})
@@ -0,0 +1,174 @@
+import importlib.util
+import os
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+
+from backend.app.partitions import add_months, month_start, partition_name
+from conftest import postgres_only, sqlite_only
+
+MIGRATION = os.path.join(
+    os.path.dirname(__file__), '..', 'migrations', 'versions', '7c3f9a2e5b18_partition_certificates_by_month.py'
+)
+
+
+def _run_upgrade(engine):
+    """Run 7c3f9a2e5b18's upgrade() on `engine` outside of env.py."""
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+
+    spec = importlib.util.spec_from_file_location('partition_migration', MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with engine.begin() as conn:
+        with Operations.context(MigrationContext.configure(conn)):
+            migration.upgrade()
+    return migration
+
+
+@pytest.fixture
+def partitioned(db, make_user, make_certificate):
+    """The schema as it stood before 7c3f9a2e5b18, a few rows in it, then the migration.
+
+    The revision history starts after the certificates table already existed (it was
+    created from the models), so the pre-partition schema comes from create_all here.
+    """
+    owner = make_user('owner@nt.test')
+    this_month = month_start(date.today())
+    old = make_certificate(owner, 'Old', created_at=datetime.combine(add_months(this_month, -2), datetime.min.time()))
+    # issued before UUIDv7: a uuid4 uid whose created_at says nothing about it, and the
+    # bare UUID as its public ID
+    legacy_issued = datetime.combine(add_months(this_month, -1), datetime.min.time()) + timedelta(days=14)
+    legacy_uid = uuid.uuid4()
+    legacy = make_certificate(
+        owner, 'Legacy', uid=legacy_uid, certificate_id=str(legacy_uid), created_at=legacy_issued,
+    )
+    rows = {
+        'owner': owner.id, 'old': old.id, 'old_public_id': old.certificate_id,
+        'legacy_uid': legacy.uid, 'legacy_public_id': legacy.certificate_id,
+    }
+    db.session.remove()
+    yield _run_upgrade(db.engine), rows
+    if db.engine.dialect.name == 'postgresql':
+        # not a model, so drop_all doesn't know about it
+        with db.engine.begin() as conn:
+            conn.execute(text('DROP FUNCTION IF EXISTS certificates_reserve_public_id() CASCADE'))
+            conn.execute(text('DROP TABLE IF EXISTS certificate_public_ids'))
+
+
+def _partition_of(conn, cert_id):
+    return conn.execute(
+        text('SELECT tableoid::regclass::text FROM certificates WHERE id = :id'), {'id': cert_id}
+    ).scalar()
+
+
+@postgres_only
+def test_upgrade_partitions_by_month_and_keeps_rows(db, partitioned):
+    from backend.app.partitions import ensure_partitions, is_partitioned, list_partitions
+
+    migration, rows = partitioned
+    this_month = month_start(date.today())
+    with db.engine.connect() as conn:
+        assert is_partitioned(conn, 'certificates')
+        names = {name for name, _, _ in list_partitions(conn, 'certificates')}
+        assert _partition_of(conn, rows['old']) == partition_name('certificates', add_months(this_month, -2))
+    expected = {
+        partition_name('certificates', add_months(this_month, offset))
+        for offset in range(-2, migration.MONTHS_AHEAD + 1)
+    }
+    assert names == expected | {'certificates_default'}
+
+    # the maintenance job adds the month after the last pre-created one, once
+    next_month = partition_name('certificates', add_months(this_month, migration.MONTHS_AHEAD + 1))
+    assert ensure_partitions(months_ahead=migration.MONTHS_AHEAD + 1) == [next_month]
+    assert ensure_partitions(months_ahead=migration.MONTHS_AHEAD + 1) == []
+
+
+@postgres_only
+def test_certificate_lands_in_its_month(db, partitioned, make_certificate):
+    from backend.app.models.certificate import Certificate
+    from backend.app.models.user import User
+
+    _, rows = partitioned
+    issued = datetime.utcnow() - timedelta(days=1)
+    cert = make_certificate(db.session.get(User, rows['owner']), 'New', created_at=issued)
+
+    with db.engine.connect() as conn:
+        assert _partition_of(conn, cert.id) == partition_name('certificates', month_start(issued))
+    db.session.expire_all()
+    found = Certificate.find_by_public_id(cert.certificate_id)
+    assert found is not None and found.id == cert.id
+
+
+@sqlite_only
+def test_sqlite_keeps_a_plain_table(db, partitioned, make_certificate):
+    from backend.app.models.certificate import Certificate
+    from backend.app.models.user import User
+    from backend.app.partitions import detach_partitions, ensure_partitions, is_partitioned
+
+    _, rows = partitioned
+
+    assert inspect(db.engine).has_table('certificates')
+    assert not any(name.startswith('certificates_y') for name in inspect(db.engine).get_table_names())
+    with db.engine.connect() as conn:
+        assert not is_partitioned(conn, 'certificates')
+    assert ensure_partitions() == []
+    assert detach_partitions(date.today()) == []
+
+    cert = make_certificate(db.session.get(User, rows['owner']), 'New')
+    assert Certificate.find_by_public_id(cert.certificate_id).id == cert.id
+    assert Certificate.find_by_public_id(rows['old_public_id']).product_name == 'Old'
+
+
+def _assert_public_ids_stay_unique(db, rows, make_certificate):
+    from backend.app.models.certificate import Certificate
+    from backend.app.models.user import User
+
+    owner = db.session.get(User, rows['owner'])
+    elsewhere = datetime.utcnow() - timedelta(days=1)
+
+    def rejected(**kwargs):
+        with pytest.raises(IntegrityError):
+            make_certificate(owner, 'Copy', **kwargs)
+        db.session.rollback()
+
+    # the legacy row's uid / ID again, filed under another month
+    rejected(uid=rows['legacy_uid'], certificate_id='NT-copy-1', created_at=elsewhere)
+    rejected(uid=uuid.uuid4(), certificate_id=rows['legacy_public_id'], created_at=elsewhere)
+    # a new-style ID copied onto a row with an explicit created_at
+    rejected(certificate_id=rows['old_public_id'], created_at=elsewhere)
+
+    cert = make_certificate(owner, 'New')
+    cert.certificate_id = rows['legacy_public_id']
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+    # a deleted (e.g. archived) certificate's ID is not handed out again
+    gone = db.session.get(Certificate, rows['old'])
+    db.session.delete(gone)
+    db.session.commit()
+    if db.engine.dialect.name == 'postgresql':
+        rejected(certificate_id=rows['old_public_id'], created_at=elsewhere)
+
+
+@postgres_only
+def test_public_ids_stay_unique_across_partitions(db, partitioned, make_certificate):
+    _, rows = partitioned
+    with db.engine.connect() as conn:
+        assert conn.execute(text('SELECT count(*) FROM certificate_public_ids')).scalar() == 2
+        assert _partition_of(conn, rows['old']) != conn.execute(
+            text('SELECT tableoid::regclass::text FROM certificates WHERE uid = :uid'), {'uid': rows['legacy_uid']},
+        ).scalar()
+
+    _assert_public_ids_stay_unique(db, rows, make_certificate)
+
+
+@sqlite_only
+def test_sqlite_public_ids_stay_unique(db, partitioned, make_certificate):
+    _, rows = partitioned
+
+    _assert_public_ids_stay_unique(db, rows, make_certificate)
@@ -0,0 +1,46 @@
+import time
+
+import pytest
+
+from conftest import ADMIN_URL
+
+
+def test_failed_start_releases_the_lock(tmp_path, monkeypatch):
+    from backend.app import profiler
+
+    config = {'PROFILER_DIR': str(tmp_path)}
+    # the placeholder file cannot be created
+    monkeypatch.setattr(profiler, '_profile_path', lambda *args: str(tmp_path / 'missing' / 'x'))
+    with pytest.raises(OSError):
+        profiler.start_profile(config, 0.1, 0.01)
+    monkeypatch.undo()
+
+    profile_id = profiler.start_profile(config, 0.1, 0.01)
+    deadline = time.monotonic() + 5
+    while profiler.load_profile(config, profile_id) == 'running' and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert profiler.load_profile(config, profile_id) not in (None, 'running')
+
+
+def test_profile_routes(app, db, admin_client, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'PROFILER_ENABLED', True)
+    monkeypatch.setitem(app.config, 'PROFILER_DIR', str(tmp_path))
+    client = admin_client()
+
+    response = client.post('/admin/system/profile', base_url=ADMIN_URL, json={'seconds': 0.2})
+    assert response.status_code == 202
+    result = response.get_json()['result']
+
+    busy = client.post('/admin/system/profile', base_url=ADMIN_URL, json={'seconds': 0.2})
+    assert busy.status_code == 409
+
+    deadline = time.monotonic() + 5
+    response = client.get(result, base_url=ADMIN_URL)
+    while response.status_code == 202 and time.monotonic() < deadline:
+        time.sleep(0.05)
+        response = client.get(result, base_url=ADMIN_URL)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+
+    assert client.get('/admin/system/profile/0123456789abcdef', base_url=ADMIN_URL).status_code == 404
+    assert client.get('/admin/system/cpu', base_url=ADMIN_URL).status_code == 200
@@ -0,0 +1,84 @@
+import threading
+from datetime import datetime, timedelta
+
+from conftest import ADMIN_URL
+
+
+def _pending(make_user, make_certificate, n):
+    owner = make_user('owner@nt.test')
+    start = datetime.utcnow() - timedelta(hours=1)
+    return [
+        make_certificate(owner, f'Sample {i}', created_at=start + timedelta(minutes=i))
+        for i in range(n)
+    ]
+
+
+def _post(client, path, payload=None):
+    response = client.post(path, base_url=ADMIN_URL, json=payload or {})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response.get_json()
+
+
+def test_concurrent_claims_get_disjoint_batches(db, admin_client, make_user, make_certificate):
+    from backend.app.models.certificate import Certificate
+
+    certs = _pending(make_user, make_certificate, 8)
+    reviewers = [admin_client('alice@nt.test'), admin_client('bob@nt.test')]
+    barrier = threading.Barrier(len(reviewers))
+    claimed, errors = {}, []
+
+    def claim(client):
+        try:
+            barrier.wait()
+            claimed[client.user_id] = _post(client, '/admin/review/claim', {'size': 3})['claimed']
+        except Exception as exc:  # surfaced in the main thread below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=claim, args=(client,)) for client in reviewers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    alice, bob = ({row['id'] for row in claimed[client.user_id]} for client in reviewers)
+    assert len(alice) == len(bob) == 3
+    assert not alice & bob
+    # the oldest six, between them
+    assert alice | bob == {cert.id for cert in certs[:6]}
+
+    db.session.expire_all()
+    holders = {cert.id: cert.claimed_by for cert in Certificate.query}
+    assert all(holders[cert_id] == reviewers[0].user_id for cert_id in alice)
+    assert all(holders[cert_id] == reviewers[1].user_id for cert_id in bob)
+
+
+def test_renew_and_release(db, admin_client, make_user, make_certificate):
+    from backend.app.models.certificate import Certificate
+
+    certs = _pending(make_user, make_certificate, 4)
+    alice, bob = admin_client('alice@nt.test'), admin_client('bob@nt.test')
+
+    first = [row['id'] for row in _post(alice, '/admin/review/claim', {'size': 2})['claimed']]
+    assert first == [certs[0].id, certs[1].id]
+
+    # nearly lapsed; renewing pushes the lease out again
+    Certificate.query.filter(Certificate.id.in_(first)).update(
+        {'claim_expires_at': datetime.utcnow() + timedelta(seconds=5)}
+    )
+    db.session.commit()
+    assert _post(alice, '/admin/review/renew')['renewed'] == 2
+    assert _post(bob, '/admin/review/renew')['renewed'] == 0
+    db.session.expire_all()
+    for cert in Certificate.query.filter(Certificate.id.in_(first)):
+        assert cert.claim_expires_at > datetime.utcnow() + timedelta(minutes=5)
+
+    # bob only gets what alice does not hold
+    held_by_bob = [row['id'] for row in _post(bob, '/admin/review/claim', {'size': 4})['claimed']]
+    assert held_by_bob == [certs[2].id, certs[3].id]
+
+    # releasing one hands it to the next claim
+    assert _post(alice, '/admin/review/release', {'ids': [first[0]]})['released'] == 1
+    assert _post(bob, '/admin/review/release', {'ids': [first[1]]})['released'] == 0
+    again = [row['id'] for row in _post(bob, '/admin/review/claim', {'size': 4})['claimed']]
+    assert again == [first[0], certs[2].id, certs[3].id]
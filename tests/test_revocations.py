@@ -0,0 +1,136 @@
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from backend.app import revocations
+from backend.app.certtokens import key_id
+from backend.app.revocations import (
+    DIFF, SNAPSHOT, RevocationList, RevocationListError, decode, encode, revocation_key,
+)
+
+CERT_URL = 'http://cert.nt.test'
+
+
+@pytest.mark.parametrize('value', [0, 1, 127, 128, 16383, 16384, 2 ** 32, 2 ** 63 - 1, 2 ** 64 - 1])
+def test_uvarint_round_trip(value):
+    data = revocations._uvarint(value) + b'\xff'
+    assert revocations._read_uvarint(data, 0) == (value, len(data) - 1)
+
+
+@pytest.mark.parametrize('keys', [
+    [],
+    [0],
+    [5, 3, 4],
+    # gaps wider than any single varint byte, up to the whole 64-bit range
+    [0, 1, 2 ** 40, 2 ** 63, 2 ** 64 - 1],
+    [revocation_key(f'NT-2026-{i}') for i in range(500)],
+])
+def test_encode_decode_round_trip(keys):
+    data = encode(DIFF, 42, 7, keys, removed=keys[:2])
+
+    assert decode(data) == (DIFF, 42, 7, sorted(keys), sorted(keys[:2]))
+
+
+def test_signed_lists():
+    key = Ed25519PrivateKey.generate()
+    trusted = {key_id(key.public_key()): key.public_key()}
+    data = encode(SNAPSHOT, 3, 0, [10, 20], signing_key=key)
+
+    assert decode(data, trusted)[3] == [10, 20]
+    with pytest.raises(RevocationListError, match='not signed'):
+        decode(encode(SNAPSHOT, 3, 0, [10, 20]), trusted)
+    tampered = bytearray(data)
+    tampered[8] ^= 0x01
+    with pytest.raises(RevocationListError, match='bad signature'):
+        decode(bytes(tampered), trusted)
+    other = Ed25519PrivateKey.generate()
+    with pytest.raises(RevocationListError, match='unknown signing key'):
+        decode(data, {key_id(other.public_key()): other.public_key()})
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'NTRL',
+    b'XXXXS\x00\x00\x00\x00\x00',
+    b'NTRLS\x00\x01',  # truncated after the version
+    b'NTRLS\x00\x00\x00\x00\x00\x00',  # trailing byte
+])
+def test_malformed_lists(data):
+    with pytest.raises(RevocationListError):
+        decode(data)
+
+
+@pytest.fixture
+def approved(db, make_user, make_certificate, monkeypatch):
+    monkeypatch.setattr(revocations, '_snapshot_cache', {})
+    owner = make_user('owner@nt.test')
+    return [make_certificate(owner, f'Product {i}', status='approved') for i in range(3)]
+
+
+def test_revoking_bumps_the_version(db, approved):
+    assert revocations.current_version() == 0
+
+    approved[0].status = 'revoked'
+    approved[0].revocation_reason = 'supplier withdrew the product'
+    db.session.commit()
+    assert revocations.current_version() == 1
+
+    # a rolled-back revocation leaves no trace
+    approved[1].status = 'revoked'
+    db.session.flush()
+    db.session.rollback()
+    assert revocations.current_version() == 1
+
+    # expiry is not a revocation: tokens carry their own expiry
+    approved[2].status = 'expired'
+    db.session.commit()
+    assert revocations.current_version() == 1
+
+
+def test_since_returns_exactly_the_changes(app, db, approved):
+    first, second, third = approved
+    client = app.test_client()
+
+    def fetch(since=None):
+        query = {} if since is None else {'since': since}
+        response = client.get('/certificate/api/revocations', base_url=CERT_URL, query_string=query)
+        assert response.status_code == 200
+        return response
+
+    first.status = 'revoked'
+    db.session.commit()
+    snapshot = fetch()
+    version = int(snapshot.headers['X-Revocation-Version'])
+    local = RevocationList().apply(snapshot.data)
+    assert first.certificate_id in local and second.certificate_id not in local
+
+    second.status = 'revoked'
+    third.status = 'revoked'
+    first.status = 'approved'
+    db.session.commit()
+
+    diff = fetch(version)
+    kind, new_version, from_version, added, removed = decode(diff.data)
+    assert (kind, from_version) == (DIFF, version)
+    assert new_version == revocations.current_version() == version + 3
+    assert added == sorted(revocation_key(c.certificate_id) for c in (second, third))
+    assert removed == [revocation_key(first.certificate_id)]
+
+    local.apply(diff.data)
+    assert [c.certificate_id in local for c in approved] == [False, True, True]
+    assert fetch(new_version).data == encode(DIFF, new_version, new_version, [])
+    # a client that is up to date gets a 304
+    etag = fetch(new_version).headers['ETag']
+    response = client.get(
+        '/certificate/api/revocations', base_url=CERT_URL,
+        query_string={'since': new_version}, headers={'If-None-Match': etag},
+    )
+    assert response.status_code == 304
+
+
+def test_diff_must_start_where_the_client_is():
+    local = RevocationList().apply(encode(SNAPSHOT, 5, 0, [1]))
+
+    with pytest.raises(RevocationListError, match='starts at 3'):
+        local.apply(encode(DIFF, 6, 3, [2]))
+    local.apply(encode(DIFF, 6, 5, [2], removed=[1]))
+    assert (local.version, len(local)) == (6, 1)
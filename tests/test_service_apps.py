@@ -0,0 +1,54 @@
+import itertools
+
+import pytest
+
+from backend.config.config import Config
+
+_addresses = (f'203.0.113.{n}' for n in itertools.count(1))
+
+
+def _auth_app():
+    from backend.apps.auth.app import create_app
+
+    return create_app(), '/register', 'RATELIMIT_LOGIN'
+
+
+def _verify_app():
+    from backend.apps.verify.app import create_app
+
+    return create_app(), '/verify?cert_id=NT-2026-X', 'RATELIMIT_VERIFY'
+
+
+@pytest.fixture(params=[_auth_app, _verify_app], ids=['auth', 'verify'])
+def service(request):
+    app, path, limit = request.param()
+    app.config.update(TESTING=True, RATELIMIT_ENABLED=True, **{limit: '2/minute'})
+    return app, path
+
+
+def test_loads_the_shared_config(service):
+    app, _ = service
+    for key in ('REDIS_URL', 'SECRET_KEY', 'RATELIMIT_VERIFY_MISSES', 'METRICS_ALLOWED_IPS'):
+        assert app.config[key] == getattr(Config, key)
+
+
+def test_rate_limit_keys_on_the_forwarded_client(service):
+    app, path = service
+    client = app.test_client()
+    first, second = next(_addresses), next(_addresses)
+
+    def get(address):
+        return client.get(path, headers={'X-Forwarded-For': address}).status_code
+
+    assert [get(first), get(first)] == [200, 200]
+    assert get(first) == 429
+    # behind Nginx every request comes from 127.0.0.1; the next client has its own bucket
+    assert get(second) == 200
+
+
+def test_metrics_only_for_local_scrapes(service):
+    app, _ = service
+    client = app.test_client()
+
+    assert client.get('/metrics').status_code == 200
+    assert client.get('/metrics', headers={'X-Forwarded-For': next(_addresses)}).status_code == 404
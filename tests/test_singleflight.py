@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+CALLERS = 8
+
+
+def _coalesced(scope):
+    return REGISTRY.get_sample_value('nanotrace_coalesced_requests_total', {'scope': scope}) or 0
+
+
+@pytest.fixture
+def call_together(app, monkeypatch):
+    """Run flight.do(key, fn) from CALLERS threads released at once; returns each outcome."""
+    monkeypatch.setitem(app.config, 'SINGLEFLIGHT_WAIT', 5.0)
+    monkeypatch.setitem(app.config, 'SINGLEFLIGHT_SHARED', False)
+
+    def call_together(flight, fn):
+        barrier = threading.Barrier(CALLERS)
+        outcomes = [None] * CALLERS
+
+        def call(i):
+            with app.app_context():
+                barrier.wait()
+                try:
+                    outcomes[i] = flight.do('key', fn)
+                except Exception as exc:
+                    outcomes[i] = exc
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(CALLERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        return outcomes
+
+    return call_together
+
+
+def _slow(calls, result=None, error=None):
+    def fn():
+        calls.append(threading.current_thread().name)
+        # long enough for every other caller to find the call in flight
+        time.sleep(0.3)
+        if error is not None:
+            raise error
+        return result
+
+    return fn
+
+
+def test_concurrent_callers_share_one_call(call_together):
+    from backend.app.singleflight import SingleFlight
+
+    calls = []
+    before = _coalesced('test_threads')
+
+    outcomes = call_together(SingleFlight('test_threads'), _slow(calls, result=(200, 'body')))
+
+    assert len(calls) == 1
+    assert outcomes == [(200, 'body')] * CALLERS
+    assert _coalesced('test_threads') - before == CALLERS - 1
+
+
+def test_the_leaders_exception_reaches_every_caller(call_together):
+    from backend.app.singleflight import SingleFlight
+
+    calls = []
+    error = RuntimeError('database went away')
+    flight = SingleFlight('test_thread_errors')
+
+    outcomes = call_together(flight, _slow(calls, error=error))
+
+    assert len(calls) == 1
+    assert outcomes == [error] * CALLERS
+    # nothing is left behind: the next call runs again
+    assert call_together(flight, _slow(calls, result='ok')) == ['ok'] * CALLERS
+    assert len(calls) == 2
+
+
+def test_async_callers_share_one_call_and_its_exception():
+    from backend.app.singleflight import AsyncSingleFlight
+
+    flight = AsyncSingleFlight('test_async')
+    calls = []
+
+    async def lookup(error=None):
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        if error is not None:
+            raise error
+        return {'status': 'approved'}
+
+    async def gather(fn):
+        return await asyncio.gather(*(flight.do('key', fn) for _ in range(CALLERS)), return_exceptions=True)
+
+    assert asyncio.run(gather(lookup)) == [{'status': 'approved'}] * CALLERS
+    error = LookupError('pool exhausted')
+    assert asyncio.run(gather(lambda: lookup(error))) == [error] * CALLERS
+    assert len(calls) == 2
@@ -0,0 +1,33 @@
+import time
+
+from sqlalchemy import text
+
+from conftest import ADMIN_URL, sqlite_only
+
+
+@sqlite_only
+def test_slow_statement_is_listed(app, db, admin_client, monkeypatch):
+    from backend.app import slowqueries
+
+    client = admin_client()
+    monkeypatch.setitem(slowqueries._settings, 'threshold_ms', 100.0)
+    slowqueries.reset_slow_queries()
+
+    # a SQL function that takes longer than the threshold
+    raw = db.session.connection().connection.driver_connection
+    raw.create_function('nt_sleep', 1, lambda ms: time.sleep(ms / 1000) or 0)
+    db.session.execute(text('SELECT nt_sleep(150), length(:sku) WHERE 2 IN (1, 2, 3)'), {'sku': 'TiO2-lot-7'})
+    db.session.execute(text('SELECT 1'))
+    db.session.commit()
+
+    response = client.get('/admin/system/queries?format=json', base_url=ADMIN_URL)
+
+    assert response.status_code == 200
+    queries = response.get_json()['queries']
+    assert [q['statement'] for q in queries] == ['SELECT nt_sleep(?), length(?) WHERE ? IN (...)']
+    slow = queries[0]
+    assert slow['calls'] == 1
+    assert slow['max_ms'] >= 150
+    # bound values never reach the log, only their types
+    assert 'TiO2' not in response.get_data(as_text=True)
+    assert slow['last_params'] == ['<str:10>']
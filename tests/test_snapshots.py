@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.snapshots import snapshot_paths
+
+
+@pytest.fixture
+def snapshot_dir(app, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, 'SNAPSHOT_DIR', str(tmp_path))
+    return tmp_path
+
+
+def _files(root, cert):
+    return [path for path in snapshot_paths(str(root), cert.certificate_id) if os.path.exists(path)]
+
+
+def _wait_for_refreshes():
+    for thread in threading.enumerate():
+        if thread.name == 'snapshot-refresh':
+            thread.join(5)
+
+
+def _approve(db, cert):
+    cert.status = 'approved'
+    cert.approved_at = datetime.utcnow()
+    cert.set_expiry()
+    db.session.commit()
+
+
+def test_approve_writes_the_snapshot(app, db, snapshot_dir, make_user, make_certificate):
+    cert = make_certificate(make_user('owner@nt.test'))
+    assert _files(snapshot_dir, cert) == []
+
+    _approve(db, cert)
+
+    html_path, json_path = snapshot_paths(str(snapshot_dir), cert.certificate_id)
+    with open(json_path) as fh:
+        assert json.load(fh) == cert.to_public_dict()
+    response = app.test_client().get(f'/certificate/api/verify/{cert.certificate_id}', base_url='http://cert.nt.test')
+    with open(json_path) as fh:
+        assert json.load(fh) == response.get_json()
+    with open(html_path) as fh:
+        page = fh.read()
+    assert cert.certificate_id in page and 'Nano TiO2' in page
+
+
+def test_rolled_back_approval_writes_nothing(db, snapshot_dir, make_user, make_certificate):
+    cert = make_certificate(make_user('owner@nt.test'))
+
+    cert.status = 'approved'
+    db.session.flush()
+    db.session.rollback()
+
+    assert _files(snapshot_dir, cert) == []
+
+
+def test_reject_removes_a_stale_snapshot(db, snapshot_dir, make_user, make_certificate):
+    cert = make_certificate(make_user('owner@nt.test'))
+    # e.g. left behind by an earlier build
+    for path in snapshot_paths(str(snapshot_dir), cert.certificate_id):
+        (snapshot_dir / path).parent.mkdir(parents=True, exist_ok=True)
+        (snapshot_dir / path).write_text('stale')
+
+    cert.status = 'rejected'
+    db.session.commit()
+
+    assert _files(snapshot_dir, cert) == []
+
+
+def test_revoke_command_removes_the_snapshot(app, db, snapshot_dir, make_user, make_certificate):
+    cert = make_certificate(make_user('owner@nt.test'))
+    _approve(db, cert)
+    assert len(_files(snapshot_dir, cert)) == 2
+
+    result = app.test_cli_runner().invoke(args=['nanotrace', 'revoke-certificate', cert.certificate_id])
+
+    assert result.exit_code == 0, result.output
+    assert _files(snapshot_dir, cert) == []
+
+
+def test_expiry_job_removes_the_snapshot(db, snapshot_dir, make_user, make_certificate):
+    from backend.app.expiry import expire_due_certificates
+
+    owner = make_user('owner@nt.test')
+    due, current = make_certificate(owner, 'Due'), make_certificate(owner, 'Current')
+    _approve(db, due)
+    _approve(db, current)
+    due.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    db.session.commit()
+
+    assert expire_due_certificates() == 1
+    _wait_for_refreshes()
+
+    assert _files(snapshot_dir, due) == []
+    assert len(_files(snapshot_dir, current)) == 2
+
+
+def test_refresh_thread_is_a_daemon(db, snapshot_dir, make_user, make_certificate, monkeypatch):
+    from backend.app import snapshots
+
+    started = []
+    monkeypatch.setattr(snapshots, '_reload', lambda app, ids: started.append(threading.current_thread().daemon))
+    cert = make_certificate(make_user('owner@nt.test'))
+    _approve(db, cert)
+
+    snapshots.mark_stale(db.session, [cert.certificate_id])
+    db.session.commit()
+    _wait_for_refreshes()
+
+    assert started == [True]
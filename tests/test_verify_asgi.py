@@ -0,0 +1,208 @@
+import asyncio
+import json
+import re
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import Uuid, bindparam, text
+
+CERT_URL = 'http://cert.nt.test'
+
+
+class SqlitePool:
+    """Just enough of an asyncpg pool to run the service's SQL against the test database.
+
+    Records every statement; `delay` keeps a fetch in flight so concurrent requests overlap.
+    """
+
+    def __init__(self, engine, tables):
+        self.engine = engine
+        self.tables = tables
+        self.statements = []
+        self.delay = 0
+
+    def acquire(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def fetchrow(self, sql, *args):
+        self.statements.append(sql)
+        await asyncio.sleep(self.delay)
+        params = {f'p{i}': arg for i, arg in enumerate(args, 1)}
+        stmt = text(re.sub(r'\$(\d+)', r':p\1', sql)).bindparams(
+            *(bindparam(name, type_=Uuid()) for name, value in params.items() if isinstance(value, uuid.UUID))
+        )
+        table = self.tables[re.search(r'FROM (\w+)', sql).group(1)]
+        names = re.search(r'SELECT (.*?) FROM', sql).group(1).split(', ')
+        stmt = stmt.columns(**{name: table.c[name].type for name in names})
+        with self.engine.connect() as conn:
+            row = conn.execute(stmt, params).mappings().first()
+        return dict(row) if row is not None else None
+
+
+@pytest.fixture
+def asgi(app, db, fake_redis, monkeypatch):
+    """The Starlette verify service on the test database, with the ID filter built."""
+    from backend.app import idfilter, ratelimit
+    from backend.app.models.certificate import Certificate
+    from backend.app.models.certificate_archive import CertificateArchive
+    from backend.apps.verify import asgi as service
+    from backend.apps.verify.app import create_app as create_wsgi_app
+
+    monkeypatch.setattr(ratelimit, '_memory', ratelimit._MemoryBuckets())
+    flask_app = create_wsgi_app()
+    flask_app.config['REDIS_URL'] = app.config['REDIS_URL']
+    asgi_app = service.create_app(flask_app)
+    asgi_app.state.pool = SqlitePool(db.engine, {
+        'certificates': Certificate.__table__,
+        'certificates_archive': CertificateArchive.__table__,
+    })
+
+    def build_filter():
+        # the filter only answers once it exists; the main app builds it from both tables
+        fake_redis.data.clear()
+        idfilter.rebuild()
+
+    asgi_app.build_filter = build_filter
+    return asgi_app
+
+
+def _get(asgi_app, *paths):
+    async def fetch():
+        transport = httpx.ASGITransport(app=asgi_app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://verify.nt.test') as client:
+            return await asyncio.gather(*(client.get(path) for path in paths))
+
+    return asyncio.run(fetch())
+
+
+def _approved(make_user, make_certificate, **kwargs):
+    return make_certificate(
+        make_user('owner@nt.test'), status='approved', approved_at=datetime.utcnow(),
+        expires_at=datetime.utcnow() + timedelta(days=365), concentration='5%', **kwargs,
+    )
+
+
+def test_same_answers_as_the_flask_views(app, asgi, make_user, make_certificate):
+    cert = _approved(make_user, make_certificate)
+    asgi.build_filter()
+    typed = cert.certificate_id.lower()
+    flask = app.test_client()
+
+    api, page, malformed = _get(
+        asgi, f'/certificate/api/verify/{typed}', f'/certificate/verify/{typed}',
+        '/certificate/api/verify/NT-2026-NOT-A-REAL-ID',
+    )
+
+    expected = flask.get(f'/certificate/api/verify/{typed}', base_url=CERT_URL)
+    assert (api.status_code, api.json()) == (200, expected.get_json())
+    assert api.headers['content-type'] == 'application/json'
+    assert page.status_code == 200
+    assert cert.certificate_id in page.text and 'Nano TiO2' in page.text
+    expected = flask.get('/certificate/api/verify/NT-2026-NOT-A-REAL-ID', base_url=CERT_URL)
+    assert (malformed.status_code, malformed.json()) == (404, expected.get_json())
+
+
+def test_unknown_id_is_a_miss_without_a_query(asgi, make_user, make_certificate):
+    from backend.app.certids import format_public_id, new_uid
+
+    _approved(make_user, make_certificate)
+    asgi.build_filter()
+
+    (response,) = _get(asgi, f'/certificate/api/verify/{format_public_id(new_uid())}')
+
+    assert response.status_code == 404
+    assert asgi.state.pool.statements == []
+
+
+def test_falls_back_to_the_archive(app, db, asgi, make_user, make_certificate):
+    from backend.app.models.certificate import Certificate
+    from backend.app.models.certificate_archive import CertificateArchive
+
+    cert = _approved(make_user, make_certificate)
+    public_id = cert.certificate_id
+    db.session.add(CertificateArchive.from_certificate(cert))
+    db.session.delete(cert)
+    db.session.commit()
+    assert Certificate.query.count() == 0
+    asgi.build_filter()
+
+    (response,) = _get(asgi, f'/certificate/api/verify/{public_id}')
+
+    expected = app.test_client().get(f'/certificate/api/verify/{public_id}', base_url=CERT_URL)
+    assert response.status_code == 200
+    assert response.json() == expected.get_json()
+    assert response.json()['archived'] is True
+    assert [sql.split(' FROM ')[1].split()[0] for sql in asgi.state.pool.statements] == [
+        'certificates', 'certificates_archive',
+    ]
+
+
+def test_identical_lookups_share_one_query(asgi, make_user, make_certificate):
+    cert = _approved(make_user, make_certificate)
+    asgi.build_filter()
+    asgi.state.pool.delay = 0.2
+
+    responses = _get(asgi, *[f'/certificate/api/verify/{cert.certificate_id}'] * 5)
+
+    assert [r.status_code for r in responses] == [200] * 5
+    assert len({json.dumps(r.json(), sort_keys=True) for r in responses}) == 1
+    assert len(asgi.state.pool.statements) == 1
+
+
+def test_verify_and_miss_budgets(asgi, make_user, make_certificate, monkeypatch):
+    from backend.app import ratelimit
+    from backend.app.certids import format_public_id, new_uid
+    from backend.config.config import Config
+
+    monkeypatch.setattr(Config, 'RATELIMIT_ENABLED', True)
+    monkeypatch.setattr(Config, 'RATELIMIT_VERIFY', '5/minute')
+    monkeypatch.setattr(Config, 'RATELIMIT_VERIFY_MISSES', '2/minute')
+    cert = _approved(make_user, make_certificate)
+    asgi.build_filter()
+    hit = f'/certificate/api/verify/{cert.certificate_id}'
+
+    def status(path):
+        (response,) = _get(asgi, path)
+        return response.status_code
+
+    misses = [status(f'/certificate/api/verify/{format_public_id(new_uid())}') for _ in range(3)]
+    # two misses spend the 404 budget; after that even real IDs are turned away
+    assert misses == [404, 404, 429]
+    assert status(hit) == 429
+
+    (limited,) = _get(asgi, hit)
+    assert int(limited.headers['Retry-After']) >= 1
+
+    monkeypatch.setattr(Config, 'RATELIMIT_VERIFY_MISSES', '100/minute')
+    monkeypatch.setattr(ratelimit, '_memory', ratelimit._MemoryBuckets())
+    # 5 per minute overall, hits included
+    assert [status(hit) for _ in range(6)] == [200] * 5 + [429]
+
+
+def test_fetch_decodes_the_archive_like_the_model(db, asgi, make_user, make_certificate):
+    from backend.app.models.certificate_archive import PAYLOAD_FIELDS, CertificateArchive
+    from backend.apps.verify.asgi import _fetch
+
+    cert = make_certificate(
+        make_user('owner@nt.test'), status='expired', concentration='5%', particle_size='20 nm',
+        msds_link='https://example.test/msds.pdf', approved_at=datetime.utcnow() - timedelta(days=400),
+        expires_at=datetime.utcnow() - timedelta(days=35),
+    )
+    archived = CertificateArchive.from_certificate(cert)
+    db.session.add(archived)
+    db.session.delete(cert)
+    db.session.commit()
+
+    fetched = asyncio.run(_fetch(asgi.state.pool, archived.certificate_id))
+
+    expected = archived.to_certificate()
+    for field in ('certificate_id', 'status', 'created_at', 'archived_at', *PAYLOAD_FIELDS):
+        assert getattr(fetched, field) == getattr(expected, field), field
@@ -0,0 +1,21 @@
+CERT_URL = 'http://cert.nt.test'
+
+
+def test_verify_form_describes_the_id_format(app, db):
+    page = app.test_client().get('/certificate/verify', base_url=CERT_URL).get_data(as_text=True)
+
+    assert 'case-sensitive' not in page
+    assert "Case doesn't matter" in page
+
+
+def test_lookup_ignores_case_and_spacing(app, db, make_user, make_certificate):
+    cert = make_certificate(make_user('owner@nt.test'), status='approved')
+    prefix, year, code = cert.certificate_id.split('-', 2)
+    typed = f'{prefix}-{year}-{code[:9]} {code[9:18]}-{code[18:]}'.lower()
+
+    response = app.test_client().get(
+        '/certificate/verify-lookup', base_url=CERT_URL, query_string={'cert_id': typed},
+    )
+
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith(f'/certificate/verify/{cert.certificate_id}')